@@ -1,63 +1,99 @@
 #!/usr/bin/env python3
+from __future__ import annotations
+
+# Only what --help/--list and the TOOLS table need is imported up front;
+# subprocess, shutil, platform, json and pathlib are imported where used.
 import argparse
-import platform
-import shutil
-import subprocess
+import io
+import os
 import sys
-from pathlib import Path
-from typing import Dict, Optional, Tuple, List
-
-TOOLS: Dict[str, Dict] = {
-    "rubeus": {
-        "repo": "https://github.com/GhostPack/Rubeus.git",
-        "sln": "Rubeus.sln",
-        "build": ["dotnet", "msbuild", "Rubeus.sln", "/p:Configuration=Release"],
-        "exe": "Rubeus.exe",
-        "netfx": True,
-    },
-    "seatbelt": {
-        "repo": "https://github.com/GhostPack/Seatbelt.git",
-        "sln": "Seatbelt.sln",
-        "build": ["dotnet", "msbuild", "Seatbelt.sln", "/p:Configuration=Release"],
-        "exe": "Seatbelt.exe",
-        "netfx": True,
-    },
-    "sharpup": {
-        "repo": "https://github.com/GhostPack/SharpUp.git",
-        "sln": "SharpUp.sln",
-        "build": ["dotnet", "msbuild", "SharpUp.sln", "/p:Configuration=Release"],
-        "exe": "SharpUp.exe",
-        "netfx": True,
-    },
-    "certify": {
-        "repo": "https://github.com/GhostPack/Certify.git",
-        "sln": "Certify.sln",
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Deque, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+# Build solution projects in parallel and keep MSBuild nodes warm between tools
+MSBUILD_FLAGS = (f"/m:{os.cpu_count() or 1}", "/nodeReuse:true",
+                 "/p:UseSharedCompilation=true", "/verbosity:minimal")
+
+class ToolCfg(NamedTuple):
+    repo: str
+    build: Tuple[str, ...] = ()
+    exe: str = ""
+    sln: Optional[str] = None
+    netfx: bool = False
+    certify_special: bool = False  # use: nuget restore <abs sln> then dotnet msbuild <abs sln>
+    skip_non_windows: bool = False
+    shallow_ok: bool = True
+
+# Read-only: the table is shared module state and must not be mutated at runtime
+TOOLS: Mapping[str, ToolCfg] = MappingProxyType({
+    "rubeus": ToolCfg(
+        repo="https://github.com/GhostPack/Rubeus.git",
+        sln="Rubeus.sln",
+        build=("dotnet", "msbuild", "Rubeus.sln", "/p:Configuration=Release", *MSBUILD_FLAGS),
+        exe="Rubeus.exe",
+        netfx=True,
+    ),
+    "seatbelt": ToolCfg(
+        repo="https://github.com/GhostPack/Seatbelt.git",
+        sln="Seatbelt.sln",
+        build=("dotnet", "msbuild", "Seatbelt.sln", "/p:Configuration=Release", *MSBUILD_FLAGS),
+        exe="Seatbelt.exe",
+        netfx=True,
+    ),
+    "sharpup": ToolCfg(
+        repo="https://github.com/GhostPack/SharpUp.git",
+        sln="SharpUp.sln",
+        build=("dotnet", "msbuild", "SharpUp.sln", "/p:Configuration=Release", *MSBUILD_FLAGS),
+        exe="SharpUp.exe",
+        netfx=True,
+    ),
+    "certify": ToolCfg(
+        repo="https://github.com/GhostPack/Certify.git",
+        sln="Certify.sln",
         # NOTE: we will override this in code to use the *absolute* sln path, per your working command
-        "build": ["dotnet", "msbuild", "Certify.sln", "/p:Configuration=Release"],
-        "exe": "Certify.exe",
-        "netfx": True,
-        "certify_special": True,  # use: nuget restore <abs sln> then dotnet msbuild <abs sln>
-    },
-    "sharphound": {
-        "repo": "https://github.com/BloodHoundAD/SharpHound.git",
-        "sln": None,
-        "build": ["dotnet", "build", "-c", "Release"],
-        "exe": "SharpHound.exe",
-        "netfx": False,
-    },
-    "inveigh": {
-        "repo": "https://github.com/Kevin-Robertson/Inveigh.git",
-        "sln": None,
-        "build": ["dotnet", "build", "-c", "Release"],
-        "exe": "Inveigh.exe",
-        "netfx": False,
-    },
-    "mimikatz": {
-        "repo": "https://github.com/gentilkiwi/mimikatz.git",
-        "skip_non_windows": True,
-    },
+        build=("dotnet", "msbuild", "Certify.sln", "/p:Configuration=Release", *MSBUILD_FLAGS),
+        exe="Certify.exe",
+        netfx=True,
+        certify_special=True,
+    ),
+    "sharphound": ToolCfg(
+        repo="https://github.com/BloodHoundAD/SharpHound.git",
+        build=("dotnet", "build", "-c", "Release", "-maxcpucount"),
+        exe="SharpHound.exe",
+    ),
+    "inveigh": ToolCfg(
+        repo="https://github.com/Kevin-Robertson/Inveigh.git",
+        build=("dotnet", "build", "-c", "Release", "-maxcpucount"),
+        exe="Inveigh.exe",
+    ),
+    "mimikatz": ToolCfg(
+        repo="https://github.com/gentilkiwi/mimikatz.git",
+        skip_non_windows=True,
+    ),
+})
+
+# Abort git transfers that stay below 1 KB/s for 30 seconds instead of hanging
+GIT_ENV = {"GIT_HTTP_LOW_SPEED_LIMIT": "1000", "GIT_HTTP_LOW_SPEED_TIME": "30"}
+
+# Quiet, non-interactive dotnet CLI; NUGET_PACKAGES is added per build dir
+DOTNET_ENV = {
+    "DOTNET_CLI_TELEMETRY_OPTOUT": "1",
+    "DOTNET_NOLOGO": "1",
+    "DOTNET_SKIP_FIRST_TIME_EXPERIENCE": "1",
 }
 
+STATE_FILE = ".winbins-state.json"
+
+# Lines of command output kept for error reporting
+OUTPUT_TAIL_LINES = 40
+
+# Directories find_artifact never descends into
+ARTIFACT_SKIP_DIRS = {"packages", "obj", ".git", "node_modules"}
+
 NETFX_PROPS = """<Project>
   <ItemGroup>
     <PackageReference Include="Microsoft.NETFramework.ReferenceAssemblies"
@@ -67,49 +103,131 @@ NETFX_PROPS = """<Project>
 </Project>
 """
 
+@lru_cache(maxsize=None)
+def which(name: str) -> Optional[str]:
+    import shutil
+    return shutil.which(name)
+
+@lru_cache(maxsize=None)
+def system() -> str:
+    import platform
+    return platform.system()
+
+def copy_file(src: Path, dst: Path):
+    import shutil
+    # Like shutil.copy2, but let the kernel move the bytes (reflink on btrfs/xfs,
+    # sendfile via copyfile elsewhere) instead of bouncing through user space.
+    try:
+        with open(src, "rb") as s, open(dst, "wb") as d:
+            remaining = os.fstat(s.fileno()).st_size
+            while remaining > 0:
+                n = os.copy_file_range(s.fileno(), d.fileno(), remaining)
+                if n == 0: break
+                remaining -= n
+    except (AttributeError, OSError):
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+
 class WinToolsUpdater:
-    def __init__(self, output_dir: Path, build_dir: Path, verbose: bool = False):
+    def __init__(self, output_dir: Path, build_dir: Path, verbose: bool = False,
+                 force: bool = False):
         self.output_dir = output_dir.resolve()
         self.build_dir = build_dir.resolve()
         self.verbose = verbose
+        self.force = force
+        # Non-verbose runs collect each tool's log and write it in one piece
+        self._buf = None if verbose else io.StringIO()
+        self.state_path = self.output_dir / STATE_FILE
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.build_dir.mkdir(parents=True, exist_ok=True)
+        # Persistent package cache so repeat restores are local hash checks, not downloads
+        self.nuget_cache = self.build_dir / ".nuget-packages"
+        self.nuget_cache.mkdir(parents=True, exist_ok=True)
+        self.env = {**os.environ, **DOTNET_ENV, "NUGET_PACKAGES": str(self.nuget_cache)}
 
     def log(self, msg: str, level: str = "INFO"):
-        print(f"[{level}] {msg}")
+        self.emit(f"[{level}] {msg}")
 
-    def run_cmd(self, cmd: List[str], cwd: Optional[Path] = None) -> Tuple[bool, str]:
+    def emit(self, line: str):
+        if self._buf is None:
+            print(line)
+        else:
+            self._buf.write(line + "\n")
+
+    def flush_log(self):
+        if self._buf is not None:
+            sys.stdout.write(self._buf.getvalue())
+            sys.stdout.flush()
+            self._buf = io.StringIO()
+
+    def run_cmd(self, cmd: List[str], cwd: Optional[Path] = None,
+                env: Optional[Dict[str, str]] = None) -> Tuple[bool, str]:
+        import subprocess
+        from collections import deque
+        env = {**self.env, **env} if env else self.env
+        if self.verbose:
+            self.log(f"CMD: {' '.join(cmd)} (cwd={cwd})", "DEBUG")
         try:
-            if self.verbose:
-                self.log(f"CMD: {' '.join(cmd)} (cwd={cwd})", "DEBUG")
-                r = subprocess.run(cmd, cwd=cwd, text=True)
-                return (r.returncode == 0), ""
-            r = subprocess.run(cmd, cwd=cwd, check=True, text=True, capture_output=True)
-            return True, (r.stdout or "") + (r.stderr or "")
-        except subprocess.CalledProcessError as e:
-            out = ""
-            if e.stdout: out += e.stdout
-            if e.stderr: out += e.stderr
-            return False, out
+            proc = subprocess.Popen(cmd, cwd=cwd, env=env, text=True, bufsize=1,
+                                    stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
         except FileNotFoundError:
             return False, f"Command not found: {cmd[0]}"
-
-    def clone_or_update(self, name: str, repo: str) -> Optional[Path]:
+        # Stream output, keeping only the tail that error reporting needs
+        tail: Deque[str] = deque(maxlen=OUTPUT_TAIL_LINES)
+        with proc:
+            for line in proc.stdout:
+                tail.append(line)
+                if self.verbose:
+                    sys.stdout.write(line)
+        return proc.returncode == 0, "".join(tail)
+
+    def clone_or_update(self, name: str, repo: str, shallow: bool = True) -> Optional[Path]:
         dst = self.build_dir / name
         if dst.exists():
             self.log(f"Updating {name}...")
-            ok, out = self.run_cmd(["git", "-C", str(dst), "fetch", "--all"])
+            if shallow:
+                fetch = ["git", "-C", str(dst), "fetch", "--depth=1", "--no-tags", "--prune",
+                         "origin", "HEAD"]
+                target = "FETCH_HEAD"
+            else:
+                fetch = ["git", "-C", str(dst), "fetch", "--prune", "origin"]
+                target = "origin/HEAD"
+            ok, out = self.run_cmd(fetch, env=GIT_ENV)
             if not ok: self.log(out.strip() or "git fetch failed", "ERROR"); return None
-            ok, out = self.run_cmd(["git", "-C", str(dst), "reset", "--hard", "origin/HEAD"])
+            ok, out = self.run_cmd(["git", "-C", str(dst), "reset", "--hard", target])
             if not ok: self.log(out.strip() or "git reset failed", "ERROR"); return None
             ok, out = self.run_cmd(["git", "-C", str(dst), "clean", "-fdx"])
             if not ok: self.log(out.strip() or "git clean failed", "ERROR"); return None
         else:
             self.log(f"Cloning {name}...")
-            ok, out = self.run_cmd(["git", "clone", repo, str(dst)])
+            clone = ["git", "clone"]
+            if shallow:
+                clone += ["--depth=1", "--single-branch", "--filter=blob:none"]
+            ok, out = self.run_cmd(clone + [repo, str(dst)], env=GIT_ENV)
             if not ok: self.log(out.strip() or "git clone failed", "ERROR"); return None
         return dst
 
+    def head_sha(self, tool_path: Path) -> Optional[str]:
+        import subprocess
+        r = subprocess.run(["git", "-C", str(tool_path), "rev-parse", "HEAD"],
+                           capture_output=True, text=True)
+        return r.stdout.strip() if r.returncode == 0 else None
+
+    def load_state(self) -> Dict[str, Dict]:
+        import json
+        try:
+            return json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def record_build(self, name: str, sha: str, artifact: Path):
+        import json
+        state = self.load_state()
+        state[name] = {"sha": sha, "artifact_mtime": artifact.stat().st_mtime}
+        tmp = self.state_path.with_name(STATE_FILE + ".tmp")
+        tmp.write_text(json.dumps(state, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.state_path)
+
     def ensure_netfx_reference_assemblies(self, tool_path: Path):
         props = tool_path / "Directory.Build.props"
         if not props.exists():
@@ -127,7 +245,7 @@ class WinToolsUpdater:
         return True
 
     def restore_certify_with_nuget(self, sln_abs: Path, cwd: Path) -> bool:
-        if shutil.which("nuget") is None:
+        if which("nuget") is None:
             self.log("Certify requires classic NuGet restore but 'nuget' is not in PATH. Install it: sudo dnf install nuget", "ERROR")
             return False
         self.log(f"Running nuget restore {sln_abs} ...")
@@ -138,18 +256,34 @@ class WinToolsUpdater:
         return True
 
     def find_artifact(self, tool_path: Path, exe_name: str) -> Optional[Path]:
-        matches = list(tool_path.rglob(exe_name))
-        if not matches:
-            return None
-        matches.sort(key=lambda p: ("release" not in str(p).lower(), len(str(p))))
-        return matches[0]
-
-    def build_and_copy(self, name: str, cfg: Dict, tool_path: Path) -> bool:
-        sln_rel = cfg.get("sln")
+        from pathlib import Path
+        # Walk with scandir, pruning restore/intermediate trees that never hold the final exe.
+        # Rank hits as they are found (Release builds first, then shortest path) and keep the best.
+        best = None
+        stack = [str(tool_path)]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in ARTIFACT_SKIP_DIRS:
+                            stack.append(entry.path)
+                    elif entry.name == exe_name:
+                        path = entry.path
+                        score = ("release" not in path.lower(), len(path))
+                        if best is None or score < best[0]:
+                            best = (score, path)
+        return Path(best[1]) if best else None
+
+    def build_and_copy(self, name: str, cfg: ToolCfg, tool_path: Path) -> bool:
+        sln_rel = cfg.sln
         sln_abs = (tool_path / sln_rel).resolve() if sln_rel else None
 
         # --- CERTIFY SPECIAL CASE (exact working sequence you provided) ---
-        if cfg.get("certify_special"):
+        if cfg.certify_special:
             if not sln_abs or not sln_abs.exists():
                 self.log("Certify.sln not found", "ERROR")
                 return False
@@ -164,13 +298,15 @@ class WinToolsUpdater:
 
             # 3) dotnet msbuild <abs sln> /p:Configuration=Release
             self.log(f"Building {name} (dotnet msbuild {sln_abs})...")
-            ok, out = self.run_cmd(["dotnet", "msbuild", str(sln_abs), "/p:Configuration=Release"], cwd=tool_path)
+            ok, out = self.run_cmd(["dotnet", "msbuild", str(sln_abs), "/p:Configuration=Release",
+                                    f"/p:RestorePackagesPath={self.nuget_cache}", *MSBUILD_FLAGS],
+                                   cwd=tool_path)
             if not ok:
                 self.log("\n".join(out.strip().splitlines()[-40:]) or "Build failed", "ERROR")
                 return False
         else:
             # Normal flow for others
-            if cfg.get("netfx"):
+            if cfg.netfx:
                 # Restore solution if present; otherwise restore repo
                 if sln_abs and sln_abs.exists():
                     if not self.restore_dotnet(tool_path, sln_abs=sln_abs):
@@ -183,64 +319,80 @@ class WinToolsUpdater:
                     return False
 
             self.log(f"Building {name}...")
-            ok, out = self.run_cmd(cfg["build"], cwd=tool_path)
+            ok, out = self.run_cmd(list(cfg.build), cwd=tool_path)
             if not ok:
                 self.log("\n".join(out.strip().splitlines()[-40:]) or "Build failed", "ERROR")
                 return False
 
-        exe_name = cfg["exe"]
+        exe_name = cfg.exe
         artifact = self.find_artifact(tool_path, exe_name)
         if not artifact or not artifact.exists():
             self.log(f"Build artifact not found: {exe_name}", "ERROR")
             return False
 
         dest = self.output_dir / artifact.name
-        shutil.copy2(artifact, dest)
+        copy_file(artifact, dest)
         self.log(f"✓ {name} -> {dest}", "SUCCESS")
+        sha = self.head_sha(tool_path)
+        if sha:
+            self.record_build(name, sha, dest)
         return True
 
     def update_tool(self, name: str) -> bool:
         cfg = TOOLS[name]
 
-        if cfg.get("skip_non_windows") and platform.system() != "Windows":
+        if cfg.skip_non_windows and system() != "Windows":
             self.log(f"{name} is Windows-only, skipping", "INFO")
             return False
 
-        tool_path = self.clone_or_update(name, cfg["repo"])
+        tool_path = self.clone_or_update(name, cfg.repo, cfg.shallow_ok)
         if tool_path is None:
             return False
 
-        if cfg.get("netfx"):
+        if cfg.netfx:
             self.ensure_netfx_reference_assemblies(tool_path)
 
-        if "build" not in cfg:
+        if not cfg.build:
             self.log(f"No build config for {name}", "ERROR")
             return False
 
+        if not self.force:
+            sha = self.head_sha(tool_path)
+            if sha and self.load_state().get(name, {}).get("sha") == sha \
+                    and (self.output_dir / cfg.exe).exists():
+                self.log(f"{name} is up to date ({sha[:12]}), skipping build", "SUCCESS")
+                return True
+
         return self.build_and_copy(name, cfg, tool_path)
 
 def main():
     parser = argparse.ArgumentParser(description="Windows Pentesting Tools Updater")
     parser.add_argument("-o", "--output", default="./binaries", help="Output directory (default: ./binaries)")
     parser.add_argument("-b", "--build-dir", default="./build", help="Build directory (default: ./build)")
-    parser.add_argument("-t", "--tools", nargs="+", choices=list(TOOLS.keys()), help="Tools to build (default: all)")
+    parser.add_argument("-t", "--tools", nargs="+", choices=TOOLS.keys(), help="Tools to build (default: all)")
     parser.add_argument("-v", "--verbose", action="store_true", help="Verbose command output")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the source is unchanged")
     args = parser.parse_args()
 
-    updater = WinToolsUpdater(Path(args.output), Path(args.build_dir), verbose=args.verbose)
+    from pathlib import Path
+    updater = WinToolsUpdater(Path(args.output), Path(args.build_dir), verbose=args.verbose,
+                              force=args.force)
 
     print("\n" + "=" * 60)
     print("Windows Pentesting Tools Updater")
     print("=" * 60)
 
-    targets = args.tools if args.tools else list(TOOLS.keys())
+    targets = args.tools if args.tools else list(TOOLS)
     results: Dict[str, bool] = {}
 
     for name in targets:
-        print("\n" + "=" * 60)
+        updater.emit("\n" + "=" * 60)
         updater.log(f"Processing: {name.upper()}")
-        print("=" * 60)
-        results[name] = updater.update_tool(name)
+        updater.emit("=" * 60)
+        try:
+            results[name] = updater.update_tool(name)
+        finally:
+            updater.flush_log()
 
     print("\n" + "=" * 60)
     print("SUMMARY")
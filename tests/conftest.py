@@ -2,20 +2,76 @@
 Pytest configuration and fixtures for WinBins tests.
 """
 
+import os
 import pytest
+import subprocess
+import sys
 import tempfile
-import shutil
 from pathlib import Path
-from typing import Dict, Any
+from types import SimpleNamespace
+from typing import Any, Dict, List
 from unittest.mock import MagicMock, patch
 
+from winbins.builders.factory import BuilderFactory
+from winbins.tools.registry import ToolRegistry
+
+try:
+    import pyfakefs  # noqa: F401
+    FAKEFS_AVAILABLE = True
+except ImportError:
+    FAKEFS_AVAILABLE = False
+
+
+def pytest_configure(config):
+    """On Linux CI, keep pytest's temporary directories on the /dev/shm tmpfs."""
+    if (
+        os.environ.get("CI")
+        and sys.platform.startswith("linux")
+        and os.access("/dev/shm", os.W_OK)
+    ):
+        # Read by tmp_path_factory in place of tempfile.gettempdir(); an explicit
+        # --basetemp or a value set by the caller still wins
+        os.environ.setdefault("PYTEST_DEBUG_TEMPROOT", "/dev/shm")
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-integration",
+        action="store_true",
+        help="run integration tests on Windows, where they are skipped by default",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Mark tests in *Integration classes; skip them on Windows unless asked for."""
+    skip = None
+    if sys.platform == "win32" and not config.getoption("--run-integration"):
+        skip = pytest.mark.skip(reason="slow on Windows; covered on Linux (use --run-integration)")
+    for item in items:
+        if item.cls is not None and "Integration" in item.cls.__name__:
+            item.add_marker(pytest.mark.integration)
+            if skip is not None:
+                item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def _temp_root(tmp_path_factory):
+    """Session-wide parent for per-test temporary directories."""
+    return tmp_path_factory.mktemp("winbins")
+
 
 @pytest.fixture
-def temp_dir():
-    """Create a temporary directory for tests."""
-    temp_path = Path(tempfile.mkdtemp())
-    yield temp_path
-    shutil.rmtree(temp_path, ignore_errors=True)
+def temp_dir(_temp_root, request):
+    """Create a temporary directory for tests.
+
+    Directories live under one session root that pytest prunes on later runs,
+    so there is no per-test teardown. Tests marked ``fakefs`` get a directory
+    on pyfakefs's in-memory filesystem instead, when pyfakefs is installed.
+    """
+    if FAKEFS_AVAILABLE and request.node.get_closest_marker("fakefs"):
+        fs = request.getfixturevalue("fs")
+        return Path(fs.create_dir(f"/tmp/{request.node.originalname}").path)
+    return Path(tempfile.mkdtemp(prefix=f"{request.node.originalname}-", dir=_temp_root))
 
 
 @pytest.fixture
@@ -72,7 +128,7 @@ def sample_tools() -> Dict[str, Dict[str, Any]]:
 def mock_subprocess():
     """Mock subprocess.run for command execution tests."""
     with patch("subprocess.run") as mock:
-        mock.return_value = MagicMock(
+        mock.return_value = SimpleNamespace(
             returncode=0,
             stdout="Success",
             stderr="",
@@ -80,6 +136,55 @@ def mock_subprocess():
         yield mock
 
 
+class FakeRun:
+    """Recording stand-in for subprocess.run.
+
+    Calls return ``queue`` entries in order (exceptions are raised), then
+    ``default`` once the queue is empty.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.queue = []
+        self.default = subprocess.CompletedProcess([], 0, stdout="", stderr="")
+
+    def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        result = self.queue.pop(0) if self.queue else self.default
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    def returns(self, returncode: int = 0, stdout: str = "", stderr: str = ""):
+        """Set the result returned once the queue is exhausted."""
+        self.default = subprocess.CompletedProcess([], returncode, stdout=stdout, stderr=stderr)
+
+    @property
+    def commands(self) -> List[List[str]]:
+        """Command lists of every call so far."""
+        return [args[0] for args, _ in self.calls]
+
+    @property
+    def last(self) -> List[str]:
+        """Command list of the most recent call."""
+        return self.calls[-1][0][0]
+
+
+@pytest.fixture
+def fake_run(monkeypatch):
+    """Replace subprocess.run with a FakeRun that succeeds with empty output."""
+    fake = FakeRun()
+    monkeypatch.setattr("subprocess.run", fake)
+    return fake
+
+
+@pytest.fixture(autouse=True)
+def git_executable(monkeypatch):
+    """Run git as plain "git" so recorded commands do not depend on the host's PATH."""
+    monkeypatch.setattr("winbins.git_ops._resolve_git", lambda: "git")
+    return "git"
+
+
 @pytest.fixture
 def mock_shutil_which():
     """Mock shutil.which for dependency checking tests."""
@@ -91,9 +196,82 @@ def mock_shutil_which():
 @pytest.fixture
 def mock_git_available(mock_subprocess):
     """Mock git as available."""
-    mock_subprocess.return_value = MagicMock(
+    mock_subprocess.return_value = SimpleNamespace(
         returncode=0,
         stdout="git version 2.40.0",
         stderr="",
     )
     return mock_subprocess
+
+
+@pytest.fixture
+def make_updater():
+    """Factory for mock WinToolsUpdater instances with their results preset."""
+    def _make(update_all=None, output_dir="/test/output"):
+        updater = MagicMock()
+        updater.update_all.return_value = update_all or {}
+        updater.output_dir.absolute.return_value = output_dir
+        return updater
+    return _make
+
+
+@pytest.fixture
+def mock_updater_class(monkeypatch, make_updater):
+    """Replace the CLI's WinToolsUpdater with a mock class."""
+    updater_class = MagicMock(return_value=make_updater())
+    monkeypatch.setattr("winbins.cli.WinToolsUpdater", updater_class)
+    return updater_class
+
+
+@pytest.fixture
+def mock_updater(mock_updater_class):
+    """The updater instance the CLI receives from mock_updater_class."""
+    return mock_updater_class.return_value
+
+
+@pytest.fixture
+def mock_load_config(monkeypatch):
+    """Replace the CLI's load_config with a mock returning default settings."""
+    config = MagicMock()
+    config.output_dir = "./binaries"
+    config.build_dir = "./build"
+    config.tools = {}
+    loader = MagicMock(return_value=config)
+    monkeypatch.setattr("winbins.cli.load_config", loader)
+    return loader
+
+
+@pytest.fixture
+def mock_build_deps(monkeypatch):
+    """Report git and all builders as available; tests adjust the mocks."""
+    git = MagicMock(return_value=True)
+    builders = MagicMock(return_value={"msbuild": True, "dotnet": True})
+    monkeypatch.setattr("winbins.git_ops.GitOperations.is_git_available", git)
+    monkeypatch.setattr("winbins.builders.BuilderFactory.list_available", builders)
+    return SimpleNamespace(git=git, builders=builders)
+
+
+@pytest.fixture(scope="module")
+def registry():
+    """Default tool registry, loaded once per module; tests must not modify it."""
+    return ToolRegistry()
+
+
+@pytest.fixture
+def minimal_registry(sample_tool_config):
+    """Registry holding only the msbuild-based sample tool."""
+    return ToolRegistry(tools={"sample": sample_tool_config})
+
+
+@pytest.fixture
+def empty_registry():
+    """Registry with no tools."""
+    return ToolRegistry(tools={})
+
+
+@pytest.fixture(autouse=True)
+def builder_registry(monkeypatch):
+    """Give every test a private copy of BuilderFactory's registrations."""
+    builders = dict(BuilderFactory._builders)
+    monkeypatch.setattr(BuilderFactory, "_builders", builders)
+    return builders
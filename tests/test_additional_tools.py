@@ -80,18 +80,18 @@ class TestAdditionalTools:
 class TestGetAdditionalTools:
     """Tests for get_additional_tools function."""
 
-    def test_get_additional_tools_returns_copy(self):
-        """Test that get_additional_tools returns a copy."""
-        tools1 = get_additional_tools()
-        tools2 = get_additional_tools()
+    def test_get_additional_tools_read_only(self):
+        """Test that get_additional_tools returns a read-only view."""
+        tools = get_additional_tools()
 
-        # Should be equal but not same object
-        assert tools1 == tools2
-        assert tools1 is not tools2
+        with pytest.raises(TypeError):
+            tools["new_tool"] = {"repo": "test"}
 
-    def test_get_additional_tools_modification_safe(self):
-        """Test that modifying returned dict doesn't affect original."""
-        tools = get_additional_tools()
+        assert "new_tool" not in ADDITIONAL_TOOLS
+
+    def test_get_additional_tools_copy_is_modification_safe(self):
+        """Test that modifying a dict() copy doesn't affect the original."""
+        tools = dict(get_additional_tools())
         tools["new_tool"] = {"repo": "test"}
 
         # Original should not be modified
@@ -2,16 +2,42 @@
 Tests for the builders module.
 """
 
+import os
 import pytest
+import subprocess
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import patch
 
-from winbins.builders.base import Builder, BuildResult
-from winbins.builders.msbuild import MSBuildBuilder
+from winbins.builders.base import Builder, BuildResult, copy_file
+from winbins.builders.msbuild import MSBuildBuilder, add_parallel_flags
 from winbins.builders.dotnet import DotNetBuilder
 from winbins.builders.factory import BuilderFactory, get_builder
 from winbins.tools.base import BuildSystem
 
+OUTPUT_EXE = Path("/output/tool.exe")
+ARTIFACT_EXE = Path("/a.exe")
+ARTIFACT_DLL = Path("/b.dll")
+
+
+@pytest.fixture
+def which_found(monkeypatch):
+    """Report every builder executable as installed."""
+    monkeypatch.setattr("shutil.which", lambda name: f"/usr/bin/{name}")
+
+
+@pytest.fixture
+def which_missing(monkeypatch):
+    """Report every builder executable as missing."""
+    monkeypatch.setattr("shutil.which", lambda name: None)
+
+
+@pytest.fixture
+def msbuild_only(monkeypatch):
+    """Report MSBuild as installed and the .NET SDK as missing."""
+    monkeypatch.setattr(MSBuildBuilder, "is_available", lambda self: True)
+    monkeypatch.setattr(DotNetBuilder, "is_available", lambda self: False)
+
 
 class TestBuildResult:
     """Tests for BuildResult dataclass."""
@@ -20,12 +46,12 @@ class TestBuildResult:
         """Test successful build result."""
         result = BuildResult(
             success=True,
-            output_path=Path("/output/tool.exe"),
+            output_path=OUTPUT_EXE,
             return_code=0,
         )
         assert result.success is True
         assert result.failed is False
-        assert result.output_path == Path("/output/tool.exe")
+        assert result.output_path is OUTPUT_EXE
 
     def test_failed_result(self):
         """Test failed build result."""
@@ -42,15 +68,15 @@ class TestBuildResult:
         """Test artifacts list in result."""
         result = BuildResult(
             success=True,
-            artifacts=[Path("/a.exe"), Path("/b.dll")],
+            artifacts=[ARTIFACT_EXE, ARTIFACT_DLL],
         )
-        assert len(result.artifacts) == 2
+        assert result.artifacts == [ARTIFACT_EXE, ARTIFACT_DLL]
 
 
 class TestBuilderBase:
     """Tests for Builder base class."""
 
-    @patch("shutil.copy2")
+    @patch("winbins.builders.base.copy_file")
     def test_copy_artifact_success(self, mock_copy, temp_dir):
         """Test copying artifact successfully."""
         builder = MSBuildBuilder()
@@ -63,7 +89,7 @@ class TestBuilderBase:
         assert result is True
         mock_copy.assert_called_once()
 
-    @patch("shutil.copy2")
+    @patch("winbins.builders.base.copy_file")
     def test_copy_artifact_failure(self, mock_copy, temp_dir):
         """Test copying artifact failure."""
         mock_copy.side_effect = OSError("Copy failed")
@@ -75,11 +101,35 @@ class TestBuilderBase:
 
         assert result is False
 
-    @patch("subprocess.run")
-    def test_run_command_subprocess_error(self, mock_run):
+    def test_copy_file_preserves_data_and_mtime(self, temp_dir):
+        """Test copy_file copies contents and metadata like copy2."""
+        source = temp_dir / "source.exe"
+        source.write_bytes(b"MZ" + bytes(range(256)) * 1024)
+        os.utime(source, (1_600_000_000, 1_600_000_000))
+        dest = temp_dir / "dest.exe"
+
+        copy_file(source, dest)
+
+        assert dest.read_bytes() == source.read_bytes()
+        assert dest.stat().st_mtime == source.stat().st_mtime
+
+    @patch("os.copy_file_range", side_effect=OSError("EXDEV"), create=True)
+    def test_copy_file_fallback(self, mock_range, temp_dir):
+        """Test copy_file falls back to copyfile when copy_file_range fails."""
+        source = temp_dir / "source.exe"
+        source.write_bytes(b"MZ payload")
+        dest = temp_dir / "dest.exe"
+
+        copy_file(source, dest)
+
+        assert dest.read_bytes() == b"MZ payload"
+
+    def test_run_command_subprocess_error(self, fp):
         """Test running command with subprocess error."""
-        import subprocess
-        mock_run.side_effect = subprocess.SubprocessError("Subprocess failed")
+        def fail(process):
+            raise subprocess.SubprocessError("Subprocess failed")
+
+        fp.register(["test"], callback=fail)
         builder = MSBuildBuilder()
 
         result = builder.run_command(["test"])
@@ -88,14 +138,44 @@ class TestBuilderBase:
         assert "Subprocess failed" in result.error_message
 
 
-class TestMSBuildBuilder:
-    """Tests for MSBuildBuilder class."""
+BUILDERS = pytest.mark.parametrize(
+    "builder_cls,name,executable",
+    [(MSBuildBuilder, "MSBuild", "msbuild"), (DotNetBuilder, "DotNet", "dotnet")],
+    ids=["msbuild", "dotnet"],
+)
+
+
+class TestBuilderCommon:
+    """Behaviour shared by every concrete builder."""
 
-    def test_builder_properties(self):
+    @BUILDERS
+    def test_builder_properties(self, builder_cls, name, executable):
         """Test builder properties."""
-        builder = MSBuildBuilder()
-        assert builder.name == "MSBuild"
-        assert builder.executable == "msbuild"
+        builder = builder_cls()
+        assert builder.name == name
+        assert builder.executable == executable
+
+    @BUILDERS
+    def test_is_available_true(self, builder_cls, name, executable, which_found):
+        """Test availability when the build tool is installed."""
+        assert builder_cls().is_available() is True
+
+    @BUILDERS
+    def test_is_available_false(self, builder_cls, name, executable, which_missing):
+        """Test availability when the build tool is not installed."""
+        assert builder_cls().is_available() is False
+
+    @BUILDERS
+    def test_build_not_available(self, builder_cls, name, executable, temp_dir, which_missing):
+        """Test build when the build tool is not available."""
+        result = builder_cls().build(temp_dir, [executable, "build"], "bin/Release/test.exe")
+
+        assert result.success is False
+        assert "not found" in result.error_message.lower()
+
+
+class TestMSBuildBuilder:
+    """Tests for MSBuildBuilder class."""
 
     def test_custom_configuration(self):
         """Test custom configuration options."""
@@ -120,79 +200,73 @@ class TestMSBuildBuilder:
 
         assert "/p:Platform=" not in " ".join(cmd)
 
-    @patch("shutil.which")
-    def test_is_available_true(self, mock_which):
-        """Test availability when msbuild is installed."""
-        mock_which.return_value = "/usr/bin/msbuild"
-        builder = MSBuildBuilder()
-        assert builder.is_available() is True
+    def test_add_parallel_flags(self):
+        """Test parallel build switches are appended."""
+        cmd = add_parallel_flags(["msbuild", "Project.sln", "/p:Configuration=Release"])
 
-    @patch("shutil.which")
-    def test_is_available_false(self, mock_which):
-        """Test availability when msbuild is not installed."""
-        mock_which.return_value = None
-        builder = MSBuildBuilder()
-        assert builder.is_available() is False
+        assert cmd[:3] == ["msbuild", "Project.sln", "/p:Configuration=Release"]
+        assert any(arg.startswith("/m:") for arg in cmd)
+        assert "/nodeReuse:true" in cmd
+        assert "/p:UseSharedCompilation=true" in cmd
+        assert "/verbosity:minimal" in cmd
+
+    def test_add_parallel_flags_respects_existing(self):
+        """Test switches already in the command are not duplicated."""
+        original = ["msbuild", "P.sln", "-maxcpucount:2", "/nr:false",
+                    "/p:UseSharedCompilation=false", "-v:detailed"]
+        assert add_parallel_flags(original) == original
+
+    def test_add_parallel_flags_verbose(self):
+        """Test verbosity is left alone when not quiet."""
+        cmd = add_parallel_flags(["msbuild", "P.sln"], quiet=False)
+        assert "/verbosity:minimal" not in cmd
 
     @patch("subprocess.run")
-    def test_run_command_success(self, mock_run):
+    def test_build_uses_parallel_flags(self, mock_run, temp_dir, which_found):
+        """Test build runs msbuild with parallel switches."""
+        mock_run.return_value = SimpleNamespace(returncode=0, stdout="", stderr="")
+
+        builder = MSBuildBuilder()
+        builder.build(temp_dir, ["msbuild", "Project.sln"], "out.exe")
+
+        assert "/nodeReuse:true" in mock_run.call_args[0][0]
+
+    def test_run_command_success(self, fp):
         """Test running command successfully."""
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout="Build succeeded",
-            stderr="",
-        )
+        fp.register(["msbuild", "test.sln"], returncode=0, stdout="Build succeeded")
         builder = MSBuildBuilder()
         result = builder.run_command(["msbuild", "test.sln"])
 
         assert result.success is True
         assert result.return_code == 0
+        assert "Build succeeded" in result.stdout
 
-    @patch("subprocess.run")
-    def test_run_command_failure(self, mock_run):
+    def test_run_command_failure(self, fp):
         """Test running command that fails."""
-        mock_run.return_value = MagicMock(
-            returncode=1,
-            stdout="",
-            stderr="Error: Build failed",
-        )
+        fp.register(["msbuild", "test.sln"], returncode=1, stderr="Error: Build failed")
         builder = MSBuildBuilder()
         result = builder.run_command(["msbuild", "test.sln"])
 
         assert result.success is False
         assert result.return_code == 1
+        assert "Build failed" in result.stderr
 
-    @patch("subprocess.run")
-    def test_run_command_not_found(self, mock_run):
+    def test_run_command_not_found(self, fp):
         """Test running command that doesn't exist."""
-        mock_run.side_effect = FileNotFoundError()
-        builder = MSBuildBuilder()
-        result = builder.run_command(["nonexistent"])
-
-        assert result.success is False
-        assert "not found" in result.error_message.lower()
+        def missing(process):
+            raise FileNotFoundError()
 
-    @patch("shutil.which")
-    def test_build_not_available(self, mock_which, temp_dir):
-        """Test build when msbuild not available."""
-        mock_which.return_value = None
+        fp.register(["nonexistent"], callback=missing)
         builder = MSBuildBuilder()
-
-        result = builder.build(
-            temp_dir,
-            ["msbuild", "test.sln"],
-            "bin/Release/test.exe"
-        )
+        result = builder.run_command(["nonexistent"])
 
         assert result.success is False
         assert "not found" in result.error_message.lower()
 
-    @patch("shutil.which")
     @patch("subprocess.run")
-    def test_build_success(self, mock_run, mock_which, temp_dir):
+    def test_build_success(self, mock_run, temp_dir, which_found):
         """Test successful build."""
-        mock_which.return_value = "/usr/bin/msbuild"
-        mock_run.return_value = MagicMock(
+        mock_run.return_value = SimpleNamespace(
             returncode=0,
             stdout="Build succeeded",
             stderr="",
@@ -212,12 +286,10 @@ class TestMSBuildBuilder:
         assert result.success is True
         assert result.output_path == temp_dir / "bin" / "Release" / "test.exe"
 
-    @patch("shutil.which")
     @patch("subprocess.run")
-    def test_build_failure(self, mock_run, mock_which, temp_dir):
+    def test_build_failure(self, mock_run, temp_dir, which_found):
         """Test failed build."""
-        mock_which.return_value = "/usr/bin/msbuild"
-        mock_run.return_value = MagicMock(
+        mock_run.return_value = SimpleNamespace(
             returncode=1,
             stdout="",
             stderr="Build failed",
@@ -232,12 +304,10 @@ class TestMSBuildBuilder:
 
         assert result.success is False
 
-    @patch("shutil.which")
     @patch("subprocess.run")
-    def test_build_output_not_found(self, mock_run, mock_which, temp_dir):
+    def test_build_output_not_found(self, mock_run, temp_dir, which_found):
         """Test build when output file not found."""
-        mock_which.return_value = "/usr/bin/msbuild"
-        mock_run.return_value = MagicMock(
+        mock_run.return_value = SimpleNamespace(
             returncode=0,
             stdout="Build succeeded",
             stderr="",
@@ -258,12 +328,6 @@ class TestMSBuildBuilder:
 class TestDotNetBuilder:
     """Tests for DotNetBuilder class."""
 
-    def test_builder_properties(self):
-        """Test builder properties."""
-        builder = DotNetBuilder()
-        assert builder.name == "DotNet"
-        assert builder.executable == "dotnet"
-
     def test_custom_options(self):
         """Test custom configuration options."""
         builder = DotNetBuilder(
@@ -302,34 +366,10 @@ class TestDotNetBuilder:
         assert "-r" in cmd
         assert "win-x64" in cmd
 
-    @patch("shutil.which")
-    def test_is_available(self, mock_which):
-        """Test availability check."""
-        mock_which.return_value = "/usr/bin/dotnet"
-        builder = DotNetBuilder()
-        assert builder.is_available() is True
-
-    @patch("shutil.which")
-    def test_build_not_available(self, mock_which, temp_dir):
-        """Test build when dotnet not available."""
-        mock_which.return_value = None
-        builder = DotNetBuilder()
-
-        result = builder.build(
-            temp_dir,
-            ["dotnet", "build", "-c", "Release"],
-            "bin/Release/net6.0/test.dll"
-        )
-
-        assert result.success is False
-        assert "not found" in result.error_message.lower()
-
-    @patch("shutil.which")
     @patch("subprocess.run")
-    def test_build_success(self, mock_run, mock_which, temp_dir):
+    def test_build_success(self, mock_run, temp_dir, which_found):
         """Test successful build."""
-        mock_which.return_value = "/usr/bin/dotnet"
-        mock_run.return_value = MagicMock(
+        mock_run.return_value = SimpleNamespace(
             returncode=0,
             stdout="Build succeeded",
             stderr="",
@@ -349,12 +389,10 @@ class TestDotNetBuilder:
         assert result.success is True
         assert result.output_path == temp_dir / "bin" / "Release" / "net6.0" / "test.dll"
 
-    @patch("shutil.which")
     @patch("subprocess.run")
-    def test_build_failure(self, mock_run, mock_which, temp_dir):
+    def test_build_failure(self, mock_run, temp_dir, which_found):
         """Test failed build."""
-        mock_which.return_value = "/usr/bin/dotnet"
-        mock_run.return_value = MagicMock(
+        mock_run.return_value = SimpleNamespace(
             returncode=1,
             stdout="",
             stderr="Build failed",
@@ -369,12 +407,21 @@ class TestDotNetBuilder:
 
         assert result.success is False
 
-    @patch("shutil.which")
+    def test_parallel_flags(self):
+        """Test parallel switches for dotnet build and msbuild commands."""
+        builder = DotNetBuilder()
+
+        assert builder._with_parallel_flags(["dotnet", "build", "-c", "Release"])[-1] == \
+            "-maxcpucount"
+        assert builder._with_parallel_flags(["dotnet", "build", "-m:2"]) == \
+            ["dotnet", "build", "-m:2"]
+        assert "/nodeReuse:true" in builder._with_parallel_flags(["dotnet", "msbuild", "X.sln"])
+        assert builder._with_parallel_flags(["dotnet", "restore"]) == ["dotnet", "restore"]
+
     @patch("subprocess.run")
-    def test_restore(self, mock_run, mock_which, temp_dir):
+    def test_restore(self, mock_run, temp_dir, which_found):
         """Test NuGet restore."""
-        mock_which.return_value = "/usr/bin/dotnet"
-        mock_run.return_value = MagicMock(
+        mock_run.return_value = SimpleNamespace(
             returncode=0,
             stdout="Restore succeeded",
             stderr="",
@@ -387,12 +434,10 @@ class TestDotNetBuilder:
         call_args = mock_run.call_args[0][0]
         assert "restore" in call_args
 
-    @patch("shutil.which")
     @patch("subprocess.run")
-    def test_publish(self, mock_run, mock_which, temp_dir):
+    def test_publish(self, mock_run, temp_dir, which_found):
         """Test publish operation."""
-        mock_which.return_value = "/usr/bin/dotnet"
-        mock_run.return_value = MagicMock(
+        mock_run.return_value = SimpleNamespace(
             returncode=0,
             stdout="Publish succeeded",
             stderr="",
@@ -414,12 +459,10 @@ class TestDotNetBuilder:
         call_args = mock_run.call_args[0][0]
         assert "publish" in call_args
 
-    @patch("shutil.which")
     @patch("subprocess.run")
-    def test_publish_already_has_publish(self, mock_run, mock_which, temp_dir):
+    def test_publish_already_has_publish(self, mock_run, temp_dir, which_found):
         """Test publish when command already contains publish."""
-        mock_which.return_value = "/usr/bin/dotnet"
-        mock_run.return_value = MagicMock(
+        mock_run.return_value = SimpleNamespace(
             returncode=0,
             stdout="Publish succeeded",
             stderr="",
@@ -474,35 +517,31 @@ class TestBuilderFactory:
         assert builder.verbose is True
         assert builder.env_vars == {"TEST": "value"}
 
-    def test_get_for_tool_msbuild(self):
-        """Test getting builder for msbuild requirement."""
-        builder = BuilderFactory.get_for_tool("msbuild")
-        assert isinstance(builder, MSBuildBuilder)
-
-    def test_get_for_tool_dotnet(self):
-        """Test getting builder for dotnet requirement."""
-        builder = BuilderFactory.get_for_tool("dotnet")
-        assert isinstance(builder, DotNetBuilder)
-
-    def test_get_for_tool_case_insensitive(self):
-        """Test getting builder is case insensitive."""
-        builder = BuilderFactory.get_for_tool("MSBUILD")
-        assert isinstance(builder, MSBuildBuilder)
-
-    def test_get_for_tool_unknown(self):
-        """Test getting builder for unknown requirement."""
-        builder = BuilderFactory.get_for_tool("unknown")
-        assert builder is None
-
-    @patch.object(MSBuildBuilder, "is_available", return_value=True)
-    @patch.object(DotNetBuilder, "is_available", return_value=False)
-    def test_list_available(self, mock_dotnet, mock_msbuild):
+    @pytest.mark.parametrize(
+        "requires,expected",
+        [
+            ("msbuild", MSBuildBuilder),
+            ("dotnet", DotNetBuilder),
+            ("MSBUILD", MSBuildBuilder),
+            ("unknown", None),
+        ],
+        ids=["msbuild", "dotnet", "case_insensitive", "unknown"],
+    )
+    def test_get_for_tool(self, requires, expected):
+        """Test getting builder from a tool's requirement."""
+        builder = BuilderFactory.get_for_tool(requires)
+        if expected is None:
+            assert builder is None
+        else:
+            assert isinstance(builder, expected)
+
+    def test_list_available(self, msbuild_only):
         """Test listing available builders."""
         available = BuilderFactory.list_available()
         assert available["msbuild"] is True
         assert available["dotnet"] is False
 
-    def test_register_custom_builder(self):
+    def test_register_custom_builder(self, builder_registry):
         """Test registering custom builder."""
         class CustomBuilder(Builder):
             @property
@@ -519,6 +558,11 @@ class TestBuilderFactory:
         BuilderFactory.register(BuildSystem.CMAKE, CustomBuilder)
         builder = BuilderFactory.create(BuildSystem.CMAKE)
         assert isinstance(builder, CustomBuilder)
+        assert builder_registry[BuildSystem.CMAKE] is CustomBuilder
+
+    def test_register_does_not_leak(self):
+        """Test registrations from other tests are rolled back."""
+        assert BuildSystem.CMAKE not in BuilderFactory._builders
 
 
 class TestGetBuilderFunction:
@@ -3,171 +3,195 @@ Tests for the CLI module.
 """
 
 import pytest
-import json
-from pathlib import Path
-from io import StringIO
-from unittest.mock import MagicMock, patch, call
-
-from winbins.cli import (
-    create_parser,
-    list_tools,
-    check_dependencies,
-    run_update,
-    main,
-)
-from winbins.tools.registry import ToolRegistry
-from winbins.tools.base import ToolCategory
+from unittest.mock import patch
+
+
+@pytest.fixture(scope="module")
+def cli():
+    """The winbins.cli module, imported when the first test needs it."""
+    import winbins.cli
+    return winbins.cli
+
+
+@pytest.fixture(scope="module")
+def parser(cli):
+    """Shared CLI parser; parse_args does not mutate it."""
+    return cli.create_parser()
+
+
+# Command lines exercised by the tests, keyed by scenario name
+PARSER_ARGS = {
+    "defaults": [],
+    "output": ["-o", "/custom/path"],
+    "build_dir": ["-b", "/custom/build"],
+    "tools": ["-t", "rubeus", "seatbelt"],
+    "jobs": ["-j", "4"],
+    "fetch_jobs": ["--fetch-jobs", "8"],
+    "mirror": ["--mirror"],
+    "force": ["--force"],
+    "branch": ["--branch", "develop"],
+    "verbose": ["-v"],
+    "list": ["--list"],
+    "category": ["--category", "credential_access"],
+    "search": ["--search", "kerberos"],
+    "config": ["-c", "config.yaml"],
+    "check_deps": ["--check-deps"],
+    "rubeus": ["-t", "rubeus"],
+    "unknown_tool": ["-t", "nonexistent_tool"],
+    "config_tool": ["-c", "config.yaml", "-t", "custom_tool"],
+}
+
+
+@pytest.fixture(scope="module")
+def parsed(parser):
+    """Namespaces for every PARSER_ARGS scenario, parsed once; treat them as read-only."""
+    return {name: parser.parse_args(argv) for name, argv in PARSER_ARGS.items()}
 
 
 class TestCreateParser:
     """Tests for create_parser function."""
 
-    def test_parser_creation(self):
+    def test_parser_creation(self, parser):
         """Test that parser is created successfully."""
-        parser = create_parser()
         assert parser is not None
         assert parser.prog == "winbins"
 
-    def test_parser_has_version(self):
+    def test_parser_has_version(self, parser):
         """Test that parser has version argument."""
-        parser = create_parser()
         with pytest.raises(SystemExit):
             parser.parse_args(["--version"])
 
-    def test_parser_output_default(self):
+    def test_parser_output_default(self, parsed):
         """Test default output directory."""
-        parser = create_parser()
-        args = parser.parse_args([])
-        assert args.output == "./binaries"
+        assert parsed["defaults"].output == "./binaries"
 
-    def test_parser_output_custom(self):
+    def test_parser_output_custom(self, parsed):
         """Test custom output directory."""
-        parser = create_parser()
-        args = parser.parse_args(["-o", "/custom/path"])
-        assert args.output == "/custom/path"
+        assert parsed["output"].output == "/custom/path"
 
-    def test_parser_build_dir_default(self):
+    def test_parser_build_dir_default(self, parsed):
         """Test default build directory."""
-        parser = create_parser()
-        args = parser.parse_args([])
-        assert args.build_dir == "./build"
+        assert parsed["defaults"].build_dir == "./build"
 
-    def test_parser_build_dir_custom(self):
+    def test_parser_build_dir_custom(self, parsed):
         """Test custom build directory."""
-        parser = create_parser()
-        args = parser.parse_args(["-b", "/custom/build"])
-        assert args.build_dir == "/custom/build"
+        assert parsed["build_dir"].build_dir == "/custom/build"
 
-    def test_parser_tools(self):
+    def test_parser_tools(self, parsed):
         """Test specifying tools."""
-        parser = create_parser()
-        args = parser.parse_args(["-t", "rubeus", "seatbelt"])
-        assert args.tools == ["rubeus", "seatbelt"]
+        assert parsed["tools"].tools == ["rubeus", "seatbelt"]
+
+    def test_parser_jobs(self, parsed):
+        """Test parallel jobs argument."""
+        assert parsed["defaults"].jobs == 1
+        assert parsed["jobs"].jobs == 4
+
+    def test_parser_fetch_jobs(self, parsed):
+        """Test concurrent fetch argument."""
+        assert parsed["defaults"].fetch_jobs == 1
+        assert parsed["fetch_jobs"].fetch_jobs == 8
+
+    def test_parser_mirror(self, parsed):
+        """Test mirror/worktree flag."""
+        assert parsed["defaults"].mirror is False
+        assert parsed["mirror"].mirror is True
 
-    def test_parser_branch(self):
+    def test_parser_force(self, parsed):
+        """Test force rebuild flag."""
+        assert parsed["defaults"].force is False
+        assert parsed["force"].force is True
+
+    def test_parser_branch(self, parsed):
         """Test specifying branch."""
-        parser = create_parser()
-        args = parser.parse_args(["--branch", "develop"])
-        assert args.branch == "develop"
+        assert parsed["branch"].branch == "develop"
 
-    def test_parser_verbose(self):
+    def test_parser_verbose(self, parsed):
         """Test verbose flag."""
-        parser = create_parser()
-        args = parser.parse_args(["-v"])
-        assert args.verbose is True
+        assert parsed["verbose"].verbose is True
 
-    def test_parser_list(self):
+    def test_parser_list(self, parsed):
         """Test list flag."""
-        parser = create_parser()
-        args = parser.parse_args(["--list"])
-        assert args.list is True
+        assert parsed["list"].list is True
 
-    def test_parser_category(self):
+    def test_parser_category(self, parsed):
         """Test category filter."""
-        parser = create_parser()
-        args = parser.parse_args(["--category", "credential_access"])
-        assert args.category == "credential_access"
+        assert parsed["category"].category == "credential_access"
 
-    def test_parser_search(self):
+    def test_parser_category_choices(self, cli, parser):
+        """Test every ToolCategory is offered and unknown categories are rejected."""
+        assert set(cli._CATEGORY_CHOICES) == {c.value for c in cli.ToolCategory}
+        with pytest.raises(SystemExit):
+            parser.parse_args(["--category", "not_a_category"])
+
+    def test_parser_search(self, parsed):
         """Test search argument."""
-        parser = create_parser()
-        args = parser.parse_args(["--search", "kerberos"])
-        assert args.search == "kerberos"
+        assert parsed["search"].search == "kerberos"
 
-    def test_parser_config(self):
+    def test_parser_config(self, parsed):
         """Test config file argument."""
-        parser = create_parser()
-        args = parser.parse_args(["-c", "config.yaml"])
-        assert args.config == "config.yaml"
+        assert parsed["config"].config == "config.yaml"
 
-    def test_parser_check_deps(self):
+    def test_parser_check_deps(self, parsed):
         """Test check-deps flag."""
-        parser = create_parser()
-        args = parser.parse_args(["--check-deps"])
-        assert args.check_deps is True
+        assert parsed["check_deps"].check_deps is True
 
 
 class TestListTools:
     """Tests for list_tools function."""
 
-    @patch("sys.stdout", new_callable=StringIO)
-    def test_list_all_tools(self, mock_stdout):
+    def test_list_all_tools(self, cli, capsys, registry):
         """Test listing all tools."""
-        registry = ToolRegistry()
-        result = list_tools(registry)
+        result = cli.list_tools(registry)
 
         assert result == 0
-        output = mock_stdout.getvalue()
+        output = capsys.readouterr().out
         assert "Available Tools:" in output
         assert "rubeus" in output
 
-    @patch("sys.stdout", new_callable=StringIO)
-    def test_list_tools_by_category(self, mock_stdout):
+    def test_list_tools_by_category(self, cli, capsys, registry):
         """Test listing tools by category."""
-        registry = ToolRegistry()
-        result = list_tools(registry, category="credential_access")
+        result = cli.list_tools(registry, category="credential_access")
 
         assert result == 0
-        output = mock_stdout.getvalue()
+        output = capsys.readouterr().out
         assert "rubeus" in output
 
-    @patch("sys.stdout", new_callable=StringIO)
-    def test_list_tools_by_search(self, mock_stdout):
+    def test_list_tools_by_category_member(self, cli, capsys, registry):
+        """Test a ToolCategory member filters like its string value."""
+        result = cli.list_tools(registry, category=cli.ToolCategory.CREDENTIAL_ACCESS)
+
+        assert result == 0
+        assert "rubeus" in capsys.readouterr().out
+
+    def test_list_tools_by_search(self, cli, capsys, registry):
         """Test listing tools by search."""
-        registry = ToolRegistry()
-        result = list_tools(registry, search="kerberos")
+        result = cli.list_tools(registry, search="kerberos")
 
         assert result == 0
-        output = mock_stdout.getvalue()
+        output = capsys.readouterr().out
         assert "rubeus" in output
 
-    @patch("sys.stdout", new_callable=StringIO)
-    def test_list_tools_search_no_results(self, mock_stdout):
+    def test_list_tools_search_no_results(self, cli, capsys, registry):
         """Test listing tools with search that finds nothing."""
-        registry = ToolRegistry()
-        result = list_tools(registry, search="nonexistent_tool_xyz")
+        result = cli.list_tools(registry, search="nonexistent_tool_xyz")
 
         assert result == 1
-        output = mock_stdout.getvalue()
+        output = capsys.readouterr().out
         assert "No tools found" in output
 
-    @patch("sys.stdout", new_callable=StringIO)
-    def test_list_tools_category_no_results(self, mock_stdout):
+    def test_list_tools_category_no_results(self, cli, capsys, empty_registry):
         """Test listing tools with empty category."""
-        registry = ToolRegistry(tools={})
-        result = list_tools(registry, category="credential_access")
+        result = cli.list_tools(empty_registry, category=cli.ToolCategory.CREDENTIAL_ACCESS)
 
         assert result == 1
-        output = mock_stdout.getvalue()
-        assert "No tools found" in output
+        output = capsys.readouterr().out
+        assert "No tools found in category 'credential_access'" in output
 
-    @patch("sys.stdout", new_callable=StringIO)
-    def test_list_tools_shows_details(self, mock_stdout):
+    def test_list_tools_shows_details(self, cli, capsys, registry):
         """Test that tool details are shown."""
-        registry = ToolRegistry()
-        result = list_tools(registry)
+        result = cli.list_tools(registry)
 
-        output = mock_stdout.getvalue()
+        output = capsys.readouterr().out
         assert "Description:" in output
         assert "Repository:" in output
         assert "Requires:" in output
@@ -177,49 +201,33 @@ class TestListTools:
 class TestCheckDependencies:
     """Tests for check_dependencies function."""
 
-    @patch("winbins.builders.BuilderFactory.list_available")
-    @patch("winbins.git_ops.GitOperations.is_git_available")
-    @patch("sys.stdout", new_callable=StringIO)
-    def test_check_deps_all_available(self, mock_stdout, mock_git, mock_builders):
+    def test_check_deps_all_available(self, cli, capsys, mock_build_deps, minimal_registry):
         """Test dependency check when all available."""
-        mock_builders.return_value = {"msbuild": True, "dotnet": True}
-        mock_git.return_value = True
-
-        registry = ToolRegistry()
-        result = check_dependencies(registry)
+        result = cli.check_dependencies(minimal_registry)
 
-        output = mock_stdout.getvalue()
+        output = capsys.readouterr().out
         assert "Build Dependencies Status:" in output
         assert "[+]" in output
 
-    @patch("winbins.builders.BuilderFactory.list_available")
-    @patch("winbins.git_ops.GitOperations.is_git_available")
-    @patch("sys.stdout", new_callable=StringIO)
-    def test_check_deps_missing(self, mock_stdout, mock_git, mock_builders):
+    def test_check_deps_missing(self, cli, capsys, mock_build_deps, minimal_registry):
         """Test dependency check when some missing."""
-        mock_builders.return_value = {"msbuild": False, "dotnet": False}
-        mock_git.return_value = False
+        mock_build_deps.builders.return_value = {"msbuild": False, "dotnet": False}
+        mock_build_deps.git.return_value = False
 
-        registry = ToolRegistry()
-        result = check_dependencies(registry)
+        result = cli.check_dependencies(minimal_registry)
 
         assert result == 1
-        output = mock_stdout.getvalue()
+        output = capsys.readouterr().out
         assert "[-]" in output
         assert "MISSING" in output
 
-    @patch("winbins.builders.BuilderFactory.list_available")
-    @patch("winbins.git_ops.GitOperations.is_git_available")
-    @patch("sys.stdout", new_callable=StringIO)
-    def test_check_deps_shows_tool_status(self, mock_stdout, mock_git, mock_builders):
+    def test_check_deps_shows_tool_status(self, cli, capsys, mock_build_deps, minimal_registry):
         """Test that tool availability is shown."""
-        mock_builders.return_value = {"msbuild": True, "dotnet": False}
-        mock_git.return_value = True
+        mock_build_deps.builders.return_value = {"msbuild": True, "dotnet": False}
 
-        registry = ToolRegistry()
-        check_dependencies(registry)
+        cli.check_dependencies(minimal_registry)
 
-        output = mock_stdout.getvalue()
+        output = capsys.readouterr().out
         assert "Tool Availability:" in output
         assert "Can build:" in output
 
@@ -227,94 +235,53 @@ class TestCheckDependencies:
 class TestRunUpdate:
     """Tests for run_update function."""
 
-    @patch("winbins.cli.WinToolsUpdater")
-    @patch("sys.stdout", new_callable=StringIO)
-    def test_run_update_basic(self, mock_stdout, mock_updater_class):
+    def test_run_update_basic(self, cli, mock_updater, parsed):
         """Test basic update run."""
-        mock_updater = MagicMock()
         mock_updater.update_all.return_value = {"rubeus": True}
-        mock_updater.output_dir = MagicMock()
-        mock_updater.output_dir.absolute.return_value = "/test/output"
-        mock_updater_class.return_value = mock_updater
 
-        parser = create_parser()
-        args = parser.parse_args(["-t", "rubeus"])
-
-        result = run_update(args)
+        result = cli.run_update(parsed["rubeus"])
 
         assert result == 0
         mock_updater.update_all.assert_called_once()
 
-    @patch("winbins.cli.WinToolsUpdater")
-    @patch("sys.stdout", new_callable=StringIO)
-    def test_run_update_with_failures(self, mock_stdout, mock_updater_class):
+    def test_run_update_with_failures(self, cli, capsys, mock_updater_class, make_updater, parsed):
         """Test update run with failures."""
-        mock_updater = MagicMock()
-        mock_updater.update_all.return_value = {"rubeus": True, "seatbelt": False}
-        mock_updater.output_dir = MagicMock()
-        mock_updater.output_dir.absolute.return_value = "/test/output"
-        mock_updater_class.return_value = mock_updater
-
-        parser = create_parser()
-        args = parser.parse_args(["-t", "rubeus", "seatbelt"])
+        mock_updater_class.return_value = make_updater(
+            update_all={"rubeus": True, "seatbelt": False}
+        )
 
-        result = run_update(args)
+        result = cli.run_update(parsed["tools"])
 
         assert result == 1
-        output = mock_stdout.getvalue()
+        output = capsys.readouterr().out
         assert "+ SUCCESS" in output
         assert "- FAILED" in output
 
-    @patch("winbins.cli.WinToolsUpdater")
-    @patch("sys.stdout", new_callable=StringIO)
-    def test_run_update_unknown_tool(self, mock_stdout, mock_updater_class):
+    def test_run_update_unknown_tool(self, cli, capsys, mock_updater_class, parsed):
         """Test update run with unknown tool."""
-        parser = create_parser()
-        args = parser.parse_args(["-t", "nonexistent_tool"])
-
-        result = run_update(args)
+        result = cli.run_update(parsed["unknown_tool"])
 
         assert result == 1
-        output = mock_stdout.getvalue()
+        output = capsys.readouterr().out
         assert "[ERROR]" in output
         assert "Unknown tool" in output
+        mock_updater_class.assert_not_called()
 
-    @patch("winbins.cli.WinToolsUpdater")
-    @patch("winbins.cli.load_config")
-    @patch("sys.stdout", new_callable=StringIO)
-    def test_run_update_with_config(self, mock_stdout, mock_load_config, mock_updater_class):
+    def test_run_update_with_config(self, cli, mock_load_config, mock_updater_class, parsed):
         """Test update run with config file."""
-        mock_config = MagicMock()
-        mock_config.output_dir = "/config/output"
-        mock_config.build_dir = "/config/build"
-        mock_config.tools = {}
-        mock_load_config.return_value = mock_config
-
-        mock_updater = MagicMock()
-        mock_updater.update_all.return_value = {}
-        mock_updater.output_dir = MagicMock()
-        mock_updater.output_dir.absolute.return_value = "/config/output"
-        mock_updater_class.return_value = mock_updater
+        mock_load_config.return_value.output_dir = "/config/output"
+        mock_load_config.return_value.build_dir = "/config/build"
 
-        parser = create_parser()
-        args = parser.parse_args(["-c", "config.yaml"])
-
-        run_update(args)
+        cli.run_update(parsed["config"])
 
         # Verify config was used
         mock_updater_class.assert_called_once()
         call_kwargs = mock_updater_class.call_args[1]
         assert call_kwargs["output_dir"] == "/config/output"
 
-    @patch("winbins.cli.WinToolsUpdater")
-    @patch("winbins.cli.load_config")
-    @patch("sys.stdout", new_callable=StringIO)
-    def test_run_update_with_config_tools(self, mock_stdout, mock_load_config, mock_updater_class):
+    def test_run_update_with_config_tools(self, cli, mock_load_config, mock_updater, parsed):
         """Test update run with custom tools from config."""
-        mock_config = MagicMock()
-        mock_config.output_dir = "./binaries"
-        mock_config.build_dir = "./build"
-        mock_config.tools = {
+        mock_load_config.return_value.tools = {
             "custom_tool": {
                 "repo": "https://github.com/test/custom.git",
                 "build_cmd": ["make"],
@@ -322,18 +289,8 @@ class TestRunUpdate:
                 "requires": "make",
             }
         }
-        mock_load_config.return_value = mock_config
-
-        mock_updater = MagicMock()
-        mock_updater.update_all.return_value = {}
-        mock_updater.output_dir = MagicMock()
-        mock_updater.output_dir.absolute.return_value = "./binaries"
-        mock_updater_class.return_value = mock_updater
-
-        parser = create_parser()
-        args = parser.parse_args(["-c", "config.yaml", "-t", "custom_tool"])
 
-        result = run_update(args)
+        result = cli.run_update(parsed["config_tool"])
 
         # Should succeed because custom_tool is in config
         assert result == 0
@@ -343,73 +300,73 @@ class TestMain:
     """Tests for main function."""
 
     @patch("winbins.cli.list_tools")
-    def test_main_list(self, mock_list_tools):
+    def test_main_list(self, mock_list_tools, cli):
         """Test main with --list flag."""
         mock_list_tools.return_value = 0
 
-        result = main(["--list"])
+        result = cli.main(["--list"])
 
         assert result == 0
         mock_list_tools.assert_called_once()
 
     @patch("winbins.cli.list_tools")
-    def test_main_search(self, mock_list_tools):
+    def test_main_search(self, mock_list_tools, cli):
         """Test main with --search flag."""
         mock_list_tools.return_value = 0
 
-        result = main(["--search", "kerberos"])
+        result = cli.main(["--search", "kerberos"])
 
         assert result == 0
         mock_list_tools.assert_called_once()
 
     @patch("winbins.cli.check_dependencies")
-    def test_main_check_deps(self, mock_check_deps):
+    def test_main_check_deps(self, mock_check_deps, cli):
         """Test main with --check-deps flag."""
         mock_check_deps.return_value = 0
 
-        result = main(["--check-deps"])
+        result = cli.main(["--check-deps"])
 
         assert result == 0
         mock_check_deps.assert_called_once()
 
     @patch("winbins.cli.run_update")
-    def test_main_update(self, mock_run_update):
+    def test_main_update(self, mock_run_update, cli):
         """Test main runs update by default."""
         mock_run_update.return_value = 0
 
-        result = main([])
+        result = cli.main([])
 
         assert result == 0
         mock_run_update.assert_called_once()
 
     @patch("winbins.cli.run_update")
-    def test_main_with_tools(self, mock_run_update):
+    def test_main_with_tools(self, mock_run_update, cli):
         """Test main with specific tools."""
         mock_run_update.return_value = 0
 
-        result = main(["-t", "rubeus", "seatbelt"])
+        result = cli.main(["-t", "rubeus", "seatbelt"])
 
         assert result == 0
         args = mock_run_update.call_args[0][0]
         assert args.tools == ["rubeus", "seatbelt"]
 
     @patch("winbins.cli.run_update")
-    def test_main_with_verbose(self, mock_run_update):
+    def test_main_with_verbose(self, mock_run_update, cli):
         """Test main with verbose flag."""
         mock_run_update.return_value = 0
 
-        result = main(["-v"])
+        result = cli.main(["-v"])
 
         assert result == 0
         args = mock_run_update.call_args[0][0]
         assert args.verbose is True
 
     @patch("winbins.cli.list_tools")
-    def test_main_list_with_category(self, mock_list_tools):
+    def test_main_list_with_category(self, mock_list_tools, cli):
         """Test main with --list and --category."""
         mock_list_tools.return_value = 0
 
-        result = main(["--list", "--category", "enumeration"])
+        result = cli.main(["--list", "--category", "enumeration"])
 
         assert result == 0
         mock_list_tools.assert_called_once()
@@ -420,35 +377,17 @@ class TestMain:
 class TestCLIIntegration:
     """Integration tests for CLI."""
 
-    @patch("sys.stdout", new_callable=StringIO)
-    def test_list_tools_integration(self, mock_stdout):
-        """Test listing tools end-to-end."""
-        result = main(["--list"])
+    def test_main_end_to_end(self, cli, capsys):
+        """Test --list dispatches from main() through list_tools."""
+        result = cli.main(["--list"])
 
         assert result == 0
-        output = mock_stdout.getvalue()
-        assert "Available Tools:" in output
-        assert "Total:" in output
-
-    @patch("sys.stdout", new_callable=StringIO)
-    def test_search_integration(self, mock_stdout):
-        """Test search end-to-end."""
-        result = main(["--search", "kerberos"])
-
-        assert result == 0
-        output = mock_stdout.getvalue()
-        assert "rubeus" in output
+        assert "Total:" in capsys.readouterr().out
 
-    @patch("winbins.builders.BuilderFactory.list_available")
-    @patch("winbins.git_ops.GitOperations.is_git_available")
-    @patch("sys.stdout", new_callable=StringIO)
-    def test_check_deps_integration(self, mock_stdout, mock_git, mock_builders):
+    def test_check_deps_integration(self, cli, capsys, mock_build_deps):
         """Test dependency check end-to-end."""
-        mock_builders.return_value = {"msbuild": True, "dotnet": True}
-        mock_git.return_value = True
-
-        result = main(["--check-deps"])
+        result = cli.main(["--check-deps"])
 
         assert result == 0
-        output = mock_stdout.getvalue()
+        output = capsys.readouterr().out
         assert "Build Dependencies Status:" in output
@@ -4,14 +4,138 @@ Tests for the config module.
 
 import json
 import pytest
+from contextlib import nullcontext
 from pathlib import Path
 
-from winbins.config import Config, ConfigError, load_config
+from winbins.config import Config, ConfigError, YAML_LOADER, load_config
+
+try:
+    import yaml
+    HAS_YAML = True
+except ImportError:
+    HAS_YAML = False
+
+requires_yaml = pytest.mark.skipif(not HAS_YAML, reason="PyYAML not installed")
+
+
+JSON_CONFIGS = {
+    "custom": {
+        "output_dir": "/custom/output",
+        "build_dir": "/custom/build",
+        "tools": {
+            "custom_tool": {
+                "repo": "https://github.com/test/tool.git",
+                "build_cmd": ["make"],
+                "output": "bin/tool",
+                "requires": "make"
+            }
+        }
+    },
+    "nested": {
+        "level1": {
+            "level2": {
+                "value": "nested_value"
+            }
+        }
+    },
+    "minimal": {"output_dir": "/test"},
+}
+
+
+@pytest.fixture(scope="module")
+def json_config(tmp_path_factory):
+    """Write each JSON_CONFIGS payload once per module and map its name to the path."""
+    config_dir = tmp_path_factory.mktemp("cfg")
+    paths = {}
+    for name, data in JSON_CONFIGS.items():
+        path = config_dir / f"{name}.json"
+        path.write_text(json.dumps(data))
+        paths[name] = str(path)
+    return paths
+
+
+def _save_and_reload(json_config, temp_dir):
+    config = Config()
+    config.set("output_dir", "/new/output")
+    config.set("tools.new_tool.repo", "https://github.com/test/tool.git")
+    save_path = temp_dir / "saved_config.json"
+    config.save(str(save_path))
+    return Config(str(save_path))
+
+
+def _load_unsupported(json_config, temp_dir):
+    return Config(str(temp_dir / "config.txt"))
+
+
+# (action, expected output_dir, other expected values by dotted key, expected exception)
+CONFIG_IO_CASES = [
+    pytest.param(
+        lambda json_config, temp_dir: Config(json_config["custom"]),
+        "/custom/output",
+        {
+            "build_dir": "/custom/build",
+            "tools.custom_tool.repo": "https://github.com/test/tool.git",
+        },
+        None,
+        id="load_json",
+    ),
+    pytest.param(
+        lambda json_config, temp_dir: Config(str(temp_dir / "nonexistent.json")),
+        "./binaries",
+        {},
+        None,
+        id="load_nonexistent_uses_defaults",
+    ),
+    pytest.param(
+        _save_and_reload,
+        "/new/output",
+        {"tools.new_tool.repo": "https://github.com/test/tool.git"},
+        None,
+        id="save_json",
+    ),
+    pytest.param(
+        lambda json_config, temp_dir: Config().save(),
+        None,
+        {},
+        ConfigError,
+        id="save_without_path",
+    ),
+    pytest.param(_load_unsupported, None, {}, ConfigError, id="unsupported_format"),
+]
 
 
 class TestConfig:
     """Tests for Config class."""
 
+    @pytest.mark.parametrize("action,output_dir,expected,raises", CONFIG_IO_CASES)
+    def test_config_io(self, json_config, temp_dir, action, output_dir, expected, raises):
+        """Test loading and saving configuration files."""
+        with pytest.raises(raises) if raises else nullcontext():
+            config = action(json_config, temp_dir)
+        if raises:
+            return
+
+        assert config.output_dir == output_dir
+        for key, value in expected.items():
+            assert config.get(key) == value
+
+    @pytest.mark.parametrize("use_orjson", [True, False], ids=["orjson", "stdlib"])
+    def test_json_backends_roundtrip(self, temp_dir, monkeypatch, use_orjson):
+        """Test JSON configs save and load the same with and without orjson."""
+        import winbins.config as config_module
+        if use_orjson and not config_module.ORJSON_AVAILABLE:
+            pytest.skip("orjson not installed")
+        monkeypatch.setattr(config_module, "ORJSON_AVAILABLE", use_orjson)
+
+        config = Config()
+        config.set("output_dir", "/json/output")
+        config.set("tools.json_tool.build_cmd", ["make", "-j4"])
+        save_path = temp_dir / f"roundtrip_{use_orjson}.json"
+        config.save(str(save_path))
+
+        assert json.loads(save_path.read_text()) == config._data
+        assert Config(str(save_path)).get("tools.json_tool.build_cmd") == ["make", "-j4"]
+
     def test_default_config(self):
         """Test default configuration values."""
         config = Config()
@@ -21,52 +145,9 @@ class TestConfig:
         assert config.tools == {}
         assert config.enabled_tools is None
 
-    def test_load_json_config(self, temp_dir):
-        """Test loading JSON configuration."""
-        config_data = {
-            "output_dir": "/custom/output",
-            "build_dir": "/custom/build",
-            "tools": {
-                "custom_tool": {
-                    "repo": "https://github.com/test/tool.git",
-                    "build_cmd": ["make"],
-                    "output": "bin/tool",
-                    "requires": "make"
-                }
-            }
-        }
-
-        config_path = temp_dir / "config.json"
-        with open(config_path, 'w') as f:
-            json.dump(config_data, f)
-
-        config = Config(str(config_path))
-
-        assert config.output_dir == "/custom/output"
-        assert config.build_dir == "/custom/build"
-        assert "custom_tool" in config.tools
-
-    def test_load_nonexistent_config(self, temp_dir):
-        """Test loading non-existent config file."""
-        config = Config(str(temp_dir / "nonexistent.json"))
-        # Should not raise, just use defaults
-        assert config.output_dir == "./binaries"
-
-    def test_get_nested_value(self, temp_dir):
+    def test_get_nested_value(self, json_config):
         """Test getting nested configuration values."""
-        config_data = {
-            "level1": {
-                "level2": {
-                    "value": "nested_value"
-                }
-            }
-        }
-
-        config_path = temp_dir / "config.json"
-        with open(config_path, 'w') as f:
-            json.dump(config_data, f)
-
-        config = Config(str(config_path))
+        config = Config(json_config["nested"])
 
         assert config.get("level1.level2.value") == "nested_value"
 
@@ -84,38 +165,6 @@ class TestConfig:
 
         assert config.get("test.nested.value") == "test_value"
 
-    def test_save_json_config(self, temp_dir):
-        """Test saving configuration to JSON."""
-        config = Config()
-        config.set("output_dir", "/new/output")
-        config.set("tools.new_tool.repo", "https://github.com/test/tool.git")
-
-        save_path = temp_dir / "saved_config.json"
-        config.save(str(save_path))
-
-        # Verify saved file
-        with open(save_path) as f:
-            saved_data = json.load(f)
-
-        assert saved_data["output_dir"] == "/new/output"
-        assert "new_tool" in saved_data["tools"]
-
-    def test_save_without_path_raises(self):
-        """Test saving without path raises error."""
-        config = Config()
-
-        with pytest.raises(ConfigError):
-            config.save()
-
-    def test_unsupported_format_raises(self, temp_dir):
-        """Test unsupported config format raises error."""
-        config_path = temp_dir / "config.txt"
-        config_path.touch()
-
-        with pytest.raises(ConfigError):
-            Config(str(config_path))
-
-
 class TestLoadConfig:
     """Tests for load_config function."""
 
@@ -124,27 +173,18 @@ class TestLoadConfig:
         config = load_config()
         assert isinstance(config, Config)
 
-    def test_load_config_with_path(self, temp_dir):
+    def test_load_config_with_path(self, json_config):
         """Test load_config with path."""
-        config_path = temp_dir / "config.json"
-        with open(config_path, 'w') as f:
-            json.dump({"output_dir": "/test"}, f)
-
-        config = load_config(str(config_path))
+        config = load_config(json_config["minimal"])
         assert config.output_dir == "/test"
 
 
 class TestConfigYAML:
     """Tests for YAML configuration support."""
 
+    @requires_yaml
     def test_load_yaml_config(self, temp_dir):
         """Test loading YAML configuration."""
-        # Check if pyyaml is available
-        try:
-            import yaml
-        except ImportError:
-            pytest.skip("PyYAML not installed")
-
         config_data = """
 output_dir: /yaml/output
 build_dir: /yaml/build
@@ -157,8 +197,7 @@ tools:
     requires: make
 """
         config_path = temp_dir / "config.yaml"
-        with open(config_path, 'w') as f:
-            f.write(config_data)
+        config_path.write_text(config_data)
 
         config = Config(str(config_path))
 
@@ -166,31 +205,22 @@ tools:
         assert config.build_dir == "/yaml/build"
         assert "yaml_tool" in config.tools
 
+    @requires_yaml
     def test_load_yml_extension(self, temp_dir):
         """Test loading .yml extension."""
-        try:
-            import yaml
-        except ImportError:
-            pytest.skip("PyYAML not installed")
-
         config_data = """
 output_dir: /yml/output
 """
         config_path = temp_dir / "config.yml"
-        with open(config_path, 'w') as f:
-            f.write(config_data)
+        config_path.write_text(config_data)
 
         config = Config(str(config_path))
 
         assert config.output_dir == "/yml/output"
 
+    @requires_yaml
     def test_save_yaml_config(self, temp_dir):
         """Test saving YAML configuration."""
-        try:
-            import yaml
-        except ImportError:
-            pytest.skip("PyYAML not installed")
-
         config = Config()
         config.set("output_dir", "/saved/yaml")
         config.set("tools.saved_tool.repo", "https://github.com/test/saved.git")
@@ -199,8 +229,7 @@ output_dir: /yml/output
         config.save(str(save_path))
 
         # Verify saved file
-        with open(save_path) as f:
-            saved_data = yaml.safe_load(f)
+        saved_data = yaml.load(save_path.read_text(), Loader=YAML_LOADER)
 
         assert saved_data["output_dir"] == "/saved/yaml"
         assert "saved_tool" in saved_data["tools"]
@@ -213,7 +242,6 @@ output_dir: /yml/output
         monkeypatch.setattr(config_module, "YAML_AVAILABLE", False)
 
         config_path = temp_dir / "config.yaml"
-        config_path.touch()
 
         try:
             with pytest.raises(ConfigError) as exc_info:
@@ -238,6 +266,11 @@ output_dir: /yml/output
         finally:
             monkeypatch.setattr(config_module, "YAML_AVAILABLE", original_yaml_available)
 
+    @requires_yaml
+    def test_c_loader_preferred(self):
+        """Test the libyaml loader is used when PyYAML provides it."""
+        assert YAML_LOADER is getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
     def test_save_unsupported_format(self, temp_dir):
         """Test saving with unsupported format."""
         config = Config()
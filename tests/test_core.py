@@ -3,11 +3,41 @@ Tests for the core module.
 """
 
 import pytest
+import subprocess
 from pathlib import Path
-from unittest.mock import MagicMock, patch, PropertyMock
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch, PropertyMock
 
+from winbins.builders.base import BuildResult
 from winbins.core import WinToolsUpdater
-from winbins.tools.registry import ToolRegistry
+from winbins.git_ops import GitResult
+from winbins.logging import LogLevel
+from winbins.tools.registry import ToolRegistry, get_registry
+
+
+@pytest.fixture
+def updater(temp_dir):
+    """Updater writing into the test's temporary directory."""
+    return WinToolsUpdater(temp_dir / "out", temp_dir / "build")
+
+
+@pytest.fixture(scope="class")
+def ro_updater(tmp_path_factory):
+    """Updater shared by every test in a class; only for tests that leave it unchanged."""
+    root = tmp_path_factory.mktemp("updater")
+    return WinToolsUpdater(root / "out", root / "build")
+
+
+@pytest.fixture
+def mock_updater_methods(monkeypatch):
+    """Replace the clone, dependency-check and build steps of update_tool."""
+    mocks = SimpleNamespace(
+        clone=MagicMock(), deps=MagicMock(return_value=True), build=MagicMock(return_value=True)
+    )
+    monkeypatch.setattr(WinToolsUpdater, "clone_or_update", mocks.clone)
+    monkeypatch.setattr(WinToolsUpdater, "check_dependencies", mocks.deps)
+    monkeypatch.setattr(WinToolsUpdater, "build_tool", mocks.build)
+    return mocks
 
 
 class TestWinToolsUpdater:
@@ -27,317 +57,391 @@ class TestWinToolsUpdater:
         """Test init with custom tool registry."""
         registry = ToolRegistry(tools=sample_tools)
         updater = WinToolsUpdater(
-            str(temp_dir / "output"),
-            str(temp_dir / "build"),
+            temp_dir / "output",
+            temp_dir / "build",
             registry=registry
         )
 
         assert updater.registry is registry
         assert "tool1" in updater.list_tools()
 
-    def test_list_tools(self, temp_dir):
+    def test_init_shares_default_registry(self, temp_dir, ro_updater, empty_registry):
+        """Test updaters without a registry reuse the default one, and empty ones are kept."""
+        updater = WinToolsUpdater(temp_dir / "out", temp_dir / "build")
+        assert updater.registry is get_registry()
+        assert ro_updater.registry is get_registry()
+
+        updater = WinToolsUpdater(temp_dir / "out", temp_dir / "build", registry=empty_registry)
+        assert updater.list_tools() == []
+
+    def test_list_tools(self, ro_updater):
         """Test listing available tools."""
-        updater = WinToolsUpdater(str(temp_dir / "out"), str(temp_dir / "build"))
-        tools = updater.list_tools()
+        tools = ro_updater.list_tools()
 
         assert isinstance(tools, list)
         assert "rubeus" in tools
 
-    def test_get_tool_info(self, temp_dir):
+    def test_get_tool_info(self, ro_updater):
         """Test getting tool information."""
-        updater = WinToolsUpdater(str(temp_dir / "out"), str(temp_dir / "build"))
-        info = updater.get_tool_info("rubeus")
+        info = ro_updater.get_tool_info("rubeus")
 
         assert info is not None
         assert "repo" in info
         assert "GhostPack/Rubeus" in info["repo"]
 
-    def test_get_tool_info_nonexistent(self, temp_dir):
+    def test_get_tool_info_nonexistent(self, ro_updater):
         """Test getting info for non-existent tool."""
-        updater = WinToolsUpdater(str(temp_dir / "out"), str(temp_dir / "build"))
-        info = updater.get_tool_info("nonexistent")
+        info = ro_updater.get_tool_info("nonexistent")
 
         assert info is None
 
-    @patch("shutil.which")
-    def test_check_dependencies_available(self, mock_which, temp_dir):
-        """Test dependency check when available."""
-        mock_which.return_value = "/usr/bin/msbuild"
-        updater = WinToolsUpdater(str(temp_dir / "out"), str(temp_dir / "build"))
-
-        result = updater.check_dependencies("test", {"requires": "msbuild"})
-
-        assert result is True
+    @pytest.mark.parametrize(
+        "which,tool_config,expected",
+        [
+            ("/usr/bin/msbuild", {"requires": "msbuild"}, True),
+            (None, {"requires": "msbuild"}, False),
+            (None, {}, True),
+        ],
+        ids=["available", "missing", "none_required"],
+    )
+    def test_check_dependencies(self, monkeypatch, updater, which, tool_config, expected):
+        """Test dependency check for present, missing and absent requirements."""
+        monkeypatch.setattr("shutil.which", lambda name: which)
+
+        assert updater.check_dependencies("test", tool_config) is expected
 
     @patch("shutil.which")
-    def test_check_dependencies_missing(self, mock_which, temp_dir):
-        """Test dependency check when missing."""
-        mock_which.return_value = None
-        updater = WinToolsUpdater(str(temp_dir / "out"), str(temp_dir / "build"))
-
-        result = updater.check_dependencies("test", {"requires": "msbuild"})
+    def test_check_dependencies_unregistered_requirement(self, mock_which, updater):
+        """Test requirements outside the registry are still looked up."""
+        mock_which.side_effect = lambda name: "/usr/bin/zig" if name == "zig" else None
 
-        assert result is False
+        assert updater.available_requirements == frozenset()
+        assert updater.check_dependencies("x", {"requires": "zig"}) is True
+        assert updater.check_dependencies("y", {"requires": "cargo"}) is False
 
-    def test_check_dependencies_none_required(self, temp_dir):
-        """Test dependency check when none required."""
-        updater = WinToolsUpdater(str(temp_dir / "out"), str(temp_dir / "build"))
+    @patch("shutil.which")
+    def test_check_dependencies_cached(self, mock_which, updater):
+        """Test PATH lookups are cached across tools."""
+        mock_which.return_value = "/usr/bin/dotnet"
 
-        result = updater.check_dependencies("test", {})
+        assert updater.check_dependencies("a", {"requires": "dotnet"}) is True
+        assert updater.check_dependencies("b", {"requires": "msbuild"}) is True
+        assert updater.check_dependencies("c", {"requires": "dotnet"}) is True
 
-        assert result is True
+        # One PATH scan per distinct requirement, all done up front
+        looked_up = [call[0][0] for call in mock_which.call_args_list]
+        assert sorted(looked_up) == sorted(set(looked_up))
+        assert "dotnet" in updater.available_requirements
 
-    @patch("subprocess.run")
-    def test_run_cmd_success(self, mock_run, temp_dir):
+    def test_run_cmd_success(self, fake_run, updater):
         """Test running command successfully."""
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout="Success",
-            stderr="",
-        )
-        updater = WinToolsUpdater(str(temp_dir / "out"), str(temp_dir / "build"))
+        fake_run.returns(stdout="Success")
 
         result = updater.run_cmd(["echo", "test"])
 
         assert result is True
 
-    @patch("subprocess.run")
-    def test_run_cmd_failure(self, mock_run, temp_dir):
-        """Test running command that fails."""
-        import subprocess
-        mock_run.side_effect = subprocess.CalledProcessError(1, ["false"])
-        updater = WinToolsUpdater(str(temp_dir / "out"), str(temp_dir / "build"))
-
-        result = updater.run_cmd(["false"])
-
-        assert result is False
-
-    @patch.object(WinToolsUpdater, "clone_or_update")
-    @patch.object(WinToolsUpdater, "check_dependencies")
-    @patch.object(WinToolsUpdater, "build_tool")
-    def test_update_tool_success(self, mock_build, mock_deps, mock_clone, temp_dir):
+    def test_update_tool_success(self, mock_updater_methods, temp_dir, updater):
         """Test successful tool update."""
-        mock_deps.return_value = True
-        mock_clone.return_value = temp_dir / "build" / "rubeus"
-        mock_build.return_value = True
+        mock_updater_methods.clone.return_value = temp_dir / "build" / "rubeus"
 
-        updater = WinToolsUpdater(str(temp_dir / "out"), str(temp_dir / "build"))
         result = updater.update_tool("rubeus")
 
         assert result is True
-        mock_deps.assert_called_once()
-        mock_clone.assert_called_once()
-        mock_build.assert_called_once()
+        mock_updater_methods.deps.assert_called_once()
+        mock_updater_methods.clone.assert_called_once()
+        mock_updater_methods.build.assert_called_once()
 
-    @patch.object(WinToolsUpdater, "check_dependencies")
-    def test_update_tool_missing_deps(self, mock_deps, temp_dir):
+    def test_update_tool_missing_deps(self, mock_updater_methods, updater):
         """Test tool update with missing dependencies."""
-        mock_deps.return_value = False
+        mock_updater_methods.deps.return_value = False
 
-        updater = WinToolsUpdater(str(temp_dir / "out"), str(temp_dir / "build"))
         result = updater.update_tool("rubeus")
 
         assert result is False
+        mock_updater_methods.clone.assert_not_called()
 
-    def test_update_tool_unknown(self, temp_dir):
+    def test_update_tool_unknown(self, updater):
         """Test updating unknown tool."""
-        updater = WinToolsUpdater(str(temp_dir / "out"), str(temp_dir / "build"))
         result = updater.update_tool("nonexistent_tool")
 
         assert result is False
 
+    @pytest.mark.parametrize(
+        "tools,outcomes,expected",
+        [
+            (None, None, None),
+            (["rubeus", "seatbelt"], None, {"rubeus": True, "seatbelt": True}),
+            (
+                ["tool1", "tool2", "tool3"],
+                [True, False, True],
+                {"tool1": True, "tool2": False, "tool3": True},
+            ),
+        ],
+        ids=["all_tools", "specific_tools", "partial_failure"],
+    )
+    def test_update_all_variants(self, monkeypatch, updater, tools, outcomes, expected):
+        """Test update_all returns each requested tool's result in order."""
+        update_tool = MagicMock(return_value=True, side_effect=outcomes)
+        monkeypatch.setattr(updater, "update_tool", update_tool)
+
+        results = updater.update_all(tools=tools)
+
+        if expected is None:
+            # No tools requested: every registered tool is updated
+            expected = dict.fromkeys(updater.list_tools(), True)
+        assert results == expected
+        assert list(results) == list(expected)
+        assert [c[0][0] for c in update_tool.call_args_list] == list(expected)
+
+    def test_update_all_parallel(self, capsys, updater):
+        """Test parallel update runs tools in worker processes."""
+        results = updater.update_all(tools=["unknown1", "unknown2", "unknown3"], jobs=2)
+
+        assert list(results) == ["unknown1", "unknown2", "unknown3"]
+        assert all(v is False for v in results.values())
+        output = capsys.readouterr().out
+        assert "Unknown tool: unknown1" in output
+        assert "Unknown tool: unknown3" in output
+
+    @patch.object(WinToolsUpdater, "_update_parallel")
     @patch.object(WinToolsUpdater, "update_tool")
-    def test_update_all(self, mock_update, temp_dir):
-        """Test updating all tools."""
+    def test_update_all_single_tool_runs_inline(self, mock_update, mock_parallel, updater):
+        """Test that a single tool skips the process pool."""
         mock_update.return_value = True
 
-        updater = WinToolsUpdater(str(temp_dir / "out"), str(temp_dir / "build"))
-        results = updater.update_all()
+        results = updater.update_all(tools=["rubeus"], jobs=4)
 
-        assert isinstance(results, dict)
-        assert all(v is True for v in results.values())
+        assert results == {"rubeus": True}
+        mock_parallel.assert_not_called()
 
-    @patch.object(WinToolsUpdater, "update_tool")
-    def test_update_all_specific_tools(self, mock_update, temp_dir):
-        """Test updating specific tools."""
-        mock_update.return_value = True
+    @patch.object(WinToolsUpdater, "build_tool")
+    @patch("winbins.git_ops.GitOperations.clone_or_update_async", new_callable=AsyncMock)
+    def test_update_all_fetch_jobs(self, mock_git, mock_build, updater):
+        """Test pipelined repository sync and builds."""
+        mock_git.side_effect = [GitResult(success=True), GitResult(success=False, error="x")]
+        mock_build.return_value = True
+
+        with patch.object(updater, "check_dependencies", return_value=True):
+            results = updater.update_all(
+                tools=["rubeus", "seatbelt", "unknown"], fetch_jobs=2
+            )
 
-        updater = WinToolsUpdater(str(temp_dir / "out"), str(temp_dir / "build"))
-        results = updater.update_all(tools=["rubeus", "seatbelt"])
+        assert results == {"rubeus": True, "seatbelt": False, "unknown": False}
+        assert mock_git.call_count == 2
+        mock_build.assert_called_once()
+        assert mock_build.call_args[0][0] == "rubeus"
 
-        assert len(results) == 2
-        assert "rubeus" in results
-        assert "seatbelt" in results
 
-    @patch.object(WinToolsUpdater, "update_tool")
-    def test_update_all_partial_failure(self, mock_update, temp_dir):
-        """Test update_all with partial failures."""
-        mock_update.side_effect = [True, False, True]
+    @patch.object(WinToolsUpdater, "build_if_changed")
+    @patch.object(WinToolsUpdater, "_restore_packages")
+    @patch("winbins.git_ops.GitOperations.clone_or_update_async", new_callable=AsyncMock)
+    def test_update_all_pipeline_restores_dotnet(self, mock_git, mock_restore, mock_build, updater):
+        """Test dotnet tools are restored in the sync stage before building."""
+        mock_git.return_value = GitResult(success=True)
+        mock_build.return_value = True
+
+        with patch.object(updater, "check_dependencies", return_value=True):
+            results = updater.update_all(tools=["sharphound", "rubeus"], fetch_jobs=2)
+
+        assert results == {"sharphound": True, "rubeus": True}
+        mock_restore.assert_called_once()
+        assert mock_restore.call_args[0][0] == "sharphound"
+        assert mock_build.call_count == 2
+
+class TestWinToolsUpdaterIncremental:
+    """Tests for skipping builds of unchanged tools."""
+
+    TOOL_CONFIG = {"requires": "dotnet", "build_cmd": ["dotnet", "build"], "output": "Tool.exe"}
+
+    @patch.object(WinToolsUpdater, "build_tool")
+    @patch("winbins.git_ops.GitOperations.get_latest_commit")
+    def test_records_and_skips_unchanged(self, mock_sha, mock_build, temp_dir, updater):
+        """Test a second build from the same commit is skipped."""
+        mock_sha.return_value = "abc123"
+
+        def build(*args):
+            (updater.output_dir / "Tool.exe").write_bytes(b"MZ")
+            return True
+
+        mock_build.side_effect = build
+        path = temp_dir / "build" / "tool"
+
+        assert updater.build_if_changed("tool", self.TOOL_CONFIG, path) is True
+        assert updater.build_if_changed("tool", self.TOOL_CONFIG, path) is True
+        assert mock_build.call_count == 1
+
+        mock_sha.return_value = "def456"
+        assert updater.build_if_changed("tool", self.TOOL_CONFIG, path) is True
+        assert mock_build.call_count == 2
+
+    @patch.object(WinToolsUpdater, "build_tool")
+    @patch("winbins.git_ops.GitOperations.get_latest_commit")
+    def test_force_rebuilds(self, mock_sha, mock_build, temp_dir):
+        """Test force rebuilds even when the commit is unchanged."""
+        mock_sha.return_value = "abc123"
+        mock_build.return_value = True
+        (temp_dir / "out").mkdir()
+        (temp_dir / "out" / "Tool.exe").write_bytes(b"MZ")
+
+        updater = WinToolsUpdater(temp_dir / "out", temp_dir / "build", force=True)
+        updater.state.record("tool", "abc123", updater.output_dir / "Tool.exe")
+
+        assert updater.build_if_changed("tool", self.TOOL_CONFIG, temp_dir / "tool") is True
+        mock_build.assert_called_once()
+
+    @patch.object(WinToolsUpdater, "build_tool")
+    @patch("winbins.git_ops.GitOperations.get_latest_commit")
+    def test_failed_build_not_recorded(self, mock_sha, mock_build, temp_dir, updater):
+        """Test failed builds leave no state behind."""
+        mock_sha.return_value = "abc123"
+        mock_build.return_value = False
+
+
+        assert updater.build_if_changed("tool", self.TOOL_CONFIG, temp_dir / "tool") is False
+        assert updater.state.get_sha("tool") is None
+
 
-        updater = WinToolsUpdater(str(temp_dir / "out"), str(temp_dir / "build"))
-        results = updater.update_all(tools=["tool1", "tool2", "tool3"])
+class _StubBuilder:
+    """Plain builder double: 'builds' a prepared artifact and copies it for real."""
 
-        assert results["tool1"] is True
-        assert results["tool2"] is False
-        assert results["tool3"] is True
+    def __init__(self, artifact: Path):
+        self.artifact = artifact
+
+    def is_available(self) -> bool:
+        return True
+
+    def build(self, source_path, build_cmd, output_path) -> BuildResult:
+        return BuildResult(success=True, output_path=self.artifact)
+
+    def copy_artifact(self, source: Path, dest: Path) -> bool:
+        dest.write_bytes(source.read_bytes())
+        return True
 
 
 class TestWinToolsUpdaterIntegration:
     """Integration tests for WinToolsUpdater."""
 
-    @patch("winbins.git_ops.GitOperations.clone_or_update")
-    @patch("winbins.builders.get_builder")
-    @patch("shutil.which")
-    def test_full_update_flow(self, mock_which, mock_get_builder, mock_git, temp_dir):
-        """Test full update flow with mocks."""
-        # Setup mocks
-        mock_which.return_value = "/usr/bin/msbuild"
-
-        from winbins.git_ops import GitResult
-        mock_git.return_value = GitResult(success=True)
+    def test_full_update_flow(self, temp_dir, updater):
+        """Test update_tool runs dependency check, sync, build, copy and state record."""
+        artifact = temp_dir / "Rubeus.exe"
+        artifact.write_bytes(b"MZ")
 
-        mock_builder = MagicMock()
-        mock_builder.is_available.return_value = True
-        from winbins.builders.base import BuildResult
-        mock_builder.build.return_value = BuildResult(
-            success=True,
-            output_path=temp_dir / "tool.exe"
-        )
-        mock_builder.copy_artifact.return_value = True
-        mock_get_builder.return_value = mock_builder
+        with patch.multiple(
+            "winbins.git_ops.GitOperations",
+            clone_or_update=MagicMock(return_value=GitResult(success=True)),
+            get_latest_commit=MagicMock(return_value="a" * 40),
+        ), patch.multiple(
+            "winbins.core", get_builder=MagicMock(return_value=_StubBuilder(artifact))
+        ), patch("shutil.which", return_value="/usr/bin/msbuild"):
+            assert updater.update_tool("rubeus") is True
 
-        # Create fake output file
-        (temp_dir / "tool.exe").touch()
+        assert (updater.output_dir / "Rubeus.exe").read_bytes() == b"MZ"
+        assert updater.state.get_sha("rubeus") == "a" * 40
 
-        updater = WinToolsUpdater(str(temp_dir / "out"), str(temp_dir / "build"))
 
-        # This would normally run the full flow
-        # For now, just verify the updater is properly configured
-        assert updater.output_dir.exists()
-        assert updater.build_dir.exists()
+@pytest.fixture
+def builder_mocks(monkeypatch):
+    """Route core's get_builder to an available mock builder whose copies succeed."""
+    builder = MagicMock()
+    builder.is_available.return_value = True
+    builder.copy_artifact.return_value = True
+    get_builder = MagicMock(return_value=builder)
+    monkeypatch.setattr("winbins.core.get_builder", get_builder)
+    return SimpleNamespace(get_builder=get_builder, builder=builder)
 
 
 class TestWinToolsUpdaterBuildTool:
     """Tests for WinToolsUpdater.build_tool method."""
 
-    @patch("winbins.core.get_builder")
-    def test_build_tool_with_builder(self, mock_get_builder, temp_dir):
+    RUBEUS_CONFIG = {
+        "requires": "msbuild",
+        "build_cmd": ["msbuild", "Rubeus.sln"],
+        "output": "Rubeus.exe",
+    }
+
+    def test_build_tool_with_builder(self, builder_mocks, temp_dir, updater):
         """Test building tool with available builder."""
-        mock_builder = MagicMock()
-        mock_builder.is_available.return_value = True
-        from winbins.builders.base import BuildResult
         output_file = temp_dir / "build" / "rubeus" / "Rubeus.exe"
         output_file.parent.mkdir(parents=True, exist_ok=True)
         output_file.touch()
-        mock_builder.build.return_value = BuildResult(
+        builder_mocks.builder.build.return_value = BuildResult(
             success=True,
             output_path=output_file
         )
-        mock_builder.copy_artifact.return_value = True
-        mock_get_builder.return_value = mock_builder
 
-        updater = WinToolsUpdater(str(temp_dir / "out"), str(temp_dir / "build"))
+        result = updater.build_tool("rubeus", self.RUBEUS_CONFIG, temp_dir / "build" / "rubeus")
+
+        assert result is True
+        builder_mocks.builder.build.assert_called_once()
+
+    def test_build_tool_uses_nuget_cache(self, builder_mocks, temp_dir, updater):
+        """Test builders get the persistent NuGet cache and tool env vars."""
+        builder_mocks.get_builder.return_value = None
+
         tool_config = {
-            "requires": "msbuild",
-            "build_cmd": ["msbuild", "Rubeus.sln"],
-            "output": "Rubeus.exe",
+            "requires": "dotnet",
+            "build_cmd": ["true"],
+            "output": "missing.exe",
+            "env_vars": {"FOO": "bar"},
         }
 
-        result = updater.build_tool("rubeus", tool_config, temp_dir / "build" / "rubeus")
+        with patch.object(updater, "run_cmd", return_value=False):
+            updater.build_tool("tool", tool_config, temp_dir / "build" / "tool")
 
-        assert result is True
-        mock_builder.build.assert_called_once()
+        env_vars = builder_mocks.get_builder.call_args[1]["env_vars"]
+        assert env_vars["NUGET_PACKAGES"] == str(updater.build_dir / ".nuget-packages")
+        assert env_vars["DOTNET_CLI_TELEMETRY_OPTOUT"] == "1"
+        assert env_vars["FOO"] == "bar"
+        assert updater.nuget_cache.is_dir()
 
-    @patch("winbins.core.get_builder")
-    def test_build_tool_copy_failure(self, mock_get_builder, temp_dir):
+    def test_build_tool_copy_failure(self, builder_mocks, temp_dir, updater):
         """Test building tool when copy fails."""
-        mock_builder = MagicMock()
-        mock_builder.is_available.return_value = True
-        from winbins.builders.base import BuildResult
         output_file = temp_dir / "build" / "rubeus" / "Rubeus.exe"
-        mock_builder.build.return_value = BuildResult(
+        builder_mocks.builder.build.return_value = BuildResult(
             success=True,
             output_path=output_file
         )
-        mock_builder.copy_artifact.return_value = False
-        mock_get_builder.return_value = mock_builder
-
-        updater = WinToolsUpdater(str(temp_dir / "out"), str(temp_dir / "build"))
-        tool_config = {
-            "requires": "msbuild",
-            "build_cmd": ["msbuild", "Rubeus.sln"],
-            "output": "Rubeus.exe",
-        }
+        builder_mocks.builder.copy_artifact.return_value = False
 
-        result = updater.build_tool("rubeus", tool_config, temp_dir / "build" / "rubeus")
+        result = updater.build_tool("rubeus", self.RUBEUS_CONFIG, temp_dir / "build" / "rubeus")
 
         assert result is False
 
-    @patch("winbins.core.get_builder")
-    def test_build_tool_build_failure(self, mock_get_builder, temp_dir):
+    def test_build_tool_build_failure(self, builder_mocks, temp_dir, updater):
         """Test building tool when build fails."""
-        mock_builder = MagicMock()
-        mock_builder.is_available.return_value = True
-        from winbins.builders.base import BuildResult
-        mock_builder.build.return_value = BuildResult(
+        builder_mocks.builder.build.return_value = BuildResult(
             success=False,
             error_message="Build failed"
         )
-        mock_get_builder.return_value = mock_builder
-
-        updater = WinToolsUpdater(str(temp_dir / "out"), str(temp_dir / "build"))
-        tool_config = {
-            "requires": "msbuild",
-            "build_cmd": ["msbuild", "Rubeus.sln"],
-            "output": "Rubeus.exe",
-        }
 
-        result = updater.build_tool("rubeus", tool_config, temp_dir / "build" / "rubeus")
+        result = updater.build_tool("rubeus", self.RUBEUS_CONFIG, temp_dir / "build" / "rubeus")
 
         assert result is False
 
-    @patch("winbins.core.get_builder")
-    @patch("subprocess.run")
-    def test_build_tool_fallback(self, mock_run, mock_get_builder, temp_dir):
+    def test_build_tool_fallback(self, builder_mocks, fake_run, temp_dir, updater):
         """Test building tool with fallback when builder unavailable."""
-        mock_get_builder.return_value = None
-        mock_run.return_value = MagicMock(returncode=0)
+        builder_mocks.get_builder.return_value = None
 
         # Create tool directory and output file
         tool_path = temp_dir / "build" / "rubeus"
         tool_path.mkdir(parents=True)
         (tool_path / "Rubeus.exe").touch()
 
-        updater = WinToolsUpdater(str(temp_dir / "out"), str(temp_dir / "build"))
-        tool_config = {
-            "requires": "msbuild",
-            "build_cmd": ["msbuild", "Rubeus.sln"],
-            "output": "Rubeus.exe",
-        }
-
-        result = updater.build_tool("rubeus", tool_config, tool_path)
+        result = updater.build_tool("rubeus", self.RUBEUS_CONFIG, tool_path)
 
         assert result is True
 
-    @patch("winbins.core.get_builder")
-    @patch("subprocess.run")
-    def test_build_tool_fallback_output_missing(self, mock_run, mock_get_builder, temp_dir):
+    def test_build_tool_fallback_output_missing(self, builder_mocks, fake_run, temp_dir,
+                                                updater):
         """Test building tool with fallback when output missing."""
-        mock_get_builder.return_value = None
-        mock_run.return_value = MagicMock(returncode=0)
+        builder_mocks.get_builder.return_value = None
 
         tool_path = temp_dir / "build" / "rubeus"
         tool_path.mkdir(parents=True)
         # Don't create output file
 
-        updater = WinToolsUpdater(str(temp_dir / "out"), str(temp_dir / "build"))
-        tool_config = {
-            "requires": "msbuild",
-            "build_cmd": ["msbuild", "Rubeus.sln"],
-            "output": "Rubeus.exe",
-        }
-
-        result = updater.build_tool("rubeus", tool_config, tool_path)
+        result = updater.build_tool("rubeus", self.RUBEUS_CONFIG, tool_path)
 
         assert result is False
 
@@ -346,12 +450,10 @@ class TestWinToolsUpdaterCloneOrUpdate:
     """Tests for WinToolsUpdater.clone_or_update method."""
 
     @patch("winbins.git_ops.GitOperations.clone_or_update")
-    def test_clone_new_repo(self, mock_git, temp_dir):
+    def test_clone_new_repo(self, mock_git, updater):
         """Test cloning a new repository."""
-        from winbins.git_ops import GitResult
         mock_git.return_value = GitResult(success=True)
 
-        updater = WinToolsUpdater(str(temp_dir / "out"), str(temp_dir / "build"))
         result = updater.clone_or_update(
             "rubeus",
             "https://github.com/test/repo.git"
@@ -361,12 +463,10 @@ class TestWinToolsUpdaterCloneOrUpdate:
         assert result == updater.build_dir / "rubeus"
 
     @patch("winbins.git_ops.GitOperations.clone_or_update")
-    def test_clone_failure(self, mock_git, temp_dir):
+    def test_clone_failure(self, mock_git, updater):
         """Test clone failure."""
-        from winbins.git_ops import GitResult
         mock_git.return_value = GitResult(success=False, error="Clone failed")
 
-        updater = WinToolsUpdater(str(temp_dir / "out"), str(temp_dir / "build"))
         result = updater.clone_or_update(
             "rubeus",
             "https://github.com/test/repo.git"
@@ -375,15 +475,13 @@ class TestWinToolsUpdaterCloneOrUpdate:
         assert result is None
 
     @patch("winbins.git_ops.GitOperations.clone_or_update")
-    def test_update_existing_repo(self, mock_git, temp_dir):
+    def test_update_existing_repo(self, mock_git, temp_dir, updater):
         """Test updating an existing repository."""
-        from winbins.git_ops import GitResult
         mock_git.return_value = GitResult(success=True)
 
         # Create existing repo directory
         (temp_dir / "build" / "rubeus").mkdir(parents=True)
 
-        updater = WinToolsUpdater(str(temp_dir / "out"), str(temp_dir / "build"))
         result = updater.clone_or_update(
             "rubeus",
             "https://github.com/test/repo.git"
@@ -392,13 +490,41 @@ class TestWinToolsUpdaterCloneOrUpdate:
         assert result is not None
 
 
+    @patch("winbins.git_ops.GitOperations.clone_or_update")
+    def test_clone_reuses_same_repo_checkout(self, mock_git, updater):
+        """Test a second tool from the same repository references the first checkout."""
+        mock_git.return_value = GitResult(success=True)
+
+        updater.clone_or_update("sharpdpapi", "https://github.com/GhostPack/SharpDPAPI.git")
+        updater.clone_or_update("sharpchrome", "https://github.com/GhostPack/SharpDPAPI.git")
+        updater.clone_or_update("rubeus", "https://github.com/GhostPack/Rubeus.git")
+
+        references = [call[0][4] for call in mock_git.call_args_list]
+        assert references == [None, updater.build_dir / "sharpdpapi", None]
+
+    @patch("winbins.git_ops.GitOperations.sync_worktree")
+    def test_clone_uses_mirror_worktree(self, mock_sync, temp_dir):
+        """Test mirror mode checks tools out from a bare mirror."""
+        mock_sync.return_value = GitResult(success=True)
+
+        updater = WinToolsUpdater(temp_dir / "out", temp_dir / "build",
+                                  use_mirrors=True)
+        result = updater.clone_or_update("rubeus", "https://github.com/test/repo.git", "dev")
+
+        assert result == updater.build_dir / "rubeus"
+        mock_sync.assert_called_once_with(
+            "https://github.com/test/repo.git",
+            updater.build_dir / ".mirrors" / "rubeus.git",
+            updater.build_dir / "rubeus",
+            "dev",
+        )
+
 class TestWinToolsUpdaterListBuiltTools:
     """Tests for WinToolsUpdater.list_built_tools method."""
 
-    def test_list_built_tools_none(self, temp_dir):
+    def test_list_built_tools_none(self, ro_updater):
         """Test listing built tools when none are built."""
-        updater = WinToolsUpdater(str(temp_dir / "out"), str(temp_dir / "build"))
-        built = updater.list_built_tools()
+        built = ro_updater.list_built_tools()
 
         assert isinstance(built, list)
         assert len(built) == 0
@@ -411,7 +537,7 @@ class TestWinToolsUpdaterListBuiltTools:
         # Create fake built tool
         (output_dir / "Rubeus.exe").touch()
 
-        updater = WinToolsUpdater(str(output_dir), str(temp_dir / "build"))
+        updater = WinToolsUpdater(output_dir, temp_dir / "build")
         built = updater.list_built_tools()
 
         assert "rubeus" in built
@@ -420,17 +546,11 @@ class TestWinToolsUpdaterListBuiltTools:
 class TestWinToolsUpdaterVerbose:
     """Tests for verbose mode."""
 
-    @patch("subprocess.run")
-    def test_run_cmd_verbose(self, mock_run, temp_dir):
+    def test_run_cmd_verbose(self, fake_run, temp_dir):
         """Test running command in verbose mode."""
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout="Success",
-            stderr="",
-        )
         updater = WinToolsUpdater(
-            str(temp_dir / "out"),
-            str(temp_dir / "build"),
+            temp_dir / "out",
+            temp_dir / "build",
             verbose=True
         )
 
@@ -438,56 +558,47 @@ class TestWinToolsUpdaterVerbose:
 
         assert result is True
         # In verbose mode, capture_output should be False
-        mock_run.assert_called_once()
-        call_kwargs = mock_run.call_args[1]
-        assert call_kwargs["capture_output"] is False
-
-    @patch("subprocess.run")
-    def test_run_cmd_command_not_found(self, mock_run, temp_dir):
-        """Test running command that doesn't exist."""
-        mock_run.side_effect = FileNotFoundError()
-        updater = WinToolsUpdater(str(temp_dir / "out"), str(temp_dir / "build"))
-
-        result = updater.run_cmd(["nonexistent"])
-
-        assert result is False
-
-    @patch("subprocess.run")
-    def test_run_cmd_failure_with_stderr(self, mock_run, temp_dir):
-        """Test running command that fails with stderr output."""
-        import subprocess
-        error = subprocess.CalledProcessError(1, ["cmd"])
-        error.stderr = "Error message"
-        mock_run.side_effect = error
-
-        updater = WinToolsUpdater(
-            str(temp_dir / "out"),
-            str(temp_dir / "build"),
-            verbose=True
-        )
-
-        result = updater.run_cmd(["cmd"])
-
-        assert result is False
+        assert len(fake_run.calls) == 1
+        assert fake_run.calls[0][1]["capture_output"] is False
+
+    @pytest.mark.parametrize(
+        "error,verbose,logged",
+        [
+            (subprocess.CalledProcessError(1, ["cmd"]), False, "Command failed: cmd"),
+            (FileNotFoundError(), False, "Command not found: cmd"),
+            (subprocess.CalledProcessError(1, ["cmd"], stderr="Error message"), True,
+             "Error message"),
+        ],
+        ids=["failure", "not_found", "failure_with_stderr"],
+    )
+    def test_run_cmd_errors(self, fake_run, capsys, temp_dir, error, verbose, logged):
+        """Test failed and missing commands return False and log the reason."""
+        fake_run.queue.append(error)
+        updater = WinToolsUpdater(temp_dir / "out", temp_dir / "build", verbose=verbose)
+
+        assert updater.run_cmd(["cmd"]) is False
+        assert logged in capsys.readouterr().out
 
 
 class TestWinToolsUpdaterLog:
     """Tests for logging functionality."""
 
-    def test_log_with_different_levels(self, temp_dir):
-        """Test logging with different log levels."""
-        updater = WinToolsUpdater(str(temp_dir / "out"), str(temp_dir / "build"))
-
-        # These should not raise
-        updater.log("Debug message", "DEBUG")
-        updater.log("Info message", "INFO")
-        updater.log("Warning message", "WARNING")
-        updater.log("Error message", "ERROR")
-        updater.log("Success message", "SUCCESS")
-
-    def test_log_with_unknown_level(self, temp_dir):
-        """Test logging with unknown log level defaults to INFO."""
-        updater = WinToolsUpdater(str(temp_dir / "out"), str(temp_dir / "build"))
-
-        # Should not raise, defaults to INFO
-        updater.log("Unknown level message", "UNKNOWN")
+    @pytest.mark.parametrize(
+        "level,expected",
+        [
+            ("DEBUG", LogLevel.DEBUG),
+            ("INFO", LogLevel.INFO),
+            ("WARNING", LogLevel.WARNING),
+            ("ERROR", LogLevel.ERROR),
+            ("SUCCESS", LogLevel.SUCCESS),
+            ("UNKNOWN", LogLevel.INFO),
+        ],
+    )
+    def test_log_levels(self, monkeypatch, ro_updater, level, expected):
+        """Test string levels map to LogLevel, with unknown levels defaulting to INFO."""
+        calls = []
+        monkeypatch.setattr(ro_updater.logger, "log", lambda msg, lvl: calls.append((msg, lvl)))
+
+        ro_updater.log(f"{level} message", level)
+
+        assert calls == [(f"{level} message", expected)]
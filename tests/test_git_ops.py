@@ -2,11 +2,40 @@
 Tests for the git_ops module.
 """
 
+import asyncio
+import io
 import pytest
+import shlex
+import subprocess
+from dataclasses import FrozenInstanceError
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
 
-from winbins.git_ops import GitOperations, GitResult, clone_or_update
+from winbins.git_ops import (
+    GitOperations,
+    GitResult,
+    _GitWorkerPool,
+    _resolve_git,
+    clone_or_update,
+    clone_or_update_many,
+)
+
+
+def _git_commands(fake_run):
+    """Every git command run so far, with `sh -c` chains split into their steps."""
+    commands = []
+    for cmd in fake_run.commands:
+        if cmd[:2] == ["sh", "-c"]:
+            commands.extend(shlex.split(part) for part in cmd[2].split(" && "))
+        else:
+            commands.append(cmd)
+    return commands
+
+
+def _has_flags(cmd, *flags):
+    """Return True if every flag appears in the command list."""
+    return frozenset(flags) <= frozenset(cmd)
 
 
 class TestGitResult:
@@ -26,218 +55,165 @@ class TestGitResult:
         assert result.error == "Failed"
         assert result.return_code == 128
 
+    def test_result_is_frozen(self):
+        """Test results cannot be modified after creation."""
+        result = GitResult(success=True)
+
+        with pytest.raises(FrozenInstanceError):
+            result.success = False
+
 
 class TestGitOperations:
     """Tests for GitOperations class."""
 
-    @patch("subprocess.run")
-    def test_is_git_available_true(self, mock_run):
+    def test_is_git_available_true(self, fake_run):
         """Test git availability when installed."""
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout="git version 2.40.0",
-            stderr="",
-        )
+        fake_run.returns(stdout="git version 2.40.0")
         git = GitOperations()
         assert git.is_git_available() is True
 
-    @patch("subprocess.run")
-    def test_is_git_available_false(self, mock_run):
+    def test_is_git_available_false(self, fake_run):
         """Test git availability when not installed."""
-        mock_run.side_effect = FileNotFoundError()
+        fake_run.queue.append(FileNotFoundError())
         git = GitOperations()
         assert git.is_git_available() is False
 
-    @patch("subprocess.run")
-    def test_clone_basic(self, mock_run):
-        """Test basic clone operation."""
-        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+    def test_resolve_git_looks_up_path_once(self, monkeypatch):
+        """Test the git executable is found on PATH once and then reused."""
+        lookups = []
+
+        def which(name):
+            lookups.append(name)
+            return "/opt/git/bin/git"
+
+        monkeypatch.setattr("shutil.which", which)
+        _resolve_git.cache_clear()
+        try:
+            assert _resolve_git() == "/opt/git/bin/git"
+            assert _resolve_git() == "/opt/git/bin/git"
+        finally:
+            _resolve_git.cache_clear()
+
+        assert lookups == ["git"]
+
+    def test_runs_resolved_git(self, fake_run, monkeypatch):
+        """Test commands run the resolved git executable."""
+        monkeypatch.setattr("winbins.git_ops._resolve_git", lambda: "/opt/git/bin/git")
+
+        GitOperations().fetch(Path("/tmp/repo"))
+
+        assert fake_run.last[0] == "/opt/git/bin/git"
+
+    @pytest.mark.parametrize(
+        "kwargs,flags",
+        [
+            ({}, ["git", "clone"]),
+            ({"branch": "develop"}, ["-b", "develop"]),
+            ({"depth": 1}, ["--depth", "1"]),
+            ({"recursive": True}, ["--recursive"]),
+        ],
+        ids=["basic", "branch", "depth", "recursive"],
+    )
+    def test_clone_variants(self, fake_run, kwargs, flags):
+        """Test clone passes the URL and the flags for each option."""
         git = GitOperations()
 
-        result = git.clone(
-            "https://github.com/test/repo.git",
-            Path("/tmp/repo")
-        )
+        result = git.clone("https://github.com/test/repo.git", Path("/tmp/repo"), **kwargs)
 
         assert result.success is True
-        mock_run.assert_called_once()
-        call_args = mock_run.call_args[0][0]
-        assert "git" in call_args
-        assert "clone" in call_args
-        assert "https://github.com/test/repo.git" in call_args
-
-    @patch("subprocess.run")
-    def test_clone_with_branch(self, mock_run):
-        """Test clone with specific branch."""
-        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
-        git = GitOperations()
-
-        result = git.clone(
-            "https://github.com/test/repo.git",
-            Path("/tmp/repo"),
-            branch="develop"
-        )
-
-        call_args = mock_run.call_args[0][0]
-        assert "-b" in call_args
-        assert "develop" in call_args
+        assert len(fake_run.calls) == 1
+        assert _has_flags(fake_run.last, "https://github.com/test/repo.git", *flags)
 
-    @patch("subprocess.run")
-    def test_clone_with_depth(self, mock_run):
-        """Test shallow clone."""
-        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
-        git = GitOperations()
-
-        result = git.clone(
-            "https://github.com/test/repo.git",
-            Path("/tmp/repo"),
-            depth=1
-        )
-
-        call_args = mock_run.call_args[0][0]
-        assert "--depth" in call_args
-        assert "1" in call_args
-
-    @patch("subprocess.run")
-    def test_clone_recursive(self, mock_run):
-        """Test recursive clone."""
-        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
-        git = GitOperations()
-
-        result = git.clone(
-            "https://github.com/test/repo.git",
-            Path("/tmp/repo"),
-            recursive=True
-        )
-
-        call_args = mock_run.call_args[0][0]
-        assert "--recursive" in call_args
-
-    @patch("subprocess.run")
-    def test_fetch(self, mock_run):
+    def test_fetch(self, fake_run):
         """Test fetch operation."""
-        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
         git = GitOperations()
 
         result = git.fetch(Path("/tmp/repo"))
 
         assert result.success is True
-        call_args = mock_run.call_args[0][0]
-        assert "fetch" in call_args
+        assert "fetch" in fake_run.last
 
-    @patch("subprocess.run")
-    def test_fetch_all(self, mock_run):
+    def test_fetch_all(self, fake_run):
         """Test fetch all remotes."""
-        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
         git = GitOperations()
 
         result = git.fetch(Path("/tmp/repo"), all_remotes=True)
 
-        call_args = mock_run.call_args[0][0]
-        assert "--all" in call_args
+        assert "--all" in fake_run.last
 
-    @patch("subprocess.run")
-    def test_reset_hard(self, mock_run):
+    def test_reset_hard(self, fake_run):
         """Test hard reset operation."""
-        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
         git = GitOperations()
 
         result = git.reset(Path("/tmp/repo"), "origin/main", hard=True)
 
         assert result.success is True
-        call_args = mock_run.call_args[0][0]
-        assert "reset" in call_args
-        assert "--hard" in call_args
-        assert "origin/main" in call_args
+        call_args = fake_run.last
+        assert _has_flags(call_args, "reset", "--hard", "origin/main")
 
-    @patch("subprocess.run")
-    def test_clean(self, mock_run):
+    def test_clean(self, fake_run):
         """Test clean operation."""
-        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
         git = GitOperations()
 
         result = git.clean(Path("/tmp/repo"))
 
         assert result.success is True
-        call_args = mock_run.call_args[0][0]
-        assert "clean" in call_args
-        assert "-f" in call_args
-        assert "-d" in call_args
-        assert "-x" in call_args
-
-    @patch("subprocess.run")
-    def test_checkout(self, mock_run):
+        call_args = fake_run.last
+        assert _has_flags(call_args, "clean", "-f", "-d", "-x")
+
+    def test_checkout(self, fake_run):
         """Test checkout operation."""
-        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
         git = GitOperations()
 
         result = git.checkout(Path("/tmp/repo"), "develop")
 
         assert result.success is True
-        call_args = mock_run.call_args[0][0]
-        assert "checkout" in call_args
-        assert "develop" in call_args
+        call_args = fake_run.last
+        assert _has_flags(call_args, "checkout", "develop")
 
-    @patch("subprocess.run")
-    def test_pull(self, mock_run):
+    def test_pull(self, fake_run):
         """Test pull operation."""
-        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
         git = GitOperations()
 
         result = git.pull(Path("/tmp/repo"))
 
         assert result.success is True
-        call_args = mock_run.call_args[0][0]
-        assert "pull" in call_args
+        assert "pull" in fake_run.last
 
-    @patch("subprocess.run")
-    def test_get_current_branch(self, mock_run):
+    def test_get_current_branch(self, fake_run):
         """Test getting current branch."""
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout="main\n",
-            stderr="",
-        )
+        fake_run.returns(stdout="main\n")
         git = GitOperations()
 
         branch = git.get_current_branch(Path("/tmp/repo"))
 
         assert branch == "main"
 
-    @patch("subprocess.run")
-    def test_get_latest_commit(self, mock_run):
+    def test_get_latest_commit(self, fake_run):
         """Test getting latest commit hash."""
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout="abc123def456\n",
-            stderr="",
-        )
+        fake_run.returns(stdout="abc123def456\n")
         git = GitOperations()
 
         commit = git.get_latest_commit(Path("/tmp/repo"))
 
         assert commit == "abc123def456"
 
-    @patch("subprocess.run")
-    def test_is_repo_true(self, mock_run):
+    def test_is_repo_true(self, fake_run):
         """Test checking if path is a repo - true case."""
-        mock_run.return_value = MagicMock(returncode=0, stdout=".git", stderr="")
+        fake_run.returns(stdout=".git")
         git = GitOperations()
 
         assert git.is_repo(Path("/tmp/repo")) is True
 
-    @patch("subprocess.run")
-    def test_is_repo_false(self, mock_run):
+    def test_is_repo_false(self, fake_run):
         """Test checking if path is a repo - false case."""
-        mock_run.return_value = MagicMock(returncode=128, stdout="", stderr="")
+        fake_run.returns(returncode=128)
         git = GitOperations()
 
         assert git.is_repo(Path("/tmp/not_a_repo")) is False
 
-    @patch("subprocess.run")
-    def test_clone_or_update_new(self, mock_run, temp_dir):
+    def test_clone_or_update_new(self, fake_run, temp_dir):
         """Test clone_or_update when repo doesn't exist."""
-        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
         git = GitOperations()
 
         target = temp_dir / "new_repo"
@@ -248,18 +224,15 @@ class TestGitOperations:
 
         assert result.success is True
         # Should have called clone
-        call_args = mock_run.call_args[0][0]
-        assert "clone" in call_args
+        assert "clone" in fake_run.last
 
-    @patch("subprocess.run")
-    def test_clone_or_update_existing(self, mock_run, temp_dir):
+    def test_clone_or_update_existing(self, fake_run, temp_dir):
         """Test clone_or_update when repo exists."""
         # Create a fake repo directory
         repo_path = temp_dir / "existing_repo"
         repo_path.mkdir()
         (repo_path / ".git").mkdir()
 
-        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
         git = GitOperations()
 
         result = git.clone_or_update(
@@ -268,18 +241,94 @@ class TestGitOperations:
         )
 
         # Should have called fetch, reset, clean (not clone)
-        calls = [str(call) for call in mock_run.call_args_list]
-        assert any("fetch" in str(call) for call in calls)
+        assert [cmd[3] for cmd in _git_commands(fake_run)] == [
+            "rev-parse", "fetch", "reset", "clean"
+        ]
+
+    def test_clone_or_update_new_is_shallow(self, fake_run, temp_dir):
+        """Test first-time clones only transfer the tip commit."""
+        git = GitOperations()
+
+        git.clone_or_update("https://github.com/test/repo.git", temp_dir / "new_repo")
+
+        call_args = fake_run.last
+        assert _has_flags(call_args, "--depth=1", "--single-branch", "--filter=blob:none")
+        assert fake_run.calls[-1][1]["env"]["GIT_HTTP_LOW_SPEED_TIME"] == "30"
+
+    def test_clone_or_update_existing_shallow(self, fake_run, temp_dir):
+        """Test shallow update fetches the branch tip and resets to FETCH_HEAD."""
+        repo_path = temp_dir / "existing_repo"
+        (repo_path / ".git").mkdir(parents=True)
+
+        git = GitOperations()
+
+        git.clone_or_update("https://github.com/test/repo.git", repo_path, branch="dev")
+
+        commands = _git_commands(fake_run)
+        assert commands[1][-5:] == ["--depth=1", "--no-tags", "--prune", "origin", "dev"]
+        assert commands[2][-1] == "FETCH_HEAD"
+
+    def test_clone_or_update_existing_full_history(self, fake_run, temp_dir):
+        """Test full-history updates fetch only origin and keep tags."""
+        repo_path = temp_dir / "existing_repo"
+        (repo_path / ".git").mkdir(parents=True)
+
+        git = GitOperations()
+
+        git.clone_or_update("https://github.com/test/repo.git", repo_path, shallow=False)
+
+        fetch = _git_commands(fake_run)[1]
+        assert fetch[-2:] == ["--prune", "origin"]
+        assert "--all" not in fetch
+        assert "--no-tags" not in fetch
+
+    def test_clone_or_update_chains_update_steps(self, fake_run, monkeypatch, temp_dir):
+        """Test fetch, reset and clean run as one sh -c call that keeps the failing exit code."""
+        monkeypatch.setattr("winbins.git_ops.CHAIN_STEPS", True)
+        repo_path = temp_dir / "existing repo"
+        (repo_path / ".git").mkdir(parents=True)
+        fake_run.queue[:] = [
+            subprocess.CompletedProcess([], 0, stdout=".git", stderr=""),  # is_repo
+            subprocess.CompletedProcess([], 128, stdout="", stderr="Reset failed"),  # chain
+        ]
+        git = GitOperations()
+
+        result = git.clone_or_update("https://github.com/test/repo.git", repo_path)
+
+        assert len(fake_run.calls) == 2
+        assert fake_run.last[:2] == ["sh", "-c"]
+        assert [cmd[2] for cmd in _git_commands(fake_run)[1:]] == [str(repo_path)] * 3
+        assert result.success is False
+        assert result.return_code == 128
+        assert result.error == "Reset failed"
+
+    def test_clone_or_update_with_reference(self, fake_run, temp_dir):
+        """Test clones borrow objects from a reference checkout."""
+        git = GitOperations()
+
+        git.clone_or_update(
+            "https://github.com/test/repo.git", temp_dir / "repo", reference=temp_dir / "other"
+        )
+
+        call_args = fake_run.last
+        index = call_args.index("--reference-if-able")
+        assert call_args[index + 1] == str(temp_dir / "other")
+        assert "--dissociate" in call_args
+
+    def test_clone_or_update_full_history(self, fake_run, temp_dir):
+        """Test tools that opt out of shallow clones get full history."""
+        git = GitOperations()
+
+        git.clone_or_update("https://github.com/test/repo.git", temp_dir / "repo", shallow=False)
+
+        assert "--depth=1" not in fake_run.last
 
 
 class TestCloneOrUpdateFunction:
     """Tests for clone_or_update convenience function."""
 
-    @patch("subprocess.run")
-    def test_clone_or_update(self, mock_run, temp_dir):
+    def test_clone_or_update(self, fake_run, temp_dir):
         """Test convenience function."""
-        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
-
         target = temp_dir / "repo"
         result = clone_or_update(
             "https://github.com/test/repo.git",
@@ -292,55 +341,37 @@ class TestCloneOrUpdateFunction:
 class TestGitOperationsAdditional:
     """Additional tests for GitOperations."""
 
-    @patch("subprocess.run")
-    def test_get_commit_date(self, mock_run):
+    def test_get_commit_date(self, fake_run):
         """Test getting commit date."""
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout="2024-01-15 10:30:00 -0500\n",
-            stderr="",
-        )
+        fake_run.returns(stdout="2024-01-15 10:30:00 -0500\n")
         git = GitOperations()
 
         date = git.get_commit_date(Path("/tmp/repo"))
 
         assert date == "2024-01-15 10:30:00 -0500"
 
-    @patch("subprocess.run")
-    def test_get_commit_date_failure(self, mock_run):
+    def test_get_commit_date_failure(self, fake_run):
         """Test get_commit_date when it fails."""
-        mock_run.return_value = MagicMock(
-            returncode=128,
-            stdout="",
-            stderr="Not a git repository",
-        )
+        fake_run.returns(returncode=128, stderr="Not a git repository")
         git = GitOperations()
 
         date = git.get_commit_date(Path("/tmp/not_a_repo"))
 
         assert date is None
 
-    @patch("subprocess.run")
-    def test_get_commit_date_specific_commit(self, mock_run):
+    def test_get_commit_date_specific_commit(self, fake_run):
         """Test getting date for specific commit."""
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout="2024-01-10 08:00:00 -0500\n",
-            stderr="",
-        )
+        fake_run.returns(stdout="2024-01-10 08:00:00 -0500\n")
         git = GitOperations()
 
         date = git.get_commit_date(Path("/tmp/repo"), "abc123")
 
         assert date == "2024-01-10 08:00:00 -0500"
-        call_args = mock_run.call_args[0][0]
-        assert "abc123" in call_args
+        assert "abc123" in fake_run.last
 
-    @patch("subprocess.run")
-    def test_run_git_subprocess_error(self, mock_run):
+    def test_run_git_subprocess_error(self, fake_run):
         """Test _run_git handles subprocess errors."""
-        import subprocess
-        mock_run.side_effect = subprocess.SubprocessError("Subprocess failed")
+        fake_run.queue.append(subprocess.SubprocessError("Subprocess failed"))
         git = GitOperations()
 
         result = git._run_git(["status"])
@@ -349,50 +380,35 @@ class TestGitOperationsAdditional:
         assert "Subprocess failed" in result.error
         assert result.return_code == -1
 
-    @patch("subprocess.run")
-    def test_get_current_branch_failure(self, mock_run):
+    def test_get_current_branch_failure(self, fake_run):
         """Test get_current_branch when it fails."""
-        mock_run.return_value = MagicMock(
-            returncode=128,
-            stdout="",
-            stderr="Not a git repository",
-        )
+        fake_run.returns(returncode=128, stderr="Not a git repository")
         git = GitOperations()
 
         branch = git.get_current_branch(Path("/tmp/not_a_repo"))
 
         assert branch is None
 
-    @patch("subprocess.run")
-    def test_get_latest_commit_failure(self, mock_run):
+    def test_get_latest_commit_failure(self, fake_run):
         """Test get_latest_commit when it fails."""
-        mock_run.return_value = MagicMock(
-            returncode=128,
-            stdout="",
-            stderr="Not a git repository",
-        )
+        fake_run.returns(returncode=128, stderr="Not a git repository")
         git = GitOperations()
 
         commit = git.get_latest_commit(Path("/tmp/not_a_repo"))
 
         assert commit is None
 
-    @patch("subprocess.run")
-    def test_pull_with_branch(self, mock_run):
+    def test_pull_with_branch(self, fake_run):
         """Test pull with specific branch."""
-        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
         git = GitOperations()
 
         result = git.pull(Path("/tmp/repo"), branch="develop")
 
         assert result.success is True
-        call_args = mock_run.call_args[0][0]
-        assert "develop" in call_args
+        assert "develop" in fake_run.last
 
-    @patch("subprocess.run")
-    def test_clean_with_options(self, mock_run):
+    def test_clean_with_options(self, fake_run):
         """Test clean with different options."""
-        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
         git = GitOperations()
 
         # Test without force
@@ -404,25 +420,19 @@ class TestGitOperationsAdditional:
         )
 
         assert result.success is True
-        call_args = mock_run.call_args[0][0]
-        assert "-f" not in call_args
-        assert "-d" not in call_args
-        assert "-x" not in call_args
+        call_args = fake_run.last
+        assert frozenset(call_args).isdisjoint({"-f", "-d", "-x"})
 
-    @patch("subprocess.run")
-    def test_reset_soft(self, mock_run):
+    def test_reset_soft(self, fake_run):
         """Test soft reset."""
-        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
         git = GitOperations()
 
         result = git.reset(Path("/tmp/repo"), "HEAD~1", hard=False)
 
         assert result.success is True
-        call_args = mock_run.call_args[0][0]
-        assert "--hard" not in call_args
+        assert "--hard" not in fake_run.last
 
-    @patch("subprocess.run")
-    def test_clone_or_update_fetch_failure(self, mock_run, temp_dir):
+    def test_clone_or_update_fetch_failure(self, fake_run, temp_dir):
         """Test clone_or_update when fetch fails."""
         # Create existing repo directory
         repo_path = temp_dir / "existing_repo"
@@ -430,9 +440,9 @@ class TestGitOperationsAdditional:
         (repo_path / ".git").mkdir()
 
         # First call (is_repo) succeeds, second call (fetch) fails
-        mock_run.side_effect = [
-            MagicMock(returncode=0, stdout=".git", stderr=""),  # is_repo
-            MagicMock(returncode=128, stdout="", stderr="Fetch failed"),  # fetch
+        fake_run.queue[:] = [
+            subprocess.CompletedProcess([], 0, stdout=".git", stderr=""),  # is_repo
+            subprocess.CompletedProcess([], 128, stdout="", stderr="Fetch failed"),  # fetch
         ]
         git = GitOperations()
 
@@ -443,19 +453,19 @@ class TestGitOperationsAdditional:
 
         assert result.success is False
 
-    @patch("subprocess.run")
-    def test_clone_or_update_reset_failure(self, mock_run, temp_dir):
+    def test_clone_or_update_reset_failure(self, fake_run, monkeypatch, temp_dir):
         """Test clone_or_update when reset fails."""
         # Create existing repo directory
         repo_path = temp_dir / "existing_repo"
         repo_path.mkdir()
         (repo_path / ".git").mkdir()
 
-        # First call (is_repo) succeeds, second call (fetch) succeeds, third (reset) fails
-        mock_run.side_effect = [
-            MagicMock(returncode=0, stdout=".git", stderr=""),  # is_repo
-            MagicMock(returncode=0, stdout="", stderr=""),  # fetch
-            MagicMock(returncode=128, stdout="", stderr="Reset failed"),  # reset
+        # First call (is_repo) succeeds, second (fetch) succeeds, third (reset) fails
+        monkeypatch.setattr("winbins.git_ops.CHAIN_STEPS", False)
+        fake_run.queue[:] = [
+            subprocess.CompletedProcess([], 0, stdout=".git", stderr=""),  # is_repo
+            subprocess.CompletedProcess([], 0, stdout="", stderr=""),  # fetch
+            subprocess.CompletedProcess([], 128, stdout="", stderr="Reset failed"),  # reset
         ]
         git = GitOperations()
 
@@ -465,3 +475,282 @@ class TestGitOperationsAdditional:
         )
 
         assert result.success is False
+
+
+class _FakeCatFile:
+    """Stand-in for a `git cat-file --batch` process serving a fixed set of objects."""
+
+    def __init__(self, objects):
+        self.objects = objects
+        self.stdin = self
+        self.stdout = io.BytesIO()
+        self.closed = False
+
+    def write(self, data):
+        rev = data.decode().strip()
+        if rev in self.objects:
+            sha, kind, body = self.objects[rev]
+            reply = f"{sha} {kind} {len(body)}\n".encode() + body + b"\n"
+        else:
+            reply = f"{rev} missing\n".encode()
+        pos = self.stdout.tell()
+        self.stdout.write(reply)
+        self.stdout.seek(pos)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def poll(self):
+        return 0 if self.closed else None
+
+    def wait(self):
+        return 0
+
+
+COMMIT = (
+    b"tree 4b825dc642cb6eb9a060e54bf8d69288fbee4904\n"
+    b"author A U Thor <a@example.com> 1700000000 +0000\n"
+    b"committer A U Thor <a@example.com> 1700000000 -0130\n"
+    b"\n"
+    b"Initial commit\n"
+)
+
+
+class TestGitOperationsPersistent:
+    """Tests for commit lookups served by a persistent cat-file process."""
+
+    @pytest.fixture
+    def popen(self, monkeypatch):
+        processes = []
+
+        def _popen(cmd, **kwargs):
+            proc = _FakeCatFile({"HEAD": ("abc123", "commit", COMMIT)})
+            proc.cmd = cmd
+            processes.append(proc)
+            return proc
+
+        monkeypatch.setattr("subprocess.Popen", _popen)
+        return processes
+
+    def test_lookups_share_one_process(self, fake_run, popen):
+        """Test repeated lookups reuse the repository's session and skip one-shot git."""
+        with GitOperations(persistent=True) as git:
+            assert git.get_latest_commit(Path("/repo")) == "abc123"
+            assert git.get_latest_commit(Path("/repo")) == "abc123"
+            assert git.get_commit_date(Path("/repo")) == "2023-11-14 20:43:20 -0130"
+
+        assert len(popen) == 1
+        assert popen[0].cmd == ["git", "-C", "/repo", "cat-file", "--batch"]
+        assert popen[0].closed
+        assert fake_run.calls == []
+
+    def test_missing_revision_falls_back(self, fake_run, popen):
+        """Test an unknown revision is retried as a one-shot git command."""
+        fake_run.returns(returncode=128, stderr="bad revision")
+        git = GitOperations(persistent=True)
+
+        assert git.get_commit_date(Path("/repo"), "nonexistent") is None
+        assert fake_run.last[-1] == "nonexistent"
+
+    def test_popen_failure_falls_back(self, fake_run, monkeypatch):
+        """Test lookups still work when the session cannot be started."""
+        def _missing(*args, **kwargs):
+            raise FileNotFoundError("git")
+
+        monkeypatch.setattr("subprocess.Popen", _missing)
+        fake_run.returns(stdout="def456\n")
+        git = GitOperations(persistent=True)
+
+        assert git.get_latest_commit(Path("/repo")) == "def456"
+        assert fake_run.last[-2:] == ["rev-parse", "HEAD"]
+
+    def test_pool_keeps_limited_idle_sessions(self, popen):
+        """Test concurrent borrowers get separate sessions and extras are stopped."""
+        pool = _GitWorkerPool("git", {}, max_procs_per_repo=2)
+        sessions = [pool.acquire(Path("/repo")) for _ in range(3)]
+        for session in sessions:
+            pool.release(Path("/repo"), session)
+
+        assert len(popen) == 3
+        assert [proc.closed for proc in popen] == [False, False, True]
+        assert pool.acquire(Path("/repo")) is sessions[1]
+
+        pool.release(Path("/repo"), sessions[1])
+        pool.close()
+        assert popen[0].closed and popen[1].closed
+
+    def test_pool_stops_idle_sessions(self, popen, monkeypatch):
+        """Test sessions idle past the timeout are stopped on the next acquire."""
+        clock = [100.0]
+        monkeypatch.setattr("time.monotonic", lambda: clock[0])
+        pool = _GitWorkerPool("git", {}, idle_timeout=30.0)
+        pool.release(Path("/old"), pool.acquire(Path("/old")))
+
+        clock[0] += 31
+        pool.acquire(Path("/new"))
+
+        assert popen[0].closed
+        assert pool.acquire(Path("/old")) is not None
+        assert len(popen) == 3
+
+    def test_dead_session_falls_back(self, fake_run, popen):
+        """Test a session whose process exited is dropped for a one-shot command."""
+        fake_run.returns(stdout="def456\n")
+        git = GitOperations(persistent=True)
+        git.get_latest_commit(Path("/repo"))
+        popen[0].objects = {}
+        popen[0].write = lambda data: None
+
+        assert git.get_latest_commit(Path("/repo")) == "def456"
+        assert popen[0].closed
+        assert len(fake_run.calls) == 1
+
+    def test_not_persistent_by_default(self, fake_run, popen):
+        """Test the default instance never starts a session."""
+        fake_run.returns(stdout="def456\n")
+
+        assert GitOperations().get_latest_commit(Path("/repo")) == "def456"
+        assert popen == []
+
+
+class TestGitOperationsWorktree:
+    """Tests for mirror-backed worktree checkouts."""
+
+    def test_sync_worktree_new(self, fake_run, temp_dir):
+        """Test first sync creates the mirror and adds a worktree."""
+        fake_run.returns(stdout="main\n")
+        git = GitOperations()
+        mirror = temp_dir / "mirrors" / "tool.git"
+        target = temp_dir / "tool"
+
+        result = git.sync_worktree("https://github.com/test/repo.git", mirror, target)
+
+        assert result.success is True
+        commands = _git_commands(fake_run)
+        assert commands[0][1:4] == ["clone", "--mirror", "--filter=blob:none"]
+        assert "symbolic-ref" in commands[1]
+        assert commands[-1][-5:] == ["worktree", "add", "--detach", str(target), "main"]
+
+    def test_sync_worktree_existing(self, fake_run, temp_dir):
+        """Test resync updates the mirror and resets the worktree to the branch."""
+        git = GitOperations()
+        mirror = temp_dir / "tool.git"
+        mirror.mkdir()
+        target = temp_dir / "tool"
+        target.mkdir()
+        (target / ".git").write_text("gitdir: elsewhere\n")
+
+        result = git.sync_worktree("https://github.com/test/repo.git", mirror, target, "dev")
+
+        assert result.success is True
+        commands = _git_commands(fake_run)
+        assert commands[1][-3:] == ["remote", "update", "--prune"]
+        assert commands[2][-2:] == ["--hard", "dev"]
+        assert "clean" in commands[3]
+
+    def test_sync_worktree_refuses_regular_clone(self, fake_run, temp_dir):
+        """Test an existing regular clone is not reused as a worktree."""
+        target = temp_dir / "tool"
+        (target / ".git").mkdir(parents=True)
+        git = GitOperations()
+
+        result = git.sync_worktree("https://github.com/test/repo.git", temp_dir / "m", target)
+
+        assert result.success is False
+        assert "not a mirror worktree" in result.error
+        assert fake_run.calls == []
+
+
+class TestGitOperationsAsync:
+    """Tests for the asyncio-based git helpers."""
+
+    @staticmethod
+    def _fake_process(returncode=0, stdout=b"", stderr=b""):
+        return SimpleNamespace(
+            returncode=returncode, communicate=AsyncMock(return_value=(stdout, stderr))
+        )
+
+    @patch("asyncio.create_subprocess_exec", new_callable=AsyncMock)
+    def test_run_git_async_success(self, mock_exec):
+        """Test async git command decodes output."""
+        mock_exec.return_value = self._fake_process(stdout=b"ok\n")
+        git = GitOperations()
+
+        result = asyncio.run(git._run_git_async(["status"]))
+
+        assert result.success is True
+        assert result.output == "ok\n"
+        assert mock_exec.call_args[0][:2] == ("git", "status")
+
+    @patch("asyncio.create_subprocess_exec", new_callable=AsyncMock)
+    def test_run_git_async_not_found(self, mock_exec):
+        """Test async git command when git is missing."""
+        mock_exec.side_effect = FileNotFoundError()
+        git = GitOperations()
+
+        result = asyncio.run(git._run_git_async(["status"]))
+
+        assert result.success is False
+        assert "not found" in result.error
+
+    @patch("asyncio.create_subprocess_exec", new_callable=AsyncMock)
+    def test_clone_or_update_async_new(self, mock_exec, temp_dir):
+        """Test async clone_or_update clones a missing repository."""
+        mock_exec.return_value = self._fake_process()
+        git = GitOperations()
+
+        result = asyncio.run(
+            git.clone_or_update_async("https://github.com/test/repo.git", temp_dir / "repo")
+        )
+
+        assert result.success is True
+        assert mock_exec.call_count == 1
+        assert "clone" in mock_exec.call_args[0]
+
+    @patch("asyncio.create_subprocess_exec", new_callable=AsyncMock)
+    def test_clone_or_update_async_fetch_failure(self, mock_exec, temp_dir):
+        """Test async clone_or_update stops when fetch fails."""
+        repo_path = temp_dir / "existing_repo"
+        (repo_path / ".git").mkdir(parents=True)
+
+        mock_exec.side_effect = [
+            self._fake_process(stdout=b".git"),  # is_repo
+            self._fake_process(returncode=128, stderr=b"Fetch failed"),  # fetch
+        ]
+        git = GitOperations()
+
+        result = asyncio.run(
+            git.clone_or_update_async("https://github.com/test/repo.git", repo_path)
+        )
+
+        assert result.success is False
+        assert result.error == "Fetch failed"
+        assert mock_exec.call_count == 2
+
+    @pytest.mark.parametrize("concurrency", [1, 3])
+    def test_clone_or_update_many_parallel(self, monkeypatch, temp_dir, concurrency):
+        """Test repositories are cloned concurrently, up to the concurrency limit."""
+        running = []
+        peak = []
+
+        async def communicate():
+            running.append(None)
+            peak.append(len(running))
+            await asyncio.sleep(0)
+            running.pop()
+            return b"", b""
+
+        async def fake_exec(*cmd, **kwargs):
+            return SimpleNamespace(returncode=0, communicate=communicate)
+
+        monkeypatch.setattr("asyncio.create_subprocess_exec", fake_exec)
+        repos = [(f"https://github.com/test/repo{i}.git", temp_dir / f"repo{i}") for i in range(5)]
+
+        results = clone_or_update_many(repos, concurrency=concurrency)
+
+        assert [result.success for result in results] == [True] * 5
+        assert len(peak) == 5
+        assert max(peak) == concurrency
@@ -2,11 +2,14 @@
 Tests for the logging module.
 """
 
+import os
 import pytest
 from io import StringIO
 from unittest.mock import patch
 
 from winbins.logging import (
+    _BatchedFileHandler,
+    _write_all,
     WinBinsLogger,
     LogLevel,
     get_logger,
@@ -103,6 +106,68 @@ class TestWinBinsLogger:
         assert "[SUCCESS]" in output
         assert "[DEBUG]" in output
 
+    @pytest.mark.parametrize(
+        "use_colors,expected",
+        [(False, "[WARNING] Careful\n"), (True, "\033[33m[WARNING]\033[0m Careful\n")],
+        ids=["plain", "colored"],
+    )
+    def test_log_writes_whole_line(self, use_colors, expected):
+        """Test each message reaches stdout as a single write."""
+        logger = WinBinsLogger(use_colors=False)
+        logger.use_colors = use_colors
+
+        with patch("sys.stdout") as mock_stdout:
+            logger.warning("Careful")
+
+        mock_stdout.write.assert_called_once_with(expected)
+
+    @patch("sys.stdout", new_callable=StringIO)
+    def test_buffered_defers_output(self, mock_stdout):
+        """Test buffered output is written only when the block exits."""
+        logger = WinBinsLogger(use_colors=False)
+
+        with logger.buffered():
+            logger.info("First")
+            logger.info("Second")
+            assert mock_stdout.getvalue() == ""
+
+        output = mock_stdout.getvalue()
+        assert output.index("First") < output.index("Second")
+        assert logger._buffer is None
+
+    @patch("sys.stdout", new_callable=StringIO)
+    def test_buffered_verbose_prints_immediately(self, mock_stdout):
+        """Test verbose loggers bypass buffering."""
+        logger = WinBinsLogger(verbose=True, use_colors=False)
+
+        with logger.buffered():
+            logger.info("Live")
+            assert "Live" in mock_stdout.getvalue()
+
+    @patch("sys.stdout", new_callable=StringIO)
+    def test_buffered_nested_flushes_once(self, mock_stdout):
+        """Test nested buffered blocks defer to the outermost one."""
+        logger = WinBinsLogger(use_colors=False)
+
+        with logger.buffered():
+            with logger.buffered():
+                logger.info("Inner")
+            assert mock_stdout.getvalue() == ""
+
+        assert "Inner" in mock_stdout.getvalue()
+
+    @patch("sys.stdout", new_callable=StringIO)
+    def test_buffered_flushes_on_error(self, mock_stdout):
+        """Test buffered output is still written when the block raises."""
+        logger = WinBinsLogger(use_colors=False)
+
+        with pytest.raises(RuntimeError):
+            with logger.buffered():
+                logger.error("Before failure")
+                raise RuntimeError("boom")
+
+        assert "Before failure" in mock_stdout.getvalue()
+
     def test_file_logging(self, temp_dir):
         """Test logging to file."""
         log_file = temp_dir / "test.log"
@@ -113,6 +178,79 @@ class TestWinBinsLogger:
         # File handler should be set up
         assert logger._file_handler is not None
 
+    def test_file_logging_batches_records(self, temp_dir, monkeypatch):
+        """Test file records are held back and written together on flush."""
+        monkeypatch.setattr(_BatchedFileHandler, "FLUSH_INTERVAL", 60)
+        write_name = "writev" if hasattr(os, "writev") else "write"
+        write = getattr(os, write_name)
+        writes = []
+
+        def counting_write(fd, data):
+            writes.append(data)
+            return write(fd, data)
+
+        monkeypatch.setattr(os, write_name, counting_write)
+        log_file = temp_dir / "batched.log"
+        logger = WinBinsLogger(log_file=str(log_file), use_colors=False)
+
+        with patch("sys.stdout", new_callable=StringIO):
+            for i in range(3):
+                logger.info(f"Entry {i}")
+        assert log_file.read_text() == ""
+
+        logger._file_handler.close()
+        lines = log_file.read_text().splitlines()
+        assert [line.endswith(f"[INFO] Entry {i}") for i, line in enumerate(lines)] == [True] * 3
+        assert len(writes) == 1
+
+    def test_file_logging_flushes_errors(self, temp_dir, monkeypatch):
+        """Test an error is written out immediately with the records before it."""
+        monkeypatch.setattr(_BatchedFileHandler, "FLUSH_INTERVAL", 60)
+        log_file = temp_dir / "errors.log"
+        logger = WinBinsLogger(log_file=str(log_file), use_colors=False)
+
+        with patch("sys.stdout", new_callable=StringIO):
+            logger.info("Starting")
+            logger.error("Broken")
+
+        assert "[INFO] Starting" in log_file.read_text()
+        assert "[ERROR] Broken" in log_file.read_text()
+        logger._file_handler.close()
+
+    def test_file_logging_flushes_after_interval(self, temp_dir):
+        """Test pending records are written by the flush timer."""
+        log_file = temp_dir / "timed.log"
+        logger = WinBinsLogger(log_file=str(log_file), use_colors=False)
+
+        with patch("sys.stdout", new_callable=StringIO):
+            logger.info("Eventually")
+        logger._file_handler._timer.join(timeout=5)
+
+        assert "[INFO] Eventually" in log_file.read_text()
+        logger._file_handler.close()
+
+    def test_write_all_retries_short_writes(self, temp_dir, monkeypatch):
+        """Test a partial gather write is completed with the remaining bytes."""
+        write_name = "writev" if hasattr(os, "writev") else "write"
+        write, os_write = getattr(os, write_name), os.write
+        calls = []
+
+        def short_write(fd, data):
+            calls.append(data)
+            if len(calls) == 1:
+                return os_write(fd, b"ab")
+            return write(fd, data)
+
+        monkeypatch.setattr(os, write_name, short_write)
+        path = temp_dir / "short.log"
+        fd = os.open(str(path), os.O_WRONLY | os.O_CREAT)
+        try:
+            _write_all(fd, [b"abc\n", b"def\n"])
+        finally:
+            os.close(fd)
+
+        assert path.read_bytes() == b"abc\ndef\n"
+
 
 class TestLoggerFunctions:
     """Tests for logger utility functions."""
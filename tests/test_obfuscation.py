@@ -2,7 +2,9 @@
 Tests for the obfuscation module.
 """
 
+import hashlib
 import pytest
+from dataclasses import FrozenInstanceError
 from pathlib import Path
 from unittest.mock import MagicMock
 
@@ -61,6 +63,14 @@ class TestObfuscationConfig:
         assert config.name_prefix == "_obf_"
         assert ObfuscationType.STRING_ENCRYPTION in config.enabled_types
 
+    def test_config_is_frozen(self):
+        """Test enabled types are stored as a tuple and fields cannot be reassigned."""
+        config = ObfuscationConfig(enabled_types=[ObfuscationType.PACKING])
+
+        assert config.enabled_types == (ObfuscationType.PACKING,)
+        with pytest.raises(FrozenInstanceError):
+            config.min_name_length = 4
+
 
 class TestObfuscationResult:
     """Tests for ObfuscationResult dataclass."""
@@ -167,6 +177,42 @@ class TestNameGenerator:
         # All mapped names should be different
         assert len(set(mapping.values())) == 3
 
+    @pytest.mark.parametrize("seed", [None, 42])
+    def test_generate_mapping_bulk(self, seed):
+        """Test large mappings drawn in bulk keep the generate() guarantees."""
+        generator = NameGenerator(seed=seed, min_length=10, max_length=15,
+                                  prefix="_pre_", suffix="_suf")
+        original_names = [f"sym{i}" for i in range(500)]
+
+        mapping = generator.generate_mapping(original_names)
+
+        assert list(mapping) == original_names
+        assert len(set(mapping.values())) == 500
+        for name in mapping.values():
+            core = name[len("_pre_"):-len("_suf")]
+            assert name.startswith("_pre_") and name.endswith("_suf")
+            assert 10 <= len(core) <= 15
+            assert core[0].isalpha() and core.isalnum() and core.isascii()
+
+    def test_generate_mapping_bulk_deterministic(self):
+        """Test bulk mappings repeat for the same seed."""
+        original_names = [f"sym{i}" for i in range(100)]
+
+        mapping1 = NameGenerator(seed=42).generate_mapping(original_names)
+        mapping2 = NameGenerator(seed=42).generate_mapping(original_names)
+
+        assert mapping1 == mapping2
+
+    def test_generate_mapping_bulk_collisions(self, monkeypatch):
+        """Test names already handed out are replaced, not reused."""
+        generator = NameGenerator(seed=42, min_length=8, max_length=8)
+        monkeypatch.setattr(generator, "_random_chars", lambda table, count: "a" * count)
+
+        mapping = generator.generate_mapping([f"sym{i}" for i in range(40)])
+
+        assert mapping["sym0"] == "a" * 8
+        assert len(set(mapping.values())) == 40
+
     def test_reset(self):
         """Test resetting used names."""
         generator = NameGenerator(seed=42)
@@ -246,3 +292,24 @@ class TestBinaryObfuscator:
 
         assert len(hash_value) == 64  # SHA256 hex length
         assert hash_value.isalnum()
+
+    @pytest.mark.parametrize("file_digest", [True, False], ids=["file_digest", "read_loop"])
+    def test_compute_hash_matches_sha256(self, temp_dir, monkeypatch, file_digest):
+        """Test both hashing paths agree with hashlib across chunk boundaries."""
+        import winbins.obfuscation.base as base_module
+        if file_digest and not hasattr(hashlib, "file_digest"):
+            pytest.skip("hashlib.file_digest needs Python 3.11+")
+        if not file_digest:
+            monkeypatch.delattr(hashlib, "file_digest", raising=False)
+            monkeypatch.setattr(base_module, "HASH_CHUNK_SIZE", 7)
+
+        class ConcreteObfuscator(BinaryObfuscator):
+            @property
+            def name(self):
+                return "Test"
+
+        data = bytes(range(256)) * 3
+        test_file = temp_dir / "test.bin"
+        test_file.write_bytes(data)
+
+        assert ConcreteObfuscator().compute_hash(test_file) == hashlib.sha256(data).hexdigest()
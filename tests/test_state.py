@@ -0,0 +1,72 @@
+"""
+Tests for the state module.
+"""
+
+import json
+import pytest
+from pathlib import Path
+
+from winbins.state import BuildState, STATE_FILE
+
+pytestmark = pytest.mark.fakefs
+
+
+class TestBuildState:
+    """Tests for BuildState class."""
+
+    def test_load_missing(self, temp_dir):
+        """Test loading when no state file exists."""
+        state = BuildState(temp_dir)
+        assert state.load() == {}
+        assert state.get_sha("rubeus") is None
+
+    def test_load_corrupt(self, temp_dir):
+        """Test loading a corrupt state file."""
+        (temp_dir / STATE_FILE).write_text("{not json")
+        state = BuildState(temp_dir)
+        assert state.load() == {}
+
+    def test_record_and_is_current(self, temp_dir):
+        """Test recording a build marks it current."""
+        artifact = temp_dir / "Rubeus.exe"
+        artifact.write_bytes(b"MZ")
+        state = BuildState(temp_dir)
+
+        state.record("rubeus", "abc123", artifact)
+
+        assert state.is_current("rubeus", "abc123", artifact) is True
+        assert state.is_current("rubeus", "def456", artifact) is False
+        data = json.loads((temp_dir / STATE_FILE).read_text())
+        assert data["rubeus"]["sha"] == "abc123"
+        assert data["rubeus"]["artifact_mtime"] == artifact.stat().st_mtime
+        assert list(temp_dir.glob("*.tmp")) == []
+
+    def test_is_current_missing_artifact(self, temp_dir):
+        """Test a recorded build is stale once the artifact is removed."""
+        artifact = temp_dir / "Rubeus.exe"
+        artifact.write_bytes(b"MZ")
+        state = BuildState(temp_dir)
+        state.record("rubeus", "abc123", artifact)
+
+        artifact.unlink()
+
+        assert state.is_current("rubeus", "abc123", artifact) is False
+
+    def test_is_current_without_sha(self, temp_dir):
+        """Test an unknown commit is never current."""
+        state = BuildState(temp_dir)
+        assert state.is_current("rubeus", None, temp_dir / "Rubeus.exe") is False
+
+    def test_record_preserves_other_tools(self, temp_dir):
+        """Test recording one tool keeps entries written by others."""
+        first = temp_dir / "Rubeus.exe"
+        second = temp_dir / "Seatbelt.exe"
+        first.write_bytes(b"MZ")
+        second.write_bytes(b"MZ")
+
+        BuildState(temp_dir).record("rubeus", "aaa", first)
+        BuildState(temp_dir).record("seatbelt", "bbb", second)
+
+        state = BuildState(temp_dir)
+        assert state.get_sha("rubeus") == "aaa"
+        assert state.get_sha("seatbelt") == "bbb"
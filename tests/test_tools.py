@@ -40,6 +40,13 @@ class TestToolConfig:
         assert result["repo"] == sample_tool_config["repo"]
         assert result["build_system"] == "msbuild"
         assert result["category"] == "utility"
+        assert result["shallow_ok"] is True
+
+    def test_shallow_opt_out(self, sample_tool_config):
+        """Test tools can opt out of shallow clones."""
+        config = ToolConfig.from_dict("test_tool", {**sample_tool_config, "shallow_ok": False})
+        assert config.shallow_ok is False
+        assert config.to_dict()["shallow_ok"] is False
 
     def test_default_values(self):
         """Test default values in ToolConfig."""
@@ -91,6 +98,16 @@ class TestToolRegistry:
         assert "rubeus" in registry
         assert "mimikatz" in registry
 
+    def test_default_registries_share_parsed_tools(self):
+        """Test default registries reuse parsed configs but stay independent."""
+        first = ToolRegistry()
+        second = ToolRegistry()
+
+        assert first.get("rubeus") is second.get("rubeus")
+        first.unregister("rubeus")
+        assert "rubeus" in second
+        assert "rubeus" in ToolRegistry()
+
     def test_empty_registry(self):
         """Test creating empty registry."""
         registry = ToolRegistry(tools={})
@@ -251,8 +268,9 @@ class TestGlobalRegistry:
         assert registry is not None
         assert len(registry) > 0
 
-    def test_register_tool_global(self, sample_tool_config):
+    def test_register_tool_global(self, sample_tool_config, monkeypatch):
         """Test registering tool in global registry."""
+        monkeypatch.setattr("winbins.tools.registry._default_registry", None)
         register_tool("global_test_tool", sample_tool_config)
         registry = get_registry()
         assert "global_test_tool" in registry
@@ -269,6 +287,11 @@ class TestDefaultTools:
             assert "output" in config, f"{name} missing 'output'"
             assert "requires" in config, f"{name} missing 'requires'"
 
+    def test_tools_table_is_read_only(self):
+        """Test that the default tool table cannot be modified."""
+        with pytest.raises(TypeError):
+            TOOLS["new_tool"] = {}
+
     def test_all_repos_are_valid_urls(self):
         """Test that all repos are valid GitHub URLs."""
         for name, config in TOOLS.items():
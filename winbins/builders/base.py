@@ -6,10 +6,40 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional
+import os
 import shutil
 import subprocess
 
 
+def copy_file(source: Path, dest: Path) -> None:
+    """
+    Copy file contents and metadata, equivalent to shutil.copy2 for files.
+
+    Uses os.copy_file_range where available so the kernel copies the data
+    (reflinking on btrfs/xfs), falling back to shutil.copyfile, which uses
+    sendfile on Linux.
+    """
+    if hasattr(os, "copy_file_range"):
+        try:
+            _copy_file_range(source, dest)
+        except OSError:
+            shutil.copyfile(source, dest)
+    else:
+        shutil.copyfile(source, dest)
+    shutil.copystat(source, dest)
+
+
+def _copy_file_range(source: Path, dest: Path) -> None:
+    """Copy file data with os.copy_file_range."""
+    with open(source, "rb") as src, open(dest, "wb") as dst:
+        remaining = os.fstat(src.fileno()).st_size
+        while remaining > 0:
+            copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+            if copied == 0:
+                break
+            remaining -= copied
+
+
 @dataclass
 class BuildResult:
     """Result of a build operation."""
@@ -105,7 +135,7 @@ class Builder(ABC):
         """Copy build artifact to destination."""
         try:
             dest.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(source, dest)
+            copy_file(source, dest)
             return True
         except (shutil.Error, OSError):
             return False
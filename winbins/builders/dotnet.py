@@ -6,6 +6,15 @@ from pathlib import Path
 from typing import Dict, List, Optional
 
 from winbins.builders.base import Builder, BuildResult
+from winbins.builders.msbuild import _switch_name, add_parallel_flags
+
+
+# Keep the dotnet CLI quiet and non-interactive on every invocation
+DOTNET_ENV = {
+    "DOTNET_CLI_TELEMETRY_OPTOUT": "1",
+    "DOTNET_NOLOGO": "1",
+    "DOTNET_SKIP_FIRST_TIME_EXPERIENCE": "1",
+}
 
 
 class DotNetBuilder(Builder):
@@ -46,7 +55,8 @@ class DotNetBuilder(Builder):
                 error_message=f"{self.executable} not found in PATH"
             )
 
-        # Execute build command
+        # Execute build command with project-level parallelism
+        build_cmd = self._with_parallel_flags(build_cmd)
         result = self.run_command(build_cmd, cwd=source_path, capture=not self.verbose)
 
         if result.failed:
@@ -67,6 +77,15 @@ class DotNetBuilder(Builder):
         result.artifacts = [full_output_path]
         return result
 
+    def _with_parallel_flags(self, build_cmd: List[str]) -> List[str]:
+        """Add parallel-build switches to dotnet msbuild/build/publish commands."""
+        if build_cmd[1:2] == ["msbuild"]:
+            return add_parallel_flags(build_cmd, quiet=not self.verbose)
+        if build_cmd[1:2] in (["build"], ["publish"]):
+            if not {_switch_name(arg) for arg in build_cmd} & {"m", "maxcpucount"}:
+                return build_cmd + ["-maxcpucount"]
+        return build_cmd
+
     def get_default_build_cmd(self, project_file: Optional[str] = None,
                                publish: bool = False) -> List[str]:
         """Generate default build/publish command."""
@@ -22,6 +22,12 @@ class BuilderFactory:
         BuildSystem.DOTNET: DotNetBuilder,
     }
 
+    # Lower-cased 'requires' values mapped to the build system that serves them
+    _requirements: Dict[str, BuildSystem] = {
+        "msbuild": BuildSystem.MSBUILD,
+        "dotnet": BuildSystem.DOTNET,
+    }
+
     @classmethod
     def register(cls, build_system: BuildSystem, builder_class: Type[Builder]) -> None:
         """Register a custom builder class for a build system."""
@@ -62,12 +68,7 @@ class BuilderFactory:
         Returns:
             Builder instance or None if not supported
         """
-        mapping = {
-            "msbuild": BuildSystem.MSBUILD,
-            "dotnet": BuildSystem.DOTNET,
-        }
-
-        build_system = mapping.get(requires.lower())
+        build_system = cls._requirements.get(requires.lower())
         if build_system is None:
             return None
 
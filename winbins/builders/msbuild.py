@@ -2,12 +2,43 @@
 MSBuild builder implementation for WinBins.
 """
 
+import os
 from pathlib import Path
 from typing import Dict, List, Optional
 
 from winbins.builders.base import Builder, BuildResult
 
 
+def _switch_name(arg: str) -> str:
+    """Return the lowercase name of an MSBuild switch (e.g. "/m:4" -> "m")."""
+    if not arg.startswith(("/", "-")):
+        return ""
+    return arg.lstrip("/-").split(":", 1)[0].lower()
+
+
+def add_parallel_flags(cmd: List[str], quiet: bool = True) -> List[str]:
+    """
+    Append MSBuild parallel-build switches that are not already in cmd.
+
+    Adds /m (one node per CPU), /nodeReuse:true so later builds in the same
+    run reuse warm nodes, shared compilation, and minimal verbosity when quiet.
+    """
+    switches = {_switch_name(arg) for arg in cmd}
+    properties = " ".join(arg.lower() for arg in cmd if _switch_name(arg) in ("p", "property"))
+
+    extra = []
+    if not switches & {"m", "maxcpucount"}:
+        extra.append(f"/m:{os.cpu_count() or 1}")
+    if not switches & {"nr", "nodereuse"}:
+        extra.append("/nodeReuse:true")
+    if "usesharedcompilation" not in properties:
+        extra.append("/p:UseSharedCompilation=true")
+    if quiet and not switches & {"v", "verbosity"}:
+        extra.append("/verbosity:minimal")
+
+    return cmd + extra
+
+
 class MSBuildBuilder(Builder):
     """Builder for MSBuild-based projects (Visual Studio solutions)."""
 
@@ -44,7 +75,8 @@ class MSBuildBuilder(Builder):
                 error_message=f"{self.executable} not found in PATH"
             )
 
-        # Execute build command
+        # Execute build command with solution-level parallelism
+        build_cmd = add_parallel_flags(build_cmd, quiet=not self.verbose)
         result = self.run_command(build_cmd, cwd=source_path, capture=not self.verbose)
 
         if result.failed:
@@ -4,7 +4,7 @@ Command-line interface for WinBins.
 
 import argparse
 import sys
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from winbins import __version__
 from winbins.core import WinToolsUpdater
@@ -13,13 +13,10 @@ from winbins.tools.base import ToolCategory
 from winbins.config import load_config
 
 
-def create_parser() -> argparse.ArgumentParser:
-    """Create the argument parser."""
-    parser = argparse.ArgumentParser(
-        prog="winbins",
-        description="Automated Windows Pentesting Binary Compiler",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog=f"""
+# Built once at import; TOOLS is read-only, so neither changes between parsers
+_CATEGORY_CHOICES = tuple(c.value for c in ToolCategory)
+
+_EPILOG = f"""
 Available tools: {', '.join(TOOLS.keys())}
 
 Examples:
@@ -29,6 +26,12 @@ Examples:
   # Update specific tools
   %(prog)s -t rubeus certify sharphound
 
+  # Update four tools at a time
+  %(prog)s -j 4
+
+  # Rebuild everything, even tools whose source is unchanged
+  %(prog)s --force
+
   # Update with specific branch
   %(prog)s -t rubeus --branch dev
 
@@ -40,7 +43,16 @@ Examples:
 
   # Search for tools
   %(prog)s --search kerberos
-        """
+"""
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """Create the argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="winbins",
+        description="Automated Windows Pentesting Binary Compiler",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=_EPILOG,
     )
 
     parser.add_argument(
@@ -67,11 +79,37 @@ Examples:
         help="Specific tools to update (default: all)"
     )
 
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=1,
+        help="Number of tools to update in parallel (default: 1)"
+    )
+
+    parser.add_argument(
+        "--fetch-jobs",
+        type=int,
+        default=1,
+        help="Number of repositories to clone/update concurrently while building (default: 1)"
+    )
+
     parser.add_argument(
         "--branch",
         help="Git branch to use (default: default branch)"
     )
 
+    parser.add_argument(
+        "--mirror",
+        action="store_true",
+        help="Keep bare mirrors in the build directory and check tools out as git worktrees"
+    )
+
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild tools even if their source has not changed"
+    )
+
     parser.add_argument(
         "-v", "--verbose",
         action="store_true",
@@ -86,7 +124,7 @@ Examples:
 
     parser.add_argument(
         "--category",
-        choices=[c.value for c in ToolCategory],
+        choices=_CATEGORY_CHOICES,
         help="Filter tools by category (use with --list)"
     )
 
@@ -109,7 +147,7 @@ Examples:
     return parser
 
 
-def list_tools(registry: ToolRegistry, category: Optional[str] = None,
+def list_tools(registry: ToolRegistry, category: Optional[Union[str, ToolCategory]] = None,
                search: Optional[str] = None) -> int:
     """List available tools."""
     print("\nAvailable Tools:")
@@ -124,7 +162,7 @@ def list_tools(registry: ToolRegistry, category: Optional[str] = None,
         cat = ToolCategory(category)
         tool_names = registry.list_by_category(cat)
         if not tool_names:
-            print(f"No tools found in category '{category}'")
+            print(f"No tools found in category '{cat.value}'")
             return 1
     else:
         tool_names = registry.list_tools()
@@ -220,6 +258,8 @@ def run_update(args: argparse.Namespace) -> int:
         build_dir=build_dir,
         verbose=args.verbose,
         registry=registry,
+        force=args.force,
+        use_mirrors=args.mirror,
     )
 
     print("\n" + "=" * 60)
@@ -227,7 +267,9 @@ def run_update(args: argparse.Namespace) -> int:
     print("=" * 60)
 
     # Run updates
-    results = updater.update_all(args.branch, args.tools)
+    results = updater.update_all(
+        args.branch, args.tools, jobs=args.jobs, fetch_jobs=args.fetch_jobs
+    )
 
     # Summary
     print("\n" + "=" * 60)
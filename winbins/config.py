@@ -11,8 +11,20 @@ from typing import Any, Dict, List, Optional
 try:
     import yaml
     YAML_AVAILABLE = True
+    # Prefer the libyaml C bindings when PyYAML was built with them
+    YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
 except ImportError:
     YAML_AVAILABLE = False
+    YAML_LOADER = None
+    YAML_DUMPER = None
+
+# orjson is a faster drop-in for JSON configs; fall back to the stdlib
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 
 class ConfigError(Exception):
@@ -35,22 +47,30 @@ class Config:
 
     def load(self) -> None:
         """Load configuration from file."""
-        if not self.config_path or not self.config_path.exists():
+        if not self.config_path:
             return
 
+        # Reject unusable formats before touching the filesystem
         suffix = self.config_path.suffix.lower()
-
         if suffix in ('.yml', '.yaml'):
             if not YAML_AVAILABLE:
                 raise ConfigError("PyYAML not installed. Install with: pip install pyyaml")
-            with open(self.config_path) as f:
-                self._data = yaml.safe_load(f) or {}
-        elif suffix == '.json':
-            with open(self.config_path) as f:
-                self._data = json.load(f)
-        else:
+        elif suffix != '.json':
             raise ConfigError(f"Unsupported config format: {suffix}")
 
+        if not self.config_path.exists():
+            return
+
+        if suffix == '.json':
+            if ORJSON_AVAILABLE:
+                self._data = orjson.loads(self.config_path.read_bytes())
+            else:
+                with open(self.config_path) as f:
+                    self._data = json.load(f)
+        else:
+            with open(self.config_path) as f:
+                self._data = yaml.load(f, Loader=YAML_LOADER) or {}
+
     def save(self, path: Optional[str] = None) -> None:
         """Save configuration to file."""
         save_path = Path(path) if path else self.config_path
@@ -63,10 +83,13 @@ class Config:
             if not YAML_AVAILABLE:
                 raise ConfigError("PyYAML not installed. Install with: pip install pyyaml")
             with open(save_path, 'w') as f:
-                yaml.dump(self._data, f, default_flow_style=False)
+                yaml.dump(self._data, f, Dumper=YAML_DUMPER, default_flow_style=False)
         elif suffix == '.json':
-            with open(save_path, 'w') as f:
-                json.dump(self._data, f, indent=2)
+            if ORJSON_AVAILABLE:
+                save_path.write_bytes(orjson.dumps(self._data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(save_path, 'w') as f:
+                    json.dump(self._data, f, indent=2)
         else:
             raise ConfigError(f"Unsupported config format: {suffix}")
 
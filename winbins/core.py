@@ -3,14 +3,22 @@ Core WinToolsUpdater class for WinBins.
 Orchestrates tool updates and builds.
 """
 
+import asyncio
+import contextlib
+import io
+import os
 import shutil
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Union
 
 from winbins.logging import WinBinsLogger, LogLevel, get_logger
 from winbins.git_ops import GitOperations, GitResult
+from winbins.state import BuildState
 from winbins.builders import get_builder, BuildResult
-from winbins.tools.registry import ToolRegistry, TOOLS
+from winbins.builders.base import copy_file
+from winbins.builders.dotnet import DOTNET_ENV
+from winbins.tools.registry import ToolRegistry, TOOLS, get_registry
 from winbins.tools.base import ToolConfig
 
 
@@ -22,11 +30,13 @@ class WinToolsUpdater:
 
     def __init__(
         self,
-        output_dir: str = "./binaries",
-        build_dir: str = "./build",
+        output_dir: Union[str, os.PathLike] = "./binaries",
+        build_dir: Union[str, os.PathLike] = "./build",
         verbose: bool = False,
         logger: Optional[WinBinsLogger] = None,
         registry: Optional[ToolRegistry] = None,
+        force: bool = False,
+        use_mirrors: bool = False,
     ):
         """
         Initialize the updater.
@@ -36,21 +46,35 @@ class WinToolsUpdater:
             build_dir: Directory for source code
             verbose: Enable verbose output
             logger: Custom logger instance
-            registry: Custom tool registry
+            registry: Custom tool registry (defaults to the shared default registry)
+            force: Rebuild tools even if their source has not changed
+            use_mirrors: Keep bare mirrors under build_dir/.mirrors and check
+                tools out from them as git worktrees
         """
         self.output_dir = Path(output_dir)
         self.build_dir = Path(build_dir)
         self.verbose = verbose
+        self.force = force
+        self.use_mirrors = use_mirrors
 
         # Initialize components
         self.logger = logger or get_logger(verbose)
         self.git = GitOperations(verbose)
-        self.registry = registry or ToolRegistry()
+        self.registry = registry if registry is not None else get_registry()
+        self.state = BuildState(self.output_dir)
+        self._which_cache: Dict[str, Optional[str]] = {}
+        self._available_requirements: Optional[FrozenSet[str]] = None
+        self._clone_references: Dict[str, Path] = {}
 
         # Create directories
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.build_dir.mkdir(parents=True, exist_ok=True)
 
+        # Persistent NuGet cache so repeat restores hit disk instead of the network
+        self.nuget_cache = self.build_dir / ".nuget-packages"
+        self.nuget_cache.mkdir(parents=True, exist_ok=True)
+        self.build_env = {**DOTNET_ENV, "NUGET_PACKAGES": str(self.nuget_cache)}
+
     def log(self, msg: str, level: str = "INFO") -> None:
         """Log a message (for backwards compatibility)."""
         level_map = {
@@ -74,7 +98,8 @@ class WinToolsUpdater:
                 cwd=cwd,
                 capture_output=not self.verbose,
                 text=True,
-                check=True
+                check=True,
+                env={**os.environ, **self.build_env},
             )
             return True
         except subprocess.CalledProcessError as e:
@@ -92,14 +117,67 @@ class WinToolsUpdater:
         if not required:
             return True
 
-        if shutil.which(required) is None:
+        if required not in self.available_requirements and self._which(required) is None:
             self.log(f"Missing dependency for {tool_name}: {required}", "ERROR")
             return False
         return True
 
+    @property
+    def available_requirements(self) -> FrozenSet[str]:
+        """Build tools required by registered tools that are present on PATH."""
+        if self._available_requirements is None:
+            needed = {tool.requires for _, tool in self.registry.items() if tool.requires}
+            self._available_requirements = frozenset(
+                name for name in needed if self._which(name) is not None
+            )
+        return self._available_requirements
+
+    def _which(self, name: str) -> Optional[str]:
+        """Resolve an executable on PATH, caching the result for this updater."""
+        if name not in self._which_cache:
+            self._which_cache[name] = shutil.which(name)
+        return self._which_cache[name]
+
     def clone_or_update(self, tool_name: str, repo_url: str,
-                        branch: Optional[str] = None) -> Optional[Path]:
+                        branch: Optional[str] = None,
+                        shallow: bool = True) -> Optional[Path]:
         """Clone or update a tool's git repository."""
+        tool_path = self._log_sync(tool_name)
+
+        if self.use_mirrors:
+            result = self.git.sync_worktree(
+                repo_url, self._mirror_path(tool_name), tool_path, branch
+            )
+        else:
+            result = self.git.clone_or_update(
+                repo_url, tool_path, branch, shallow, self._clone_references.get(repo_url)
+            )
+
+        return self._finish_sync(tool_name, repo_url, tool_path, result)
+
+    async def clone_or_update_async(self, tool_name: str, repo_url: str,
+                                    branch: Optional[str] = None,
+                                    shallow: bool = True) -> Optional[Path]:
+        """Clone or update a tool's git repository without blocking the event loop."""
+        tool_path = self._log_sync(tool_name)
+
+        if self.use_mirrors:
+            result = await self.git.sync_worktree_async(
+                repo_url, self._mirror_path(tool_name), tool_path, branch
+            )
+        else:
+            result = await self.git.clone_or_update_async(
+                repo_url, tool_path, branch, shallow, self._clone_references.get(repo_url)
+            )
+
+        return self._finish_sync(tool_name, repo_url, tool_path, result)
+
+    def _mirror_path(self, tool_name: str) -> Path:
+        """Location of the bare mirror backing a tool's worktree."""
+        return self.build_dir / ".mirrors" / f"{tool_name}.git"
+
+    def _log_sync(self, tool_name: str) -> Path:
+        """Log whether a tool's repository will be cloned or updated."""
         tool_path = self.build_dir / tool_name
 
         if tool_path.exists():
@@ -107,12 +185,17 @@ class WinToolsUpdater:
         else:
             self.log(f"Cloning {tool_name}...")
 
-        result = self.git.clone_or_update(repo_url, tool_path, branch)
+        return tool_path
 
+    def _finish_sync(self, tool_name: str, repo_url: str, tool_path: Path,
+                     result: GitResult) -> Optional[Path]:
+        """Handle a git sync result, remembering the checkout for later clones."""
         if not result.success:
-            self.log(f"Git operation failed: {result.error}", "ERROR")
+            self.log(f"Git operation failed for {tool_name}: {result.error}", "ERROR")
             return None
 
+        # Tools built from the same repository can borrow this checkout's objects
+        self._clone_references.setdefault(repo_url, tool_path)
         return tool_path
 
     def build_tool(self, tool_name: str, tool_config: Dict[str, Any],
@@ -124,7 +207,7 @@ class WinToolsUpdater:
         builder = get_builder(
             tool_config.get("requires", "msbuild"),
             verbose=self.verbose,
-            env_vars=tool_config.get("env_vars", {})
+            env_vars={**self.build_env, **tool_config.get("env_vars", {})}
         )
 
         if builder and builder.is_available():
@@ -160,22 +243,28 @@ class WinToolsUpdater:
                 return False
 
             dest_path = self.output_dir / output_path.name
-            shutil.copy2(output_path, dest_path)
+            copy_file(output_path, dest_path)
             self.log(f"Built {tool_name} -> {dest_path}", "SUCCESS")
             return True
 
         return False
 
-    def update_tool(self, tool_name: str, branch: Optional[str] = None) -> bool:
-        """Update and build a single tool."""
+    def _get_tool_config(self, tool_name: str) -> Optional[Dict[str, Any]]:
+        """Look up a tool's configuration, logging an error if it is unknown."""
         # Try registry first, fall back to TOOLS dict for backwards compatibility
         tool = self.registry.get(tool_name)
         if tool:
-            tool_config = tool.to_dict()
-        elif tool_name in TOOLS:
-            tool_config = TOOLS[tool_name]
-        else:
-            self.log(f"Unknown tool: {tool_name}", "ERROR")
+            return tool.to_dict()
+        if tool_name in TOOLS:
+            return TOOLS[tool_name]
+
+        self.log(f"Unknown tool: {tool_name}", "ERROR")
+        return None
+
+    def update_tool(self, tool_name: str, branch: Optional[str] = None) -> bool:
+        """Update and build a single tool."""
+        tool_config = self._get_tool_config(tool_name)
+        if tool_config is None:
             return False
 
         # Check dependencies
@@ -183,29 +272,186 @@ class WinToolsUpdater:
             return False
 
         # Clone/update repository
-        tool_path = self.clone_or_update(tool_name, tool_config["repo"], branch)
+        tool_path = self.clone_or_update(
+            tool_name, tool_config["repo"], branch, tool_config.get("shallow_ok", True)
+        )
         if not tool_path:
             return False
 
         # Build
-        return self.build_tool(tool_name, tool_config, tool_path)
+        return self.build_if_changed(tool_name, tool_config, tool_path)
+
+    def build_if_changed(self, tool_name: str, tool_config: Dict[str, Any],
+                         tool_path: Path) -> bool:
+        """Build the tool unless its artifact was already built from the current commit."""
+        sha = self.git.get_latest_commit(tool_path)
+        artifact = self.output_dir / Path(tool_config["output"]).name
+
+        if not self.force and self.state.is_current(tool_name, sha, artifact):
+            self.log(f"{tool_name} is up to date ({sha[:12]}), skipping build", "SUCCESS")
+            return True
+
+        if not self.build_tool(tool_name, tool_config, tool_path):
+            return False
+
+        if sha and artifact.exists():
+            self.state.record(tool_name, sha, artifact)
+        return True
 
     def update_all(self, branch: Optional[str] = None,
-                   tools: Optional[List[str]] = None) -> Dict[str, bool]:
-        """Update specified tools or all tools."""
+                   tools: Optional[List[str]] = None,
+                   jobs: int = 1, fetch_jobs: int = 1) -> Dict[str, bool]:
+        """
+        Update specified tools or all tools.
+
+        Args:
+            branch: Git branch to use
+            tools: Tools to update (default: all registered tools)
+            jobs: Number of tools to process concurrently in worker processes
+            fetch_jobs: Number of repositories to clone/update concurrently while
+                earlier tools build (ignored when jobs > 1)
+
+        Returns:
+            Mapping of tool name to success status, in the order requested
+        """
         tools_to_update = tools if tools else self.registry.list_tools()
-        results = {}
 
-        for tool_name in tools_to_update:
-            self.log(f"\n{'='*60}")
-            self.log(f"Processing: {tool_name.upper()}")
-            self.log(f"{'='*60}")
+        if jobs > 1 and len(tools_to_update) > 1:
+            return self._update_parallel(tools_to_update, branch, jobs)
+
+        if fetch_jobs > 1 and len(tools_to_update) > 1:
+            return asyncio.run(self._update_pipelined(tools_to_update, branch, fetch_jobs))
 
-            success = self.update_tool(tool_name, branch)
+        results = {}
+        for tool_name in tools_to_update:
+            with self.logger.buffered():
+                self._log_header(tool_name)
+                success = self.update_tool(tool_name, branch)
             results[tool_name] = success
 
         return results
 
+    def _update_parallel(self, tools: List[str], branch: Optional[str],
+                         jobs: int) -> Dict[str, bool]:
+        """Update tools in a process pool, printing each tool's log as it completes."""
+        results: Dict[str, bool] = {}
+
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tools))) as executor:
+            futures = {
+                executor.submit(
+                    _update_tool_worker,
+                    tool_name,
+                    str(self.output_dir),
+                    str(self.build_dir),
+                    self.verbose,
+                    self.registry,
+                    branch,
+                    self.force,
+                    self.use_mirrors,
+                ): tool_name
+                for tool_name in tools
+            }
+
+            for future in as_completed(futures):
+                tool_name = futures[future]
+                self._log_header(tool_name)
+                try:
+                    success, output = future.result()
+                except Exception as e:
+                    self.log(f"Worker for {tool_name} failed: {e}", "ERROR")
+                    success = False
+                else:
+                    print(output, end="")
+                results[tool_name] = success
+
+        return {tool_name: results[tool_name] for tool_name in tools}
+
+    async def _update_pipelined(self, tools: List[str], branch: Optional[str],
+                                fetch_jobs: int) -> Dict[str, bool]:
+        """
+        Sync and build tools as a two-stage pipeline.
+
+        Up to fetch_jobs workers clone/update repositories and restore NuGet
+        packages while a build worker compiles each tool as soon as its source
+        is ready, so network-bound and CPU-bound work overlap. MSBuild already
+        uses every core via /m, so builds run one at a time.
+        """
+        loop = asyncio.get_running_loop()
+        sync_queue: "asyncio.Queue[str]" = asyncio.Queue()
+        build_queue: "asyncio.Queue[Optional[Tuple[str, Any]]]" = asyncio.Queue()
+        results: Dict[str, bool] = {}
+
+        for tool_name in tools:
+            sync_queue.put_nowait(tool_name)
+
+        async def sync_worker() -> None:
+            while not sync_queue.empty():
+                tool_name = sync_queue.get_nowait()
+                prepared = await self._prepare_tool_async(tool_name, branch)
+                await build_queue.put((tool_name, prepared))
+
+        async def build_worker() -> None:
+            while True:
+                item = await build_queue.get()
+                if item is None:
+                    return
+                tool_name, prepared = item
+                self._log_header(tool_name)
+                if prepared is None:
+                    results[tool_name] = False
+                    continue
+                tool_config, tool_path = prepared
+                results[tool_name] = await loop.run_in_executor(
+                    None, self.build_if_changed, tool_name, tool_config, tool_path
+                )
+
+        builder = asyncio.ensure_future(build_worker())
+        await asyncio.gather(*(sync_worker() for _ in range(min(fetch_jobs, len(tools)))))
+        await build_queue.put(None)
+        await builder
+
+        return {tool_name: results[tool_name] for tool_name in tools}
+
+    async def _prepare_tool_async(self, tool_name: str, branch: Optional[str]
+                                  ) -> Optional[Tuple[Dict[str, Any], Path]]:
+        """Resolve, sync and restore a tool, returning its config and source path."""
+        tool_config = self._get_tool_config(tool_name)
+        if tool_config is None or not self.check_dependencies(tool_name, tool_config):
+            return None
+
+        tool_path = await self.clone_or_update_async(
+            tool_name, tool_config["repo"], branch, tool_config.get("shallow_ok", True)
+        )
+        if tool_path is None:
+            return None
+
+        if tool_config.get("requires") == "dotnet":
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._restore_packages, tool_name, tool_config, tool_path
+            )
+        return tool_config, tool_path
+
+    def _restore_packages(self, tool_name: str, tool_config: Dict[str, Any],
+                          tool_path: Path) -> None:
+        """Restore NuGet packages ahead of the build; the build retries on failure."""
+        builder = get_builder(
+            "dotnet",
+            verbose=False,
+            env_vars={**self.build_env, **tool_config.get("env_vars", {})}
+        )
+        if builder is None or not builder.is_available():
+            return
+
+        result = builder.restore(tool_path)
+        if result.failed:
+            self.log(f"Pre-build restore failed for {tool_name}, build will retry", "DEBUG")
+
+    def _log_header(self, tool_name: str) -> None:
+        """Log the banner printed before processing a tool."""
+        self.log(f"\n{'='*60}")
+        self.log(f"Processing: {tool_name.upper()}")
+        self.log(f"{'='*60}")
+
     def get_tool_info(self, tool_name: str) -> Optional[Dict[str, Any]]:
         """Get information about a specific tool."""
         tool = self.registry.get(tool_name)
@@ -214,7 +460,7 @@ class WinToolsUpdater:
             # Add build status if we have the tool built
             output_path = self.output_dir / Path(tool.output).name
             info["built"] = output_path.exists()
-            if output_path.exists():
+            if info["built"]:
                 info["built_path"] = str(output_path)
             return info
         return None
@@ -233,3 +479,22 @@ class WinToolsUpdater:
                 if output_path.exists():
                     built.append(tool_name)
         return built
+
+
+def _update_tool_worker(tool_name: str, output_dir: str, build_dir: str, verbose: bool,
+                        registry: ToolRegistry, branch: Optional[str],
+                        force: bool = False, use_mirrors: bool = False) -> Tuple[bool, str]:
+    """
+    Update a single tool inside a worker process.
+
+    Console output is captured and returned so the parent can print each
+    tool's log in one piece instead of interleaving workers.
+    """
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        updater = WinToolsUpdater(
+            output_dir, build_dir, verbose=verbose, registry=registry, force=force,
+            use_mirrors=use_mirrors,
+        )
+        success = updater.update_tool(tool_name, branch)
+    return success, buffer.getvalue()
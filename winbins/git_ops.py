@@ -3,13 +3,35 @@ Git operations for WinBins.
 Handles cloning, updating, and managing tool repositories.
 """
 
+import asyncio
+import functools
+import os
+import shlex
+import shutil
 import subprocess
+import sys
+import threading
+import time
 from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
+# Abort transfers that stay below 1 KB/s for 30 seconds instead of hanging
+# on a stalled TLS connection.
+GIT_ENV = {
+    "GIT_HTTP_LOW_SPEED_LIMIT": "1000",
+    "GIT_HTTP_LOW_SPEED_TIME": "30",
+}
 
-@dataclass
+# Multi-step updates are joined into one `sh -c` call where a POSIX shell exists
+CHAIN_STEPS = os.name == "posix"
+
+# dataclass(slots=True) needs Python 3.10+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
 class GitResult:
     """Result of a git operation."""
     success: bool
@@ -18,21 +40,177 @@ class GitResult:
     return_code: int = 0
 
 
+@functools.lru_cache(maxsize=None)
+def _resolve_git() -> str:
+    """Return the git executable, looked up on PATH once per process."""
+    return shutil.which("git") or "git"
+
+
+class _GitSession:
+    """A long-running `git cat-file --batch` process answering object lookups for one repo."""
+
+    def __init__(self, git: str, repo_path: Path, env: Dict[str, str]):
+        self._proc = subprocess.Popen(
+            [git, "-C", str(repo_path), "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=env,
+        )
+
+    def read(self, rev: str) -> Optional[Tuple[str, str, bytes]]:
+        """Return (sha, type, contents) for rev, or None if it does not name an object."""
+        self._proc.stdin.write(rev.encode() + b"\n")
+        self._proc.stdin.flush()
+        header = self._proc.stdout.readline().split()
+        if not header:
+            raise OSError("git cat-file exited")
+        if len(header) != 3:
+            # "<rev> missing" or "<rev> ambiguous"
+            return None
+        sha, kind, size = header
+        contents = self._proc.stdout.read(int(size) + 1)[:-1]
+        return sha.decode(), kind.decode(), contents
+
+    def close(self) -> None:
+        """Stop the git process."""
+        if self._proc.poll() is None:
+            self._proc.stdin.close()
+            self._proc.wait()
+
+
+class _GitWorkerPool:
+    """
+    Idle _GitSession processes per repository, each lent to one caller at a time.
+
+    At most max_procs_per_repo idle sessions are kept per repository; sessions
+    idle for longer than idle_timeout seconds are stopped on the next acquire.
+    """
+
+    def __init__(self, git: str, env: Dict[str, str],
+                 max_procs_per_repo: int = 2, idle_timeout: float = 30.0):
+        self._git = git
+        self._env = env
+        self.max_procs_per_repo = max_procs_per_repo
+        self.idle_timeout = idle_timeout
+        self._idle: Dict[Path, List[Tuple[float, _GitSession]]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, repo_path: Path) -> _GitSession:
+        """Return an idle session for repo_path, starting one if none is free."""
+        with self._lock:
+            stale = self._take_stale(time.monotonic())
+            idle = self._idle.get(repo_path)
+            session = idle.pop()[1] if idle else None
+        for old in stale:
+            old.close()
+        return session or _GitSession(self._git, repo_path, self._env)
+
+    def release(self, repo_path: Path, session: _GitSession) -> None:
+        """Hand a healthy session back, or stop it if the repository has enough idle ones."""
+        with self._lock:
+            idle = self._idle.setdefault(repo_path, [])
+            if len(idle) < self.max_procs_per_repo:
+                idle.append((time.monotonic(), session))
+                return
+        session.close()
+
+    def close(self) -> None:
+        """Stop every idle session."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for sessions in idle.values():
+            for _, session in sessions:
+                session.close()
+
+    def _take_stale(self, now: float) -> List[_GitSession]:
+        """Remove and return sessions idle past the timeout; caller holds the lock."""
+        stale = []
+        for sessions in self._idle.values():
+            while sessions and now - sessions[0][0] > self.idle_timeout:
+                stale.append(sessions.pop(0)[1])
+        return stale
+
+
+def _committer_date(commit: bytes) -> Optional[str]:
+    """Format a raw commit's committer timestamp like `git show --format=%ci`."""
+    for line in commit.split(b"\n"):
+        if not line:
+            break
+        if line.startswith(b"committer "):
+            stamp, offset = line.rsplit(b" ", 2)[1:]
+            sign = -1 if offset.startswith(b"-") else 1
+            tz = timezone(sign * timedelta(hours=int(offset[1:3]), minutes=int(offset[3:5])))
+            date = datetime.fromtimestamp(int(stamp), tz)
+            return f"{date:%Y-%m-%d %H:%M:%S} {offset.decode()}"
+    return None
+
+
 class GitOperations:
     """Handles git operations for tool repositories."""
 
-    def __init__(self, verbose: bool = False):
+    def __init__(self, verbose: bool = False, persistent: bool = False):
+        """
+        Args:
+            verbose: Enable verbose output
+            persistent: Answer repeated commit lookups (get_latest_commit,
+                get_commit_date) from a pool of long-running git processes
+                per repository instead of spawning git for each call; call
+                close() or use the instance as a context manager to stop them
+        """
         self.verbose = verbose
+        self.persistent = persistent
+        self._env = {**os.environ, **GIT_ENV}
+        self._git = _resolve_git()
+        self._pool = _GitWorkerPool(self._git, self._env) if persistent else None
+
+    def __enter__(self) -> "GitOperations":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop any persistent git processes started by this instance."""
+        if self._pool is not None:
+            self._pool.close()
+
+    def _read_object(self, repo_path: Path, rev: str) -> Optional[Tuple[str, str, bytes]]:
+        """
+        Look rev up through a pooled persistent session for repo_path.
+
+        Returns None when persistence is off, the session cannot run, or rev
+        does not resolve; callers then fall back to a one-shot git command.
+        """
+        if self._pool is None:
+            return None
+
+        try:
+            session = self._pool.acquire(repo_path)
+        except OSError:
+            return None
+        try:
+            obj = session.read(rev)
+        except (OSError, ValueError):
+            # The process died; drop it and let the caller retry one-shot
+            session.close()
+            return None
+        self._pool.release(repo_path, session)
+        return obj
 
     def _run_git(self, args: List[str], cwd: Optional[Path] = None) -> GitResult:
         """Execute a git command and return result."""
-        cmd = ["git"] + args
+        return self._run([self._git] + args, cwd)
+
+    def _run(self, cmd: List[str], cwd: Optional[Path] = None) -> GitResult:
+        """Execute a command and return its result as a GitResult."""
         try:
             result = subprocess.run(
                 cmd,
                 cwd=cwd,
                 capture_output=True,
                 text=True,
+                env=self._env,
             )
             return GitResult(
                 success=result.returncode == 0,
@@ -53,6 +231,41 @@ class GitOperations:
                 return_code=-1,
             )
 
+    async def _run_git_async(self, args: List[str], cwd: Optional[Path] = None) -> GitResult:
+        """Execute a git command without blocking the event loop."""
+        return await self._run_async([self._git] + args, cwd)
+
+    async def _run_async(self, cmd: List[str], cwd: Optional[Path] = None) -> GitResult:
+        """Execute a command without blocking the event loop."""
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                cwd=cwd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=self._env,
+            )
+            stdout, stderr = await proc.communicate()
+        except FileNotFoundError:
+            return GitResult(
+                success=False,
+                error="git not found in PATH",
+                return_code=-1,
+            )
+        except OSError as e:
+            return GitResult(
+                success=False,
+                error=str(e),
+                return_code=-1,
+            )
+
+        return GitResult(
+            success=proc.returncode == 0,
+            output=stdout.decode(errors="replace"),
+            error=stderr.decode(errors="replace"),
+            return_code=proc.returncode if proc.returncode is not None else -1,
+        )
+
     def is_git_available(self) -> bool:
         """Check if git is available on the system."""
         result = self._run_git(["--version"])
@@ -61,7 +274,9 @@ class GitOperations:
     def clone(self, repo_url: str, target_path: Path,
               branch: Optional[str] = None,
               depth: Optional[int] = None,
-              recursive: bool = False) -> GitResult:
+              recursive: bool = False,
+              shallow: bool = False,
+              reference: Optional[Path] = None) -> GitResult:
         """
         Clone a git repository.
 
@@ -71,22 +286,41 @@ class GitOperations:
             branch: Specific branch to clone
             depth: Shallow clone depth (None for full clone)
             recursive: Clone submodules recursively
+            shallow: Clone only the tip of a single branch, fetching blobs on demand
+            reference: Existing checkout to borrow objects from during the clone
 
         Returns:
             GitResult with success status and output
         """
+        return self._run_git(
+            self._clone_args(repo_url, target_path, branch, depth, recursive, shallow, reference)
+        )
+
+    def _clone_args(self, repo_url: str, target_path: Path,
+                    branch: Optional[str] = None,
+                    depth: Optional[int] = None,
+                    recursive: bool = False,
+                    shallow: bool = False,
+                    reference: Optional[Path] = None) -> List[str]:
+        """Build arguments for git clone."""
         args = ["clone", repo_url, str(target_path)]
 
+        if reference:
+            # Reuse local objects, then copy them so the clone stands alone
+            args.extend(["--reference-if-able", str(reference), "--dissociate"])
+
         if branch:
             args.extend(["-b", branch])
 
-        if depth:
+        if shallow:
+            args.extend(["--depth=1", "--single-branch", "--filter=blob:none"])
+        elif depth:
             args.extend(["--depth", str(depth)])
 
         if recursive:
             args.append("--recursive")
 
-        return self._run_git(args)
+        return args
 
     def fetch(self, repo_path: Path, remote: str = "origin",
               all_remotes: bool = False) -> GitResult:
@@ -101,14 +335,32 @@ class GitOperations:
         Returns:
             GitResult with success status
         """
+        return self._run_git(self._fetch_args(repo_path, remote, all_remotes))
+
+    def _fetch_args(self, repo_path: Path, remote: str = "origin",
+                    all_remotes: bool = False,
+                    depth: Optional[int] = None,
+                    refspec: Optional[str] = None,
+                    tags: bool = True,
+                    prune: bool = False) -> List[str]:
+        """Build arguments for git fetch."""
         args = ["-C", str(repo_path), "fetch"]
 
+        if depth:
+            args.append(f"--depth={depth}")
+        if not tags:
+            args.append("--no-tags")
+        if prune:
+            args.append("--prune")
+
         if all_remotes:
             args.append("--all")
         else:
             args.append(remote)
+            if refspec:
+                args.append(refspec)
 
-        return self._run_git(args)
+        return args
 
     def reset(self, repo_path: Path, target: str = "origin/HEAD",
               hard: bool = True) -> GitResult:
@@ -123,13 +375,18 @@ class GitOperations:
         Returns:
             GitResult with success status
         """
+        return self._run_git(self._reset_args(repo_path, target, hard))
+
+    def _reset_args(self, repo_path: Path, target: str = "origin/HEAD",
+                    hard: bool = True) -> List[str]:
+        """Build arguments for git reset."""
         args = ["-C", str(repo_path), "reset"]
 
         if hard:
             args.append("--hard")
 
         args.append(target)
-        return self._run_git(args)
+        return args
 
     def clean(self, repo_path: Path, force: bool = True,
               directories: bool = True, ignored: bool = True) -> GitResult:
@@ -145,6 +402,11 @@ class GitOperations:
         Returns:
             GitResult with success status
         """
+        return self._run_git(self._clean_args(repo_path, force, directories, ignored))
+
+    def _clean_args(self, repo_path: Path, force: bool = True,
+                    directories: bool = True, ignored: bool = True) -> List[str]:
+        """Build arguments for git clean."""
         args = ["-C", str(repo_path), "clean"]
 
         if force:
@@ -154,7 +416,7 @@ class GitOperations:
         if ignored:
             args.append("-x")
 
-        return self._run_git(args)
+        return args
 
     def checkout(self, repo_path: Path, target: str) -> GitResult:
         """
@@ -199,6 +461,10 @@ class GitOperations:
 
     def get_latest_commit(self, repo_path: Path) -> Optional[str]:
         """Get the latest commit hash."""
+        obj = self._read_object(repo_path, "HEAD")
+        if obj:
+            return obj[0]
+
         result = self._run_git([
             "-C", str(repo_path),
             "rev-parse", "HEAD"
@@ -209,6 +475,12 @@ class GitOperations:
 
     def get_commit_date(self, repo_path: Path, commit: str = "HEAD") -> Optional[str]:
         """Get the date of a commit."""
+        obj = self._read_object(repo_path, commit)
+        if obj and obj[1] == "commit":
+            date = _committer_date(obj[2])
+            if date:
+                return date
+
         result = self._run_git([
             "-C", str(repo_path),
             "show", "-s", "--format=%ci", commit
@@ -219,11 +491,17 @@ class GitOperations:
 
     def is_repo(self, path: Path) -> bool:
         """Check if path is a git repository."""
-        result = self._run_git(["-C", str(path), "rev-parse", "--git-dir"])
+        result = self._run_git(self._is_repo_args(path))
         return result.success
 
+    def _is_repo_args(self, path: Path) -> List[str]:
+        """Build arguments for the repository check."""
+        return ["-C", str(path), "rev-parse", "--git-dir"]
+
     def clone_or_update(self, repo_url: str, target_path: Path,
-                        branch: Optional[str] = None) -> GitResult:
+                        branch: Optional[str] = None,
+                        shallow: bool = True,
+                        reference: Optional[Path] = None) -> GitResult:
         """
         Clone a repository if it doesn't exist, otherwise update it.
 
@@ -231,31 +509,237 @@ class GitOperations:
             repo_url: URL of the repository
             target_path: Local path for the repository
             branch: Optional branch to use
+            shallow: Only transfer the tip commit (disable for tools that need history/tags)
+            reference: Existing checkout of the same repository to borrow objects from
 
         Returns:
             GitResult with success status
         """
-        if target_path.exists() and self.is_repo(target_path):
+        is_repo = target_path.exists() and self.is_repo(target_path)
+
+        return self._run_steps(self._clone_or_update_steps(
+            repo_url, target_path, branch, is_repo, shallow, reference
+        ))
+
+    async def clone_or_update_async(self, repo_url: str, target_path: Path,
+                                    branch: Optional[str] = None,
+                                    shallow: bool = True,
+                                    reference: Optional[Path] = None) -> GitResult:
+        """
+        Clone or update a repository without blocking the event loop.
+
+        Runs the same git commands as clone_or_update, so several
+        repositories can be synced concurrently with asyncio.gather.
+        """
+        is_repo = False
+        if target_path.exists():
+            is_repo = (await self._run_git_async(self._is_repo_args(target_path))).success
+
+        return await self._run_steps_async(self._clone_or_update_steps(
+            repo_url, target_path, branch, is_repo, shallow, reference
+        ))
+
+    def _clone_or_update_steps(self, repo_url: str, target_path: Path,
+                               branch: Optional[str], is_repo: bool,
+                               shallow: bool = True,
+                               reference: Optional[Path] = None) -> List[List[str]]:
+        """Return the git commands needed to bring target_path up to date."""
+        if is_repo and shallow:
+            # Fetch only the tip of the wanted ref and check it out directly
+            return [
+                self._fetch_args(target_path, depth=1, refspec=branch or "HEAD",
+                                 tags=False, prune=True),
+                self._reset_args(target_path, "FETCH_HEAD", hard=True),
+                self._clean_args(target_path),
+            ]
+
+        if is_repo:
             # Update existing repository
-            result = self.fetch(target_path, all_remotes=True)
+            target = f"origin/{branch}" if branch else "origin/HEAD"
+            return [
+                self._fetch_args(target_path, prune=True),
+                self._reset_args(target_path, target, hard=True),
+                self._clean_args(target_path),
+            ]
+
+        # Clone new repository
+        return [
+            self._clone_args(repo_url, target_path, branch, shallow=shallow, reference=reference)
+        ]
+
+    def sync_worktree(self, repo_url: str, mirror_path: Path, target_path: Path,
+                      branch: Optional[str] = None) -> GitResult:
+        """
+        Update a bare mirror and check target_path out from it as a worktree.
+
+        The mirror keeps every ref locally, so switching branches or
+        recreating a deleted checkout only costs the incremental mirror update.
+
+        Args:
+            repo_url: URL of the repository
+            mirror_path: Location of the bare mirror
+            target_path: Location of the worktree to build from
+            branch: Optional branch to check out (default: the remote's HEAD)
+
+        Returns:
+            GitResult with success status
+        """
+        error = self._check_worktree_target(target_path)
+        if error:
+            return error
+
+        mirror_exists = mirror_path.exists() and self.is_repo(mirror_path)
+        result = self._run_steps(self._mirror_steps(repo_url, mirror_path, mirror_exists))
+        if not result.success:
+            return result
+
+        ref = branch or self._default_branch(
+            self._run_git(self._default_branch_args(mirror_path))
+        )
+        return self._run_steps(self._worktree_steps(mirror_path, target_path, ref))
+
+    async def sync_worktree_async(self, repo_url: str, mirror_path: Path, target_path: Path,
+                                  branch: Optional[str] = None) -> GitResult:
+        """Run sync_worktree without blocking the event loop."""
+        error = self._check_worktree_target(target_path)
+        if error:
+            return error
+
+        mirror_exists = False
+        if mirror_path.exists():
+            mirror_exists = (await self._run_git_async(self._is_repo_args(mirror_path))).success
+        steps = self._mirror_steps(repo_url, mirror_path, mirror_exists)
+        result = await self._run_steps_async(steps)
+        if not result.success:
+            return result
+
+        ref = branch or self._default_branch(
+            await self._run_git_async(self._default_branch_args(mirror_path))
+        )
+        return await self._run_steps_async(self._worktree_steps(mirror_path, target_path, ref))
+
+    def _check_worktree_target(self, target_path: Path) -> Optional[GitResult]:
+        """Refuse to treat a regular clone as a mirror worktree."""
+        if target_path.exists() and not (target_path / ".git").is_file():
+            return GitResult(
+                success=False,
+                error=f"{target_path} exists but is not a mirror worktree; remove it first",
+                return_code=-1,
+            )
+        return None
+
+    def _mirror_steps(self, repo_url: str, mirror_path: Path,
+                      mirror_exists: bool) -> List[List[str]]:
+        """Return the git commands that create or refresh a bare mirror."""
+        if mirror_exists:
+            return [["-C", str(mirror_path), "remote", "update", "--prune"]]
+        return [["clone", "--mirror", "--filter=blob:none", repo_url, str(mirror_path)]]
+
+    def _default_branch_args(self, mirror_path: Path) -> List[str]:
+        """Build arguments that name the mirror's default branch."""
+        return ["-C", str(mirror_path), "symbolic-ref", "--short", "HEAD"]
+
+    def _default_branch(self, result: GitResult) -> str:
+        """Extract the default branch name, falling back to the mirror's HEAD commit."""
+        name = result.output.strip() if result.success else ""
+        return name or "HEAD"
+
+    def _worktree_steps(self, mirror_path: Path, target_path: Path,
+                        ref: str) -> List[List[str]]:
+        """Return the git commands that check ref out into target_path."""
+        if target_path.exists():
+            return [
+                self._reset_args(target_path, ref, hard=True),
+                self._clean_args(target_path),
+            ]
+        return [
+            # Forget worktrees whose directories were deleted
+            ["-C", str(mirror_path), "worktree", "prune"],
+            ["-C", str(mirror_path), "worktree", "add", "--detach", str(target_path), ref],
+        ]
+
+    def _chain(self, steps: List[List[str]]) -> Optional[List[str]]:
+        """
+        Join several git commands into one POSIX shell command line.
+
+        The && chain keeps the stop-at-first-failure behaviour and the exit
+        code of the failing command, while costing a single round trip from
+        Python instead of one per step. Returns None where there is nothing
+        to join or no POSIX shell to run it.
+        """
+        if len(steps) < 2 or not CHAIN_STEPS:
+            return None
+        return ["sh", "-c", " && ".join(shlex.join([self._git] + args) for args in steps)]
+
+    def _run_steps(self, steps: List[List[str]]) -> GitResult:
+        """Run git commands in order, stopping at the first failure."""
+        chained = self._chain(steps)
+        if chained:
+            return self._run(chained)
+
+        result = GitResult(success=True)
+        for args in steps:
+            result = self._run_git(args)
             if not result.success:
                 return result
+        return result
 
-            target = f"origin/{branch}" if branch else "origin/HEAD"
-            result = self.reset(target_path, target, hard=True)
+    async def _run_steps_async(self, steps: List[List[str]]) -> GitResult:
+        """Run git commands in order without blocking, stopping at the first failure."""
+        chained = self._chain(steps)
+        if chained:
+            return await self._run_async(chained)
+
+        result = GitResult(success=True)
+        for args in steps:
+            result = await self._run_git_async(args)
             if not result.success:
                 return result
-
-            return self.clean(target_path)
-        else:
-            # Clone new repository
-            return self.clone(repo_url, target_path, branch)
+        return result
 
 
 # Convenience functions
 def clone_or_update(repo_url: str, target_path: Path,
                     branch: Optional[str] = None,
-                    verbose: bool = False) -> GitResult:
+                    verbose: bool = False,
+                    shallow: bool = True) -> GitResult:
     """Clone or update a repository."""
     ops = GitOperations(verbose)
-    return ops.clone_or_update(repo_url, target_path, branch)
+    return ops.clone_or_update(repo_url, target_path, branch, shallow)
+
+
+async def clone_or_update_many_async(repos: List[Tuple[str, Path]],
+                                     branch: Optional[str] = None,
+                                     verbose: bool = False,
+                                     shallow: bool = True,
+                                     concurrency: int = 8) -> List[GitResult]:
+    """
+    Clone or update several repositories concurrently.
+
+    Args:
+        repos: (repo_url, target_path) pairs
+        branch: Branch to check out in every repository
+        verbose: Enable verbose output
+        shallow: Fetch only the tip of the wanted ref
+        concurrency: Maximum number of repositories synced at once
+
+    Returns:
+        One GitResult per pair, in the order given
+    """
+    ops = GitOperations(verbose)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def sync(repo_url: str, target_path: Path) -> GitResult:
+        async with semaphore:
+            return await ops.clone_or_update_async(repo_url, target_path, branch, shallow)
+
+    return list(await asyncio.gather(*(sync(url, path) for url, path in repos)))
+
+
+def clone_or_update_many(repos: List[Tuple[str, Path]],
+                         branch: Optional[str] = None,
+                         verbose: bool = False,
+                         shallow: bool = True,
+                         concurrency: int = 8) -> List[GitResult]:
+    """Clone or update several repositories concurrently; see clone_or_update_many_async."""
+    return asyncio.run(clone_or_update_many_async(repos, branch, verbose, shallow, concurrency))
@@ -3,10 +3,14 @@ Logging utilities for WinBins.
 Provides consistent logging across all modules.
 """
 
+import io
 import logging
+import os
 import sys
+import threading
+from contextlib import contextmanager
 from enum import Enum
-from typing import Optional
+from typing import Dict, Iterator, List, Optional
 
 
 class LogLevel(Enum):
@@ -18,6 +22,97 @@ class LogLevel(Enum):
     SUCCESS = "SUCCESS"
 
 
+# Most buffers a single os.writev call accepts
+try:
+    _IOV_MAX = os.sysconf("SC_IOV_MAX")
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = 1024
+
+
+def _write_all(fd: int, chunks: List[bytes]) -> None:
+    """Write chunks to fd in order, using gather writes where the platform has them."""
+    while chunks:
+        batch = chunks[:_IOV_MAX]
+        if hasattr(os, "writev"):
+            written = os.writev(fd, batch)
+        else:
+            written = os.write(fd, b"".join(batch))
+        if written == sum(map(len, batch)):
+            chunks = chunks[len(batch):]
+        else:
+            # Short write; retry the remainder as a single buffer
+            chunks = [b"".join(chunks)[written:]]
+
+
+class _BatchedFileHandler(logging.Handler):
+    """
+    Append-only file handler that collects records and writes them together.
+
+    Pending records are written in one gather write once FLUSH_BYTES are
+    queued, FLUSH_INTERVAL seconds after the first one, or on flush/close.
+    """
+
+    FLUSH_BYTES = 64 * 1024
+    FLUSH_INTERVAL = 0.01
+
+    def __init__(self, filename: str):
+        super().__init__()
+        self.baseFilename = os.path.abspath(filename)
+        self._fd: Optional[int] = os.open(
+            filename, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644
+        )
+        self._pending: List[bytes] = []
+        self._pending_bytes = 0
+        self._timer: Optional[threading.Timer] = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            data = (self.format(record) + "\n").encode("utf-8")
+        except Exception:
+            self.handleError(record)
+            return
+
+        with self.lock:
+            self._pending.append(data)
+            self._pending_bytes += len(data)
+            if self._pending_bytes >= self.FLUSH_BYTES:
+                self._flush_pending()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.FLUSH_INTERVAL, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        with self.lock:
+            self._flush_pending()
+
+    def close(self) -> None:
+        with self.lock:
+            self._flush_pending()
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+        super().close()
+
+    def _flush_pending(self) -> None:
+        """Write out pending records; caller holds the handler lock."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending or self._fd is None:
+            return
+
+        pending, self._pending, self._pending_bytes = self._pending, [], 0
+        _write_all(self._fd, pending)
+
+
+def _level_prefixes(colors: Optional[Dict[LogLevel, str]] = None,
+                    reset: str = "") -> Dict[LogLevel, str]:
+    """Return the "[LEVEL] " line prefix for each level, colored if colors are given."""
+    colors = colors or {}
+    return {level: f"{colors.get(level, '')}[{level.value}]{reset} " for level in LogLevel}
+
+
 class WinBinsLogger:
     """Custom logger for WinBins with colored output support."""
 
@@ -30,6 +125,10 @@ class WinBinsLogger:
     }
     RESET = "\033[0m"
 
+    # Line prefixes per level, built once
+    PREFIXES = _level_prefixes()
+    COLOR_PREFIXES = _level_prefixes(COLORS, RESET)
+
     def __init__(self, name: str = "WinBins", verbose: bool = False,
                  use_colors: bool = True, log_file: Optional[str] = None):
         self.name = name
@@ -37,33 +136,37 @@ class WinBinsLogger:
         self.use_colors = use_colors and sys.stdout.isatty()
         self.log_file = log_file
 
+        # Console output collected by buffered(), if active
+        self._buffer: Optional[io.StringIO] = None
+
         # Setup file logging if specified
         self._file_handler = None
         if log_file:
             self._setup_file_logging(log_file)
 
     def _setup_file_logging(self, log_file: str) -> None:
-        """Setup file logging."""
-        self._file_handler = logging.FileHandler(log_file)
+        """Setup file logging; records are written in batches."""
+        self._file_handler = _BatchedFileHandler(log_file)
         self._file_handler.setFormatter(
             logging.Formatter('%(asctime)s [%(levelname)s] %(message)s')
         )
 
     def _format_message(self, msg: str, level: LogLevel) -> str:
         """Format message with optional color."""
-        prefix = f"[{level.value}]"
-        if self.use_colors:
-            color = self.COLORS.get(level, "")
-            return f"{color}{prefix}{self.RESET} {msg}"
-        return f"{prefix} {msg}"
+        prefixes = self.COLOR_PREFIXES if self.use_colors else self.PREFIXES
+        return prefixes[level] + msg
 
     def log(self, msg: str, level: LogLevel = LogLevel.INFO) -> None:
         """Log a message."""
-        if level == LogLevel.DEBUG and not self.verbose:
+        if level is LogLevel.DEBUG and not self.verbose:
             return
 
-        formatted = self._format_message(msg, level)
-        print(formatted)
+        # One write per line; print() would issue a second one for the newline
+        line = self._format_message(msg, level) + "\n"
+        if self._buffer is not None:
+            self._buffer.write(line)
+        else:
+            sys.stdout.write(line)
 
         if self._file_handler:
             # Write uncolored version to file
@@ -73,6 +176,30 @@ class WinBinsLogger:
                     f"[{level.value}] {msg}", None, None
                 )
             )
+            if level is LogLevel.ERROR:
+                # Don't leave the record of a failure sitting in the batch
+                self._file_handler.flush()
+
+    @contextmanager
+    def buffered(self) -> Iterator[None]:
+        """
+        Collect console output and write it in one piece on exit.
+
+        Keeps each tool's log contiguous without a lock. Verbose loggers
+        keep printing immediately so progress stays live.
+        """
+        if self.verbose or self._buffer is not None:
+            yield
+            return
+
+        self._buffer = io.StringIO()
+        try:
+            yield
+        finally:
+            output, self._buffer = self._buffer.getvalue(), None
+            if output:
+                sys.stdout.write(output)
+                sys.stdout.flush()
 
     def debug(self, msg: str) -> None:
         """Log debug message."""
@@ -7,10 +7,40 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import hashlib
 import secrets
 import string
+import sys
+
+# Read size for hashing on Python < 3.11
+HASH_CHUNK_SIZE = 1 << 20
+
+# dataclass(slots=True) needs Python 3.10+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# generate_mapping draws characters in bulk for more names than this
+BULK_NAME_THRESHOLD = 32
+
+# Characters NameGenerator draws from its random source at a time
+NAME_POOL_SIZE = 4096
+
+
+def _byte_table(alphabet: str):
+    """
+    Return (table, delete) for bytes.translate mapping random bytes onto alphabet.
+
+    Bytes at or above the largest multiple of len(alphabet) are deleted, so
+    every character is equally likely.
+    """
+    chars = alphabet.encode()
+    limit = 256 - 256 % len(chars)
+    table = bytes(chars[b % len(chars)] for b in range(256))
+    return table, bytes(range(limit, 256))
+
+
+_LETTER_TABLE = _byte_table(string.ascii_letters)
+_ALNUM_TABLE = _byte_table(string.ascii_letters + string.digits)
 
 
 class ObfuscationType(Enum):
@@ -24,10 +54,10 @@ class ObfuscationType(Enum):
     RESOURCE_ENCRYPTION = "resource_encryption"  # Encrypt resources
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class ObfuscationConfig:
     """Configuration for obfuscation operations."""
-    enabled_types: List[ObfuscationType] = field(default_factory=list)
+    enabled_types: Tuple[ObfuscationType, ...] = ()
     preserve_entry_points: bool = True
     random_seed: Optional[int] = None
     name_prefix: str = ""
@@ -38,11 +68,12 @@ class ObfuscationConfig:
     custom_options: Dict[str, Any] = field(default_factory=dict)
 
     def __post_init__(self):
-        if not self.enabled_types:
-            self.enabled_types = [ObfuscationType.NAME_MANGLING]
+        # Accept any iterable of types; frozen, so assign through object
+        enabled_types = tuple(self.enabled_types) or (ObfuscationType.NAME_MANGLING,)
+        object.__setattr__(self, "enabled_types", enabled_types)
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class ObfuscationResult:
     """Result of an obfuscation operation."""
     success: bool
@@ -76,15 +107,15 @@ class NameGenerator:
         else:
             self._random = secrets.SystemRandom()
 
+        # Characters drawn in bulk but not handed out yet: table -> [chars, next index]
+        self._pools: Dict[Tuple[bytes, bytes], List[Any]] = {}
+
     def generate(self) -> str:
         """Generate a unique obfuscated name."""
         while True:
             length = self._random.randint(self.min_length, self.max_length)
             # Start with letter, rest can be alphanumeric
-            name = self._random.choice(string.ascii_letters)
-            name += ''.join(
-                self._random.choices(string.ascii_letters + string.digits, k=length - 1)
-            )
+            name = self._take(_LETTER_TABLE, 1) + self._take(_ALNUM_TABLE, length - 1)
             full_name = f"{self.prefix}{name}{self.suffix}"
 
             if full_name not in self._used_names:
@@ -93,7 +124,47 @@ class NameGenerator:
 
     def generate_mapping(self, original_names: List[str]) -> Dict[str, str]:
         """Generate a mapping of original names to obfuscated names."""
-        return {name: self.generate() for name in original_names}
+        if len(original_names) <= BULK_NAME_THRESHOLD:
+            return {name: self.generate() for name in original_names}
+
+        count = len(original_names)
+        lengths = self._random.choices(range(self.min_length, self.max_length + 1), k=count)
+        firsts = self._take(_LETTER_TABLE, count)
+        rests = self._take(_ALNUM_TABLE, sum(lengths) - count)
+
+        mapping = {}
+        pos = 0
+        for name, first, length in zip(original_names, firsts, lengths):
+            full_name = f"{self.prefix}{first}{rests[pos:pos + length - 1]}{self.suffix}"
+            pos += length - 1
+            if full_name in self._used_names:
+                full_name = self.generate()
+            else:
+                self._used_names.add(full_name)
+            mapping[name] = full_name
+        return mapping
+
+    def _take(self, table, count: int) -> str:
+        """Hand out the next count characters of table's pool, refilling it in bulk."""
+        pool = self._pools.get(table)
+        if pool is None or pool[1] + count > len(pool[0]):
+            rest = pool[0][pool[1]:] if pool else ""
+            fresh = self._random_chars(table, max(count, NAME_POOL_SIZE))
+            pool = self._pools[table] = [rest + fresh, 0]
+
+        start = pool[1]
+        pool[1] = start + count
+        return pool[0][start:start + count]
+
+    def _random_chars(self, table, count: int) -> str:
+        """Draw count characters from a _byte_table alphabet in bulk."""
+        chars = b""
+        while len(chars) < count:
+            # Over-draw a little so rejected bytes rarely force another round
+            size = (count - len(chars)) * 5 // 4 + 16
+            raw = self._random.getrandbits(size * 8).to_bytes(size, "little")
+            chars += raw.translate(*table)
+        return chars[:count].decode()
 
     def reset(self) -> None:
         """Reset used names."""
@@ -141,10 +212,19 @@ class Obfuscator(ABC):
 
     def compute_hash(self, file_path: Path) -> str:
         """Compute SHA256 hash of file."""
-        sha256 = hashlib.sha256()
         with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(8192), b''):
-                sha256.update(chunk)
+            if hasattr(hashlib, "file_digest"):
+                # Python 3.11+: hashes straight from the file descriptor in C
+                return hashlib.file_digest(f, "sha256").hexdigest()
+
+            sha256 = hashlib.sha256()
+            buffer = bytearray(HASH_CHUNK_SIZE)
+            view = memoryview(buffer)
+            while True:
+                size = f.readinto(buffer)
+                if not size:
+                    break
+                sha256.update(view[:size])
         return sha256.hexdigest()
 
     def validate_config(self) -> List[str]:
@@ -0,0 +1,69 @@
+"""
+Incremental build state for WinBins.
+Records the commit each tool was last built from so unchanged tools can be skipped.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+STATE_FILE = ".winbins-state.json"
+
+
+class BuildState:
+    """
+    Persistent mapping of tool name to the commit its artifact was built from.
+
+    Stored as JSON in the output directory next to the binaries it describes.
+    """
+
+    def __init__(self, output_dir: Path):
+        self.path = Path(output_dir) / STATE_FILE
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Read the state file, returning an empty mapping if missing or corrupt."""
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def get_sha(self, tool_name: str) -> Optional[str]:
+        """Return the commit the tool was last built from, if known."""
+        entry = self.load().get(tool_name)
+        if isinstance(entry, dict):
+            return entry.get("sha")
+        return None
+
+    def is_current(self, tool_name: str, sha: Optional[str], artifact: Path) -> bool:
+        """Check whether the artifact exists and was built from the given commit."""
+        if not sha:
+            return False
+        return self.get_sha(tool_name) == sha and artifact.exists()
+
+    def record(self, tool_name: str, sha: str, artifact: Path) -> None:
+        """Record a successful build and write the state file atomically."""
+        # Re-read so entries written by other workers since our last load survive
+        state = self.load()
+        state[tool_name] = {"sha": sha, "artifact_mtime": artifact.stat().st_mtime}
+        self._write(state)
+
+    def _write(self, state: Dict[str, Dict[str, Any]]) -> None:
+        """Write state to a temporary file and rename it into place."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=STATE_FILE, suffix=".tmp", dir=str(self.path.parent)
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(state, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
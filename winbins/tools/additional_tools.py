@@ -11,7 +11,8 @@ To use these tools, import and register them:
         registry.register(name, config)
 """
 
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Any, Dict, Mapping
 
 
 # Modern cutting-edge Windows security tools
@@ -308,9 +309,13 @@ ADDITIONAL_TOOLS: Dict[str, Dict[str, Any]] = {
 }
 
 
-def get_additional_tools() -> Dict[str, Dict[str, Any]]:
-    """Get all additional tool definitions."""
-    return ADDITIONAL_TOOLS.copy()
+def get_additional_tools() -> Mapping[str, Dict[str, Any]]:
+    """
+    Get all additional tool definitions as a read-only view.
+
+    Callers that need to modify the result should copy it with dict().
+    """
+    return MappingProxyType(ADDITIONAL_TOOLS)
 
 
 def register_additional_tools(registry) -> int:
@@ -49,6 +49,7 @@ class ToolConfig:
     additional_outputs: List[str] = field(default_factory=list)
     env_vars: Dict[str, str] = field(default_factory=dict)
     platforms: List[str] = field(default_factory=lambda: ["windows"])
+    shallow_ok: bool = True
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary representation."""
@@ -67,6 +68,7 @@ class ToolConfig:
             "additional_outputs": self.additional_outputs,
             "env_vars": self.env_vars,
             "platforms": self.platforms,
+            "shallow_ok": self.shallow_ok,
         }
 
     @classmethod
@@ -95,4 +97,5 @@ class ToolConfig:
             additional_outputs=data.get("additional_outputs", []),
             env_vars=data.get("env_vars", {}),
             platforms=data.get("platforms", ["windows"]),
+            shallow_ok=data.get("shallow_ok", True),
         )
@@ -3,12 +3,23 @@ Tool registry for WinBins.
 Manages the collection of available pentesting tools.
 """
 
-from typing import Any, Dict, Iterator, List, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, Optional
 from winbins.tools.base import ToolConfig, ToolCategory, BuildSystem
 from winbins.tools.default_tools import DEFAULT_TOOLS
 
 # Default tool definitions loaded from a dedicated module for easy editing.
-TOOLS: Dict[str, Dict[str, Any]] = DEFAULT_TOOLS
+# Exposed read-only so this stays the single source of truth for the defaults.
+TOOLS: Mapping[str, Dict[str, Any]] = MappingProxyType(DEFAULT_TOOLS)
+
+
+@lru_cache(maxsize=1)
+def _default_tool_configs() -> Mapping[str, ToolConfig]:
+    """Parse the default tools once; every default registry shares the results."""
+    return MappingProxyType(
+        {name: ToolConfig.from_dict(name, config) for name, config in TOOLS.items()}
+    )
 
 
 class ToolRegistry:
@@ -17,14 +28,16 @@ class ToolRegistry:
     Allows easy addition, removal, and querying of tools.
     """
 
-    def __init__(self, tools: Optional[Dict[str, Dict[str, Any]]] = None):
+    def __init__(self, tools: Optional[Mapping[str, Dict[str, Any]]] = None):
         """Initialize registry with optional custom tools."""
-        self._tools: Dict[str, ToolConfig] = {}
-
-        # Load default tools
-        initial_tools = tools if tools is not None else TOOLS
-        for name, config in initial_tools.items():
-            self.register(name, config)
+        self._tools: Dict[str, ToolConfig]
+        if tools is None:
+            # Load default tools, parsed once and shared between registries
+            self._tools = dict(_default_tool_configs())
+        else:
+            self._tools = {}
+            for name, config in tools.items():
+                self.register(name, config)
 
     def register(self, name: str, config: Dict[str, Any]) -> None:
         """Register a new tool."""